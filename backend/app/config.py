@@ -9,6 +9,15 @@ class Settings(BaseSettings):
     db_path: Path = Path.home() / ".lithelper" / "lithelper.db"
     openalex_email: str = ""  # Set to your email for polite pool access
     cache_staleness_days: int = 7
+    graph_max_nodes: int = 20000
+    graph_max_depth: int = 4
+    discovery_concurrency: int = 10  # OpenAlex requests in flight per discovery run
+    scheduler_enabled: bool = True  # background monitor and tracked-author checks
+    scheduler_poll_minutes: int = 5
+    scheduler_concurrency: int = 2  # checks running at once
+    author_check_interval_hours: int = 24
+    warmup_requests_per_minute: int = 60  # OpenAlex request budget shared by collection warm-up jobs
+    monitor_lookback_days: int = 14  # incremental monitor checks re-scan this far back for late-indexed papers
 
     @property
     def database_url(self) -> str:
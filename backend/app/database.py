@@ -1,3 +1,8 @@
+import logging
+from typing import Dict, List
+
+from sqlalchemy import Boolean, DateTime, String, inspect
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -5,6 +10,7 @@ from app.config import settings
 
 engine = create_async_engine(settings.database_url, echo=False)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -16,6 +22,103 @@ async def get_db() -> AsyncSession:
         yield session
 
 
+def _default_sql(arg, dialect) -> str:
+    """A server default as SQL: plain strings quoted, text clauses verbatim, expressions compiled."""
+    if isinstance(arg, str):
+        return "'{}'".format(arg.replace("'", "''"))
+    if isinstance(arg, TextClause):
+        return arg.text
+    # Expression defaults must be parenthesized in SQLite DDL
+    return "({})".format(arg.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _add_missing_columns(conn):
+    """create_all never alters existing tables; add columns declared since.
+
+    New columns on existing tables must be nullable or have a server default.
+    """
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        present = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            ddl = "ALTER TABLE {} ADD COLUMN {} {}".format(
+                table.name, column.name, column.type.compile(conn.dialect),
+            )
+            if column.server_default is not None:
+                ddl += " DEFAULT " + _default_sql(column.server_default.arg, conn.dialect)
+            conn.exec_driver_sql(ddl)
+
+
+def _merge_duplicates(conn, table, columns) -> int:
+    """Merge rows that share the values of `columns` into the oldest one; returns the rows merged away.
+
+    The kept row takes the earliest date and the unread state of its group, and
+    distinct text values (e.g. notes) are joined, so nothing the user entered is lost.
+    """
+    keys = [c.name for c in columns]
+    rest = [c for c in table.columns if c.name not in keys and not c.primary_key]
+    groups: Dict[tuple, List] = {}
+    rows = conn.exec_driver_sql(
+        "SELECT rowid, {} FROM {} WHERE ({}) IN (SELECT {} FROM {} GROUP BY {} HAVING COUNT(*) > 1) "
+        "ORDER BY rowid".format(
+            ", ".join(keys + [c.name for c in rest]), table.name,
+            ", ".join(keys), ", ".join(keys), table.name, ", ".join(keys),
+        )
+    )
+    for row in rows:
+        groups.setdefault(tuple(row[1:len(keys) + 1]), []).append(row)
+    merged = 0
+    for group in groups.values():
+        kept, values = group[0][0], {}
+        for i, column in enumerate(rest, start=len(keys) + 1):
+            present = [r[i] for r in group if r[i] is not None]
+            if not present:
+                continue
+            if isinstance(column.type, DateTime):
+                values[column.name] = min(present)
+            elif isinstance(column.type, Boolean):
+                values[column.name] = min(present)  # False (e.g. unread) wins
+            elif isinstance(column.type, String):
+                values[column.name] = "\n\n".join(dict.fromkeys(v for v in present if v)) or present[0]
+        if values:
+            conn.exec_driver_sql(
+                "UPDATE {} SET {} WHERE rowid = ?".format(table.name, ", ".join("{} = ?".format(k) for k in values)),
+                tuple(values.values()) + (kept,),
+            )
+        conn.exec_driver_sql(
+            "DELETE FROM {} WHERE rowid IN ({})".format(table.name, ", ".join("?" * (len(group) - 1))),
+            tuple(r[0] for r in group[1:]),
+        )
+        merged += len(group) - 1
+    return merged
+
+
+def _create_missing_indexes(conn):
+    """create_all skips the indexes of tables that already exist; add any declared since.
+
+    Before a new unique index is built, rows that would violate it are merged
+    (see `_merge_duplicates`).
+    """
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        present = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in present:
+                continue
+            if index.unique:
+                merged = _merge_duplicates(conn, table, list(index.columns))
+                if merged:
+                    logger.warning("Merged %d duplicate rows of %s before creating %s", merged, table.name, index.name)
+            index.create(conn)
+
+
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_create_missing_indexes)
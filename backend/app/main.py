@@ -1,9 +1,15 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.database import init_db
+from app.services.collection_warmup import collection_warmup
+from app.services.discovery_jobs import discovery_jobs
+from app.services.graph_layout import shutdown_layout_workers
+from app.services.monitoring import monitor_scheduler
+from app.services.openalex import openalex_client
+from app.services.similarity_index import similarity_index
 
 # Import all models so Base.metadata.create_all picks them up
 import app.models.paper  # noqa: F401
@@ -12,12 +18,24 @@ import app.models.trail  # noqa: F401
 import app.models.author  # noqa: F401
 import app.models.monitor  # noqa: F401
 import app.models.zotero  # noqa: F401
+import app.models.discovery  # noqa: F401
+import app.models.similarity  # noqa: F401
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await discovery_jobs.mark_interrupted()
+    await openalex_client.writer.start()
+    await similarity_index.start()
+    await monitor_scheduler.start()
     yield
+    await monitor_scheduler.stop()
+    await similarity_index.stop()
+    await discovery_jobs.shutdown()
+    await collection_warmup.shutdown()
+    await openalex_client.writer.stop()  # flush queued cache writes
+    shutdown_layout_workers()
 
 
 app = FastAPI(title="LitHelper", version="0.1.0", lifespan=lifespan)
@@ -31,6 +49,13 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def cache_write_scope(request: Request, call_next):
+    # Lets handlers wait for their own queued cache writes (read-your-writes)
+    openalex_client.writer.open_scope()
+    return await call_next(request)
+
+
 @app.get("/api/health")
 async def health():
     return {"status": "ok", "app": "LitHelper"}
@@ -56,6 +81,11 @@ app.include_router(sharing.router, prefix="/api")
 
 
 if __name__ == "__main__":
+    import multiprocessing
+
+    # Layout workers of the frozen (PyInstaller) binary re-run this entry point;
+    # freeze_support turns them into workers instead of a second server
+    multiprocessing.freeze_support()
     import uvicorn
     from app.config import settings
     uvicorn.run(app, host="127.0.0.1", port=settings.backend_port)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -16,6 +16,55 @@ class TrackedAuthor(Base):
     works_count: Mapped[int] = mapped_column(Integer, default=0)
     cited_by_count: Mapped[int] = mapped_column(Integer, default=0)
     institution: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Newest publication date seen (a bare year for authors tracked before full dates were stored)
     last_known_work_date: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Set by checks: unread works published after the previous last_known_work_date
+    new_works_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    last_checked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    next_check_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
+    # When the full bibliography was last mirrored into tracked_author_papers (None: not mirrored yet)
+    works_synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Last failed mirror attempt; background syncs try authors that never failed (or failed longest ago) first
+    works_sync_failed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class TrackedAuthorWork(Base):
+    """A new work found for a tracked author by a check; unread until the author's works are viewed."""
+
+    __tablename__ = "tracked_author_works"
+    __table_args__ = (
+        Index("ix_tracked_author_works_author_paper", "author_id", "paper_openalex_id", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    author_id: Mapped[int] = mapped_column(Integer, ForeignKey("tracked_authors.id"), nullable=False)
+    paper_openalex_id: Mapped[str] = mapped_column(String, nullable=False)
+    paper_title: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    publication_date: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    is_read: Mapped[bool] = mapped_column(Boolean, default=False)
+    found_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+
+
+class TrackedAuthorPaper(Base):
+    """Local mirror of a tracked author's bibliography; the works themselves are in the paper cache."""
+
+    __tablename__ = "tracked_author_papers"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    author_id: Mapped[int] = mapped_column(Integer, ForeignKey("tracked_authors.id"), primary_key=True)
+    paper_openalex_id: Mapped[str] = mapped_column(String, primary_key=True)
+
+
+class AuthorProfile(Base):
+    """Cached OpenAlex author record, used for author page headers."""
+
+    __tablename__ = "author_profiles"
+
+    openalex_id: Mapped[str] = mapped_column(String, primary_key=True)  # full https://openalex.org/A... URL
+    display_name: Mapped[str] = mapped_column(String, nullable=False)
+    works_count: Mapped[int] = mapped_column(Integer, default=0)
+    cited_by_count: Mapped[int] = mapped_column(Integer, default=0)
+    institution: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -16,16 +16,22 @@ class Collection(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
 
-    papers: Mapped[list] = relationship(
+    papers: Mapped[List["CollectionPaper"]] = relationship(
         "CollectionPaper", back_populates="collection", cascade="all, delete-orphan"
     )
 
 
 class CollectionPaper(Base):
     __tablename__ = "collection_papers"
+    __table_args__ = (
+        # A paper is in a collection at most once; bulk adds rely on it for INSERT OR IGNORE
+        Index("ix_collection_papers_collection_paper", "collection_id", "paper_openalex_id", unique=True),
+        # Default member listing order (keyset pages by added_at, id)
+        Index("ix_collection_papers_collection_added", "collection_id", "added_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    collection_id: Mapped[int] = mapped_column(Integer, ForeignKey("collections.id"), nullable=False)
+    collection_id: Mapped[int] = mapped_column(Integer, ForeignKey("collections.id"), nullable=False, index=True)
     paper_openalex_id: Mapped[str] = mapped_column(String, ForeignKey("papers.openalex_id"), nullable=False)
     added_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     notes: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, JSON, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class DiscoveryJob(Base):
+    __tablename__ = "discovery_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    strategy: Mapped[str] = mapped_column(String, nullable=False)
+    seed_ids: Mapped[list] = mapped_column(JSON, nullable=False)
+    params: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # request settings besides the seeds
+    # pending | running | completed | failed | cancelled | interrupted
+    status: Mapped[str] = mapped_column(String, default="pending", index=True)
+    progress: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    results: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)  # serialized DiscoveryResult list
+    error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class DiscoveryCacheEntry(Base):
+    """Intermediate discovery data for one paper, reused across runs until it expires.
+
+    kind "seed_citers": sampled papers citing the seed ("seed_citers:<strategy>[:<seed>]"
+    for the other sampling strategies); kind "reference_citers": sampled papers
+    citing a shared reference. `works` maps each citing paper's
+    ID to its reference list.
+    """
+
+    __tablename__ = "discovery_cache"
+
+    kind: Mapped[str] = mapped_column(String, primary_key=True)
+    openalex_id: Mapped[str] = mapped_column(String, primary_key=True)
+    sample_size: Mapped[int] = mapped_column(Integer, default=0)
+    works: Mapped[dict] = mapped_column(JSON, nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
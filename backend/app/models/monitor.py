@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, JSON, String, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, JSON, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -16,11 +16,12 @@ class MonitoredSearch(Base):
     filters: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # year_min, year_max, type
     check_interval_hours: Mapped[int] = mapped_column(Integer, default=24)
     last_checked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    next_check_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
     known_result_count: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
 
-    results: Mapped[list] = relationship(
+    results: Mapped[List["MonitoredSearchResult"]] = relationship(
         "MonitoredSearchResult", back_populates="monitor",
         cascade="all, delete-orphan",
     )
@@ -28,6 +29,10 @@ class MonitoredSearch(Base):
 
 class MonitoredSearchResult(Base):
     __tablename__ = "monitored_search_results"
+    __table_args__ = (
+        # Each paper is reported once per monitor; bulk checks rely on it for INSERT OR IGNORE
+        Index("ix_monitored_search_results_monitor_paper", "monitor_id", "paper_openalex_id", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     monitor_id: Mapped[int] = mapped_column(Integer, ForeignKey("monitored_searches.id"), nullable=False)
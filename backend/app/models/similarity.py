@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class PaperSignature(Base):
+    """MinHash signature of a cached paper's title and abstract words."""
+
+    __tablename__ = "paper_signatures"
+
+    openalex_id: Mapped[str] = mapped_column(String, primary_key=True)
+    signature: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # NUM_PERM uint32 values
+    indexed_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+
+
+class PaperBucket(Base):
+    """One LSH band of a paper's signature; papers sharing a bucket are similarity candidates."""
+
+    # Replaces "paper_lsh_buckets" (32 bands of 2 rows), rebuilt once by SimilarityIndex.backfill
+    __tablename__ = "paper_lsh_bands"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True)  # hash of (band, band values)
+    openalex_id: Mapped[str] = mapped_column(String, primary_key=True)
@@ -1,72 +1,96 @@
-from typing import List
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models.author import TrackedAuthor
+from app.models.author import TrackedAuthor, TrackedAuthorPaper, TrackedAuthorWork
 from app.schemas.author import (
     AuthorSearchResult, AuthorSearchResponse, TrackedAuthorOut,
-    TrackAuthorRequest, AuthorWorksResponse,
+    TrackAuthorRequest, AuthorWorksResponse, AuthorCheckAllResponse,
 )
+from app.services import monitoring
+from app.services.author_cache import author_to_result, author_url, cache_authors, get_author_profile
+from app.services.author_works import AUTHOR_WORK_SORTS, local_author_works, sync_author_works
 from app.services.openalex import openalex_client
+from app.services.paper_cache import cached_summaries, get_paper_summaries
 
 router = APIRouter(tags=["authors"])
 
 
 @router.get("/authors/search", response_model=AuthorSearchResponse)
-async def search_authors(q: str, page: int = 1, per_page: int = 25):
+async def search_authors(q: str, page: int = 1, per_page: int = 25, db: AsyncSession = Depends(get_db)):
     data = await openalex_client.search_authors(q, page=page, per_page=per_page)
     meta = data.get("meta", {})
-    results = []
-    for a in data.get("results", []):
-        institutions = a.get("last_known_institutions") or []
-        inst_name = institutions[0].get("display_name") if institutions else None
-        results.append(AuthorSearchResult(
-            openalex_id=a.get("id", ""),
-            display_name=a.get("display_name", ""),
-            works_count=a.get("works_count", 0),
-            cited_by_count=a.get("cited_by_count", 0),
-            institution=inst_name,
-        ))
+    results = [author_to_result(a) for a in data.get("results", [])]
+    # Opening one of these authors next can then skip the profile request
+    await cache_authors(db, results)
     return AuthorSearchResponse(count=meta.get("count", 0), results=results)
 
 
-@router.get("/authors/{openalex_id}/works", response_model=AuthorWorksResponse)
+@router.get("/authors/{openalex_id:path}/works", response_model=AuthorWorksResponse)
 async def get_author_works(
     openalex_id: str,
-    page: int = 1,
-    per_page: int = 25,
+    page: int = Query(1, ge=1),
+    per_page: int = Query(25, ge=1, le=200),
+    sort: str = "publication_date:desc",
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    type: Optional[str] = None,
+    q: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ):
-    # Get author info
-    author_data = await openalex_client.search_authors("", page=1, per_page=1)
-    # Fetch author works
-    resp, raw_works = await openalex_client.get_author_works(
-        openalex_id, page=page, per_page=per_page,
-    )
-    await openalex_client.cache_works(raw_works, db)
+    """An author's works, filtered by years, type and title text.
 
-    # Check for new works if author is tracked
-    stmt = select(TrackedAuthor).where(TrackedAuthor.openalex_id == openalex_id)
+    Mirrored bibliographies are filtered locally, other authors by OpenAlex.
+    """
+    if sort not in AUTHOR_WORK_SORTS:
+        raise HTTPException(status_code=400, detail="Unknown sort: {}".format(sort))
+    stmt = select(TrackedAuthor).where(TrackedAuthor.openalex_id.in_([openalex_id, author_url(openalex_id)]))
     tracked = (await db.execute(stmt)).scalar_one_or_none()
 
-    has_new = False
+    mirrored = bool(tracked and tracked.works_synced_at)
+    if mirrored:
+        # Mirrored bibliography: sorted, filtered and paged locally
+        profile = await get_author_profile(openalex_id, db)
+        works, total = await local_author_works(
+            db, tracked.id, sort=sort, page=page, per_page=per_page,
+            year_min=year_min, year_max=year_max, work_type=type, q=q,
+        )
+    else:
+        # Author header from the profile cache; on a miss the profile is fetched alongside the works
+        profile, (resp, raw_works) = await asyncio.gather(
+            get_author_profile(openalex_id, db),
+            openalex_client.get_author_works(
+                openalex_id, sort="display_name:asc" if sort == "title" else sort, page=page, per_page=per_page,
+                year_min=year_min, year_max=year_max, work_type=type, title_search=q,
+            ),
+        )
+        await openalex_client.cache_works(raw_works)
+        works, total = resp.results, resp.meta.count
+
+    # New works found by checks of a tracked author
     new_works = []
-    if tracked and tracked.last_known_work_date:
-        for w in resp.results:
-            # Simple date comparison: works from after last known date
-            if w.publication_year and tracked.last_known_work_date:
-                try:
-                    last_year = int(tracked.last_known_work_date[:4])
-                    if w.publication_year > last_year:
-                        new_works.append(w)
-                        has_new = True
-                except (ValueError, IndexError):
-                    pass
-
-    author_info = AuthorSearchResult(
+    if tracked:
+        result = await db.execute(
+            select(TrackedAuthorWork.paper_openalex_id)
+            .where(TrackedAuthorWork.author_id == tracked.id, TrackedAuthorWork.is_read == False)  # noqa: E712
+            .order_by(TrackedAuthorWork.publication_date.desc())
+        )
+        unread = list(result.scalars())
+        if unread:
+            try:
+                summaries = await get_paper_summaries(unread, db)
+            except httpx.HTTPError:
+                # Offline: show what the cache has, however old
+                summaries = await cached_summaries(unread, db, fresh_only=False)
+            new_works = [summaries[i] for i in unread if i in summaries]
+
+    author_info = profile or AuthorSearchResult(
         openalex_id=openalex_id,
         display_name=tracked.display_name if tracked else "Author",
         works_count=tracked.works_count if tracked else 0,
@@ -76,10 +100,28 @@ async def get_author_works(
 
     return AuthorWorksResponse(
         author=author_info,
-        works=resp.results,
-        total_count=resp.meta.count,
-        has_new=has_new,
+        works=works,
+        total_count=total,
+        has_new=bool(new_works),
         new_works=new_works,
+        mirrored=mirrored,
+    )
+
+
+def _tracked_out(a: TrackedAuthor) -> TrackedAuthorOut:
+    return TrackedAuthorOut(
+        id=a.id,
+        openalex_id=a.openalex_id,
+        display_name=a.display_name,
+        works_count=a.works_count,
+        cited_by_count=a.cited_by_count,
+        institution=a.institution,
+        last_known_work_date=a.last_known_work_date,
+        new_works_count=a.new_works_count or 0,
+        last_checked_at=str(a.last_checked_at) if a.last_checked_at else None,
+        next_check_at=str(a.next_check_at) if a.next_check_at else None,
+        works_synced_at=str(a.works_synced_at) if a.works_synced_at else None,
+        created_at=str(a.created_at) if a.created_at else None,
     )
 
 
@@ -88,19 +130,7 @@ async def list_tracked_authors(db: AsyncSession = Depends(get_db)):
     stmt = select(TrackedAuthor).order_by(TrackedAuthor.display_name)
     result = await db.execute(stmt)
     authors = result.scalars().all()
-    return [
-        TrackedAuthorOut(
-            id=a.id,
-            openalex_id=a.openalex_id,
-            display_name=a.display_name,
-            works_count=a.works_count,
-            cited_by_count=a.cited_by_count,
-            institution=a.institution,
-            last_known_work_date=a.last_known_work_date,
-            created_at=str(a.created_at) if a.created_at else None,
-        )
-        for a in authors
-    ]
+    return [_tracked_out(a) for a in authors]
 
 
 @router.post("/authors/tracked", response_model=TrackedAuthorOut)
@@ -111,15 +141,11 @@ async def track_author(body: TrackAuthorRequest, db: AsyncSession = Depends(get_
     if existing:
         raise HTTPException(status_code=409, detail="Author already tracked")
 
-    # Get latest work date
+    # Get latest work date; checks report works published after it
     resp, raw_works = await openalex_client.get_author_works(
-        body.openalex_id, page=1, per_page=1,
+        body.openalex_id, sort="publication_date:desc", page=1, per_page=1,
     )
-    last_date = None
-    if resp.results:
-        w = resp.results[0]
-        if w.publication_year:
-            last_date = str(w.publication_year)
+    last_date = raw_works[0].get("publication_date") if raw_works else None
 
     author = TrackedAuthor(
         openalex_id=body.openalex_id,
@@ -132,16 +158,43 @@ async def track_author(body: TrackAuthorRequest, db: AsyncSession = Depends(get_
     db.add(author)
     await db.commit()
     await db.refresh(author)
-    return TrackedAuthorOut(
-        id=author.id,
-        openalex_id=author.openalex_id,
-        display_name=author.display_name,
-        works_count=author.works_count,
-        cited_by_count=author.cited_by_count,
-        institution=author.institution,
-        last_known_work_date=author.last_known_work_date,
-        created_at=str(author.created_at) if author.created_at else None,
+    return _tracked_out(author)
+
+
+@router.post("/authors/tracked/check-all", response_model=AuthorCheckAllResponse)
+async def check_all_tracked_authors(due_only: bool = False, db: AsyncSession = Depends(get_db)):
+    """Check every tracked author (or only those due) for new works, 50 authors per request."""
+    stmt = select(TrackedAuthor)
+    if due_only:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        stmt = stmt.where(or_(TrackedAuthor.next_check_at.is_(None), TrackedAuthor.next_check_at <= now))
+    authors = list((await db.execute(stmt)).scalars())
+    return await monitoring.check_authors(db, authors)
+
+
+@router.post("/authors/tracked/{author_id}/mark-read", response_model=TrackedAuthorOut)
+async def mark_tracked_author_read(author_id: int, db: AsyncSession = Depends(get_db)):
+    """Mark the works found by checks of a tracked author as seen."""
+    author = await db.get(TrackedAuthor, author_id)
+    if not author:
+        raise HTTPException(status_code=404, detail="Tracked author not found")
+    await db.execute(
+        update(TrackedAuthorWork).where(TrackedAuthorWork.author_id == author_id).values(is_read=True)
     )
+    author.new_works_count = 0
+    await db.commit()
+    await db.refresh(author)
+    return _tracked_out(author)
+
+
+@router.post("/authors/tracked/{author_id}/sync", response_model=TrackedAuthorOut)
+async def sync_tracked_author(author_id: int, db: AsyncSession = Depends(get_db)):
+    """(Re)build the local mirror of a tracked author's complete bibliography."""
+    author = await db.get(TrackedAuthor, author_id)
+    if not author:
+        raise HTTPException(status_code=404, detail="Tracked author not found")
+    await sync_author_works(db, author)
+    return _tracked_out(author)
 
 
 @router.delete("/authors/tracked/{author_id}")
@@ -149,6 +202,8 @@ async def untrack_author(author_id: int, db: AsyncSession = Depends(get_db)):
     author = await db.get(TrackedAuthor, author_id)
     if not author:
         raise HTTPException(status_code=404, detail="Tracked author not found")
+    await db.execute(delete(TrackedAuthorWork).where(TrackedAuthorWork.author_id == author_id))
+    await db.execute(delete(TrackedAuthorPaper).where(TrackedAuthorPaper.author_id == author_id))
     await db.delete(author)
     await db.commit()
     return {"ok": True}
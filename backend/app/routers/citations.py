@@ -1,9 +1,22 @@
-from fastapi import APIRouter, Depends
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
-from app.schemas.graph import GraphBuildRequest, GraphData, GraphExpandRequest
+from app.schemas.graph import (
+    CitationPathResult, GraphAnalysis, GraphAnalyzeRequest, GraphBuildRequest, GraphData,
+    GraphExpandRequest, GraphExportRequest, GraphPathRequest,
+)
 from app.services.citation_graph import graph_builder
+from app.services.citation_path import path_finder
+from app.services.graph_analytics import analyze_graph
+from app.services.graph_codec import negotiated_response
+from app.services.graph_export import EXPORT_FORMATS
+from app.services.graph_layout import apply_layout
 from app.services.openalex import openalex_client
 
 router = APIRouter(tags=["graph"])
@@ -12,21 +25,68 @@ router = APIRouter(tags=["graph"])
 @router.post("/graph/build", response_model=GraphData)
 async def build_graph(
     request: GraphBuildRequest,
+    accept: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
-    """Build a citation network graph from seed papers."""
+    """Build a citation network graph from seed papers.
+
+    Send ``Accept: application/vnd.lithelper.graph+json`` (or ``application/x-msgpack``)
+    for the compact columnar encoding.
+    """
+    result = await _build(request)
+    return negotiated_response(result, accept)
+
+
+async def _build(request: GraphBuildRequest) -> GraphData:
     result = await graph_builder.build_graph(
         seed_ids=request.seed_ids,
-        depth=min(request.depth, 3),
-        max_nodes=min(request.max_nodes, 1000),
+        depth=min(request.depth, settings.graph_max_depth),
+        max_nodes=min(request.max_nodes, settings.graph_max_nodes),
         direction=request.direction,
     )
-    return result
+    if request.layout:
+        await apply_layout(result)
+    return graph_builder.save_session(result)
+
+
+def _check_export_format(fmt: str):
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail="Unknown format; use one of: {}".format(", ".join(EXPORT_FORMATS)),
+        )
+
+
+def _export_response(graph: GraphData, fmt: str) -> StreamingResponse:
+    serialize, media_type, extension = EXPORT_FORMATS[fmt]
+    return StreamingResponse(
+        serialize(graph),
+        media_type=media_type,
+        headers={"Content-Disposition": 'attachment; filename="citation-graph.{}"'.format(extension)},
+    )
+
+
+@router.get("/graph/sessions/{session_id}/export")
+async def export_session(session_id: str, format: str = Query("graphml")):
+    """Stream a stored graph session as GraphML, GEXF, or node/edge CSV."""
+    _check_export_format(format)
+    graph = graph_builder.get_session(session_id)
+    if graph is None:
+        raise HTTPException(status_code=404, detail="Graph session not found")
+    return _export_response(graph, format)
+
+
+@router.post("/graph/export")
+async def export_graph(request: GraphExportRequest):
+    """Build a graph and stream it as GraphML, GEXF, or node/edge CSV."""
+    _check_export_format(request.format)
+    return _export_response(await _build(request), request.format)
 
 
 @router.post("/graph/expand", response_model=GraphData)
 async def expand_node(
     request: GraphExpandRequest,
+    accept: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
     """Expand a single node in the graph, returning new nodes and edges."""
@@ -35,4 +95,49 @@ async def expand_node(
         existing_ids=request.existing_ids,
         direction=request.direction,
     )
+    if request.layout:
+        fixed = dict(request.positions)
+        session = graph_builder.get_session(request.session_id) if request.session_id else None
+        if not fixed and session is not None:
+            fixed = {n.id: (n.x, n.y) for n in session.nodes if n.x is not None and n.y is not None}
+        await apply_layout(result, fixed=fixed)
+    if request.session_id and graph_builder.merge_into_session(request.session_id, result):
+        result.session_id = request.session_id
+    return negotiated_response(result, accept)
+
+
+@router.post("/graph/path", response_model=CitationPathResult)
+async def find_path(request: GraphPathRequest, db: AsyncSession = Depends(get_db)):
+    """Find the shortest citation paths connecting two papers (in either direction)."""
+    result = await path_finder.find_paths(
+        db,
+        request.source_id,
+        request.target_id,
+        k=min(max(request.k, 1), 10),
+        max_hops=min(max(request.max_hops, 1), 6),
+        max_requests=min(max(request.max_requests, 1), 200),
+    )
+    if result is None:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    graph_builder.save_session(result)
     return result
+
+
+@router.post("/graph/analyze", response_model=GraphAnalysis)
+async def analyze(request: GraphAnalyzeRequest):
+    """Compute PageRank, degrees, betweenness, k-core and communities for a graph."""
+    if request.session_id:
+        graph = graph_builder.get_session(request.session_id)
+        if graph is None:
+            raise HTTPException(status_code=404, detail="Graph session not found")
+    elif request.graph is not None:
+        graph = request.graph
+    else:
+        raise HTTPException(status_code=400, detail="Provide a session_id or a graph")
+
+    # CPU-bound; keep it off the event loop
+    return await asyncio.to_thread(
+        analyze_graph, graph,
+        damping=request.damping,
+        betweenness_samples=min(max(request.betweenness_samples, 1), 512),
+    )
@@ -1,49 +1,25 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select, func as sqlfunc
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.database import get_db
 from app.models.collection import Collection, CollectionPaper
-from app.models.paper import Paper
 from app.schemas.collection import (
     CollectionCreate, CollectionUpdate, CollectionPaperAdd,
-    CollectionSummary, CollectionDetail, CollectionPaperInfo,
+    CollectionSummary, CollectionDetail, CollectionPaperInfo, CollectionGaps, CollectionStats, CollectionWarmup,
+    CollectionPapersBulk, CollectionPapersTransfer, CollectionBulkResult,
 )
-from app.schemas.paper import AuthorShip, PaperSummary
+from app.services import collection_membership
+from app.services.collection_analysis import collection_stats, find_gaps
+from app.services.collection_listing import MEMBER_SORTS, InvalidCursor, list_members
+from app.services.collection_warmup import collection_warmup
 
 router = APIRouter(tags=["collections"])
 
 
-def _paper_to_summary(paper: Paper) -> PaperSummary:
-    authors = []
-    if paper.authorships_json:
-        for a in paper.authorships_json:
-            author = a.get("author", {})
-            institutions = a.get("institutions", [])
-            authors.append(AuthorShip(
-                author_id=author.get("id"),
-                author_name=author.get("display_name", ""),
-                institution=institutions[0].get("display_name") if institutions else None,
-            ))
-    oa = paper.open_access_json or {}
-    loc = paper.primary_location_json or {}
-    source = loc.get("source") or {}
-    return PaperSummary(
-        openalex_id=paper.openalex_id,
-        doi=paper.doi,
-        title=paper.title,
-        publication_year=paper.publication_year,
-        cited_by_count=paper.cited_by_count,
-        authors=authors,
-        type=paper.type,
-        is_open_access=oa.get("is_oa", False),
-        source_name=source.get("display_name"),
-    )
-
-
 @router.get("/collections", response_model=List[CollectionSummary])
 async def list_collections(db: AsyncSession = Depends(get_db)):
     stmt = (
@@ -88,34 +64,47 @@ async def create_collection(body: CollectionCreate, db: AsyncSession = Depends(g
 
 
 @router.get("/collections/{collection_id}", response_model=CollectionDetail)
-async def get_collection(collection_id: int, db: AsyncSession = Depends(get_db)):
-    stmt = (
-        select(Collection)
-        .where(Collection.id == collection_id)
-        .options(selectinload(Collection.papers).selectinload(CollectionPaper.paper))
-    )
-    result = await db.execute(stmt)
-    coll = result.scalar_one_or_none()
+async def get_collection(
+    collection_id: int,
+    sort: str = "added_at",
+    desc: bool = True,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    is_oa: Optional[bool] = None,
+    type: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """A collection and its members, sorted and filtered in SQL.
+
+    Members come in pages of `limit` (default 100): follow `next_cursor`
+    until it is null.
+    """
+    if sort not in MEMBER_SORTS:
+        raise HTTPException(status_code=400, detail="Unknown sort: {}".format(sort))
+    coll = await db.get(Collection, collection_id)
     if not coll:
         raise HTTPException(status_code=404, detail="Collection not found")
-
-    papers_info = []
-    for cp in coll.papers:
-        info = CollectionPaperInfo(
-            openalex_id=cp.paper_openalex_id,
-            added_at=str(cp.added_at) if cp.added_at else None,
-            notes=cp.notes,
-            paper=_paper_to_summary(cp.paper) if cp.paper else None,
+    try:
+        papers_info, total, next_cursor = await list_members(
+            db, collection_id, sort=sort, desc=desc, limit=limit, cursor=cursor,
+            year_min=year_min, year_max=year_max, is_oa=is_oa, work_type=type,
         )
-        papers_info.append(info)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    count_stmt = select(sqlfunc.count(CollectionPaper.id)).where(CollectionPaper.collection_id == collection_id)
+    paper_count = (await db.execute(count_stmt)).scalar() or 0
 
     return CollectionDetail(
         id=coll.id,
         name=coll.name,
         description=coll.description,
-        paper_count=len(papers_info),
+        paper_count=paper_count,
         created_at=str(coll.created_at) if coll.created_at else None,
         papers=papers_info,
+        total=total,
+        next_cursor=next_cursor,
     )
 
 
@@ -150,11 +139,67 @@ async def delete_collection(collection_id: int, db: AsyncSession = Depends(get_d
     coll = await db.get(Collection, collection_id)
     if not coll:
         raise HTTPException(status_code=404, detail="Collection not found")
+    await collection_warmup.cancel(collection_id)
     await db.delete(coll)
     await db.commit()
+    collection_stats.invalidate(collection_id)
     return {"ok": True}
 
 
+@router.get("/collections/{collection_id}/gaps", response_model=CollectionGaps)
+async def get_collection_gaps(
+    collection_id: int,
+    limit: int = Query(20, ge=1, le=200),
+    min_count: int = Query(2, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """Papers cited by at least `min_count` members that are not in the collection, from local data."""
+    if not await db.get(Collection, collection_id):
+        raise HTTPException(status_code=404, detail="Collection not found")
+    return await find_gaps(db, collection_id, limit, min_count)
+
+
+@router.get("/collections/{collection_id}/stats", response_model=CollectionStats)
+async def get_collection_stats(
+    collection_id: int,
+    top: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    """Year histogram, citation quantiles, OA share and top authors, venues and topics, computed in SQL
+    and cached until the collection's members or their papers change."""
+    if not await db.get(Collection, collection_id):
+        raise HTTPException(status_code=404, detail="Collection not found")
+    return await collection_stats.get(db, collection_id, top)
+
+
+@router.post("/collections/{collection_id}/warmup", response_model=CollectionWarmup)
+async def start_collection_warmup(collection_id: int, db: AsyncSession = Depends(get_db)):
+    """Prefetch the members' reference lists and top citers in the background, at a low request rate.
+
+    Graph builds and discovery on the collection then run mostly from local data.
+    """
+    if not await db.get(Collection, collection_id):
+        raise HTTPException(status_code=404, detail="Collection not found")
+    collection_warmup.start(collection_id)
+    return await collection_warmup.status(db, collection_id)
+
+
+@router.get("/collections/{collection_id}/warmup", response_model=CollectionWarmup)
+async def get_collection_warmup(collection_id: int, db: AsyncSession = Depends(get_db)):
+    """Progress of the collection's warm-up and how much of its neighborhood is cached."""
+    if not await db.get(Collection, collection_id):
+        raise HTTPException(status_code=404, detail="Collection not found")
+    return await collection_warmup.status(db, collection_id)
+
+
+@router.delete("/collections/{collection_id}/warmup", response_model=CollectionWarmup)
+async def cancel_collection_warmup(collection_id: int, db: AsyncSession = Depends(get_db)):
+    if not await db.get(Collection, collection_id):
+        raise HTTPException(status_code=404, detail="Collection not found")
+    await collection_warmup.cancel(collection_id)
+    return await collection_warmup.status(db, collection_id)
+
+
 @router.post("/collections/{collection_id}/papers", response_model=CollectionPaperInfo)
 async def add_paper_to_collection(
     collection_id: int, body: CollectionPaperAdd, db: AsyncSession = Depends(get_db)
@@ -178,7 +223,12 @@ async def add_paper_to_collection(
         notes=body.notes,
     )
     db.add(cp)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Added by a concurrent request since the check above
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Paper already in collection")
     await db.refresh(cp)
     return CollectionPaperInfo(
         openalex_id=cp.paper_openalex_id,
@@ -201,3 +251,41 @@ async def remove_paper_from_collection(
     await db.delete(cp)
     await db.commit()
     return {"ok": True}
+
+
+@router.post("/collections/{collection_id}/papers/bulk-add", response_model=CollectionBulkResult)
+async def bulk_add_papers(collection_id: int, body: CollectionPapersBulk, db: AsyncSession = Depends(get_db)):
+    """Add many papers in one transaction; papers not cached yet are fetched in batches."""
+    if not await db.get(Collection, collection_id):
+        raise HTTPException(status_code=404, detail="Collection not found")
+    return await collection_membership.add_papers(db, collection_id, body.openalex_ids, body.notes)
+
+
+@router.post("/collections/{collection_id}/papers/bulk-remove", response_model=CollectionBulkResult)
+async def bulk_remove_papers(collection_id: int, body: CollectionPapersBulk, db: AsyncSession = Depends(get_db)):
+    if not await db.get(Collection, collection_id):
+        raise HTTPException(status_code=404, detail="Collection not found")
+    return await collection_membership.remove_papers(db, collection_id, body.openalex_ids)
+
+
+async def _transfer(collection_id: int, body: CollectionPapersTransfer, move: bool, db: AsyncSession):
+    if body.target_collection_id == collection_id:
+        raise HTTPException(status_code=400, detail="Source and target collection are the same")
+    for cid in (collection_id, body.target_collection_id):
+        if not await db.get(Collection, cid):
+            raise HTTPException(status_code=404, detail="Collection {} not found".format(cid))
+    return await collection_membership.copy_papers(
+        db, collection_id, body.target_collection_id, body.openalex_ids, move=move,
+    )
+
+
+@router.post("/collections/{collection_id}/papers/copy", response_model=CollectionBulkResult)
+async def copy_papers(collection_id: int, body: CollectionPapersTransfer, db: AsyncSession = Depends(get_db)):
+    """Copy members (with their notes) to another collection."""
+    return await _transfer(collection_id, body, move=False, db=db)
+
+
+@router.post("/collections/{collection_id}/papers/move", response_model=CollectionBulkResult)
+async def move_papers(collection_id: int, body: CollectionPapersTransfer, db: AsyncSession = Depends(get_db)):
+    """Move members (with their notes) to another collection."""
+    return await _transfer(collection_id, body, move=True, db=db)
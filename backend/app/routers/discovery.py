@@ -1,32 +1,108 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import json
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.schemas.discovery import DiscoveryRequest, DiscoveryResponse
-from app.services.discovery import discover_co_citation, discover_bibliographic_coupling
+from app.database import async_session, get_db
+from app.models.discovery import DiscoveryJob
+from app.schemas.discovery import DiscoveryJobOut, DiscoveryRequest, DiscoveryResponse
+from app.services.citation_matrix import MEASURES
+from app.services.citing_sampler import SAMPLING_STRATEGIES
+from app.services.discovery import DiscoveryProgress, run_discovery
+from app.services.discovery_jobs import discovery_jobs
 
 router = APIRouter(tags=["discovery"])
 
 
-@router.post("/discovery/multi-seed", response_model=DiscoveryResponse)
-async def multi_seed_discovery(body: DiscoveryRequest, db: AsyncSession = Depends(get_db)):
-    if body.strategy == "bibliographic_coupling":
-        results = await discover_bibliographic_coupling(
-            seed_ids=body.seed_ids,
-            db=db,
-            max_results=body.max_results,
-            citing_sample_size=body.citing_sample_size,
+def _check_request(body: DiscoveryRequest):
+    if body.similarity not in MEASURES:
+        raise HTTPException(
+            status_code=400,
+            detail="Unknown similarity; use one of: {}".format(", ".join(MEASURES)),
         )
-    else:
-        results = await discover_co_citation(
-            seed_ids=body.seed_ids,
-            db=db,
-            max_results=body.max_results,
-            citing_sample_size=body.citing_sample_size,
+    if body.sampling not in SAMPLING_STRATEGIES:
+        raise HTTPException(
+            status_code=400,
+            detail="Unknown sampling; use one of: {}".format(", ".join(SAMPLING_STRATEGIES)),
         )
 
+
+@router.post("/discovery/multi-seed", response_model=DiscoveryResponse)
+async def multi_seed_discovery(body: DiscoveryRequest, db: AsyncSession = Depends(get_db)):
+    _check_request(body)
+    progress = DiscoveryProgress()
+    results = await run_discovery(body, db, progress)
+
     return DiscoveryResponse(
         strategy=body.strategy,
         seed_count=len(body.seed_ids),
         results=results,
+        coverage=progress.coverage,
+    )
+
+
+@router.post("/discovery/jobs", response_model=DiscoveryJobOut, status_code=202)
+async def create_discovery_job(body: DiscoveryRequest):
+    """Start a discovery run in the background; poll or stream its progress by job id."""
+    _check_request(body)
+    job = await discovery_jobs.create(body)
+    return discovery_jobs.to_out(job)
+
+
+@router.get("/discovery/jobs", response_model=List[DiscoveryJobOut])
+async def list_discovery_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    """Recent jobs, newest first (without results)."""
+    result = await db.execute(select(DiscoveryJob).order_by(DiscoveryJob.id.desc()).limit(limit))
+    return [discovery_jobs.to_out(job) for job in result.scalars().all()]
+
+
+@router.get("/discovery/jobs/{job_id}", response_model=DiscoveryJobOut)
+async def get_discovery_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    job = await db.get(DiscoveryJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return discovery_jobs.to_out(job, include_results=True)
+
+
+@router.get("/discovery/jobs/{job_id}/events")
+async def stream_discovery_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """Server-sent events: `progress` while the job runs, then one event named after its final status."""
+    if not await db.get(DiscoveryJob, job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last_version = -1
+        while True:
+            progress = discovery_jobs.progress(job_id)
+            if progress is None:
+                async with async_session() as session:
+                    job = await session.get(DiscoveryJob, job_id)
+                    out = discovery_jobs.to_out(job)
+                yield "event: {}\ndata: {}\n\n".format(out.status, out.model_dump_json())
+                return
+            if progress.version != last_version:
+                last_version = progress.version
+                yield "event: progress\ndata: {}\n\n".format(json.dumps(progress.to_dict()))
+            await asyncio.sleep(0.5)
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"},
     )
+
+
+@router.post("/discovery/jobs/{job_id}/cancel", response_model=DiscoveryJobOut)
+async def cancel_discovery_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    job = await db.get(DiscoveryJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not await discovery_jobs.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job is not running")
+    await db.refresh(job)
+    return discovery_jobs.to_out(job)
@@ -10,6 +10,7 @@ from app.database import get_db
 from app.models.collection import CollectionPaper
 from app.services.import_export import export_bibtex, export_ris, parse_bibtex, parse_ris
 from app.services.openalex import openalex_client
+from app.services.similarity_index import similarity_index
 
 router = APIRouter(tags=["import_export"])
 
@@ -19,12 +20,20 @@ class ExportRequest(BaseModel):
     format: str = "bibtex"  # "bibtex" or "ris"
 
 
+class ImportDuplicate(BaseModel):
+    openalex_id: str  # imported paper
+    duplicate_of: str  # e.g. the preprint or published version of the same work
+    similarity: float
+    in_library: bool  # duplicate_of is already in a collection (else it is in this import)
+
+
 class ImportResult(BaseModel):
     total: int
     resolved: int
     failed: int
     resolved_ids: List[str]
     failed_entries: List[str]
+    duplicates: List[ImportDuplicate] = []
 
 
 @router.post("/export", response_class=PlainTextResponse)
@@ -72,7 +81,7 @@ async def import_file(
             try:
                 doi_url = doi if doi.startswith("http") else "https://doi.org/{}".format(doi)
                 detail, raw = await openalex_client.get_work(doi_url)
-                await openalex_client.cache_works([raw], db)
+                await openalex_client.cache_works([raw])
                 openalex_id = detail.openalex_id
             except Exception:
                 pass
@@ -82,7 +91,7 @@ async def import_file(
             try:
                 search_resp, raw_works = await openalex_client.search_works(title, per_page=3)
                 if raw_works:
-                    await openalex_client.cache_works(raw_works, db)
+                    await openalex_client.cache_works(raw_works)
                 for r in search_resp.results:
                     if r.title and title.lower()[:30] in r.title.lower():
                         openalex_id = r.openalex_id
@@ -97,10 +106,22 @@ async def import_file(
         else:
             failed_entries.append(title or doi or entry.get("key", "unknown"))
 
+    # Flag near-duplicates (preprint vs. published versions) within the import and the library
+    await openalex_client.writer.sync()
+    result = await db.execute(select(CollectionPaper.paper_openalex_id).distinct())
+    library = set(result.scalars())
+    resolved = set(resolved_ids)
+    pairs = await similarity_index.duplicates(db, resolved_ids, among=library | resolved)
+    duplicates = [
+        ImportDuplicate(openalex_id=a, duplicate_of=b, similarity=score, in_library=b in library)
+        for a, b, score in pairs
+    ]
+
     return ImportResult(
         total=len(entries),
         resolved=len(resolved_ids),
         failed=len(failed_entries),
         resolved_ids=resolved_ids,
         failed_entries=failed_entries,
+        duplicates=duplicates,
     )
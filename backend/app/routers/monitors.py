@@ -1,17 +1,17 @@
 from datetime import datetime, timezone
-from typing import List, Set
+from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func as sqlfunc
+from sqlalchemy import or_, select, func as sqlfunc
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.database import get_db
 from app.models.monitor import MonitoredSearch, MonitoredSearchResult
 from app.schemas.monitor import (
-    MonitorCreate, MonitorSummary, MonitorDetail, MonitorResultOut,
+    MonitorCreate, MonitorSummary, MonitorDetail, MonitorResultOut, MonitorCheckAllResponse,
 )
-from app.services.openalex import openalex_client
+from app.services import monitoring
 
 router = APIRouter(tags=["monitors"])
 
@@ -25,6 +25,7 @@ async def list_monitors(db: AsyncSession = Depends(get_db)):
             MonitoredSearch.query,
             MonitoredSearch.check_interval_hours,
             MonitoredSearch.last_checked_at,
+            MonitoredSearch.next_check_at,
             MonitoredSearch.known_result_count,
             MonitoredSearch.created_at,
             sqlfunc.count(MonitoredSearchResult.id).filter(
@@ -44,6 +45,7 @@ async def list_monitors(db: AsyncSession = Depends(get_db)):
             query=r.query,
             check_interval_hours=r.check_interval_hours,
             last_checked_at=str(r.last_checked_at) if r.last_checked_at else None,
+            next_check_at=str(r.next_check_at) if r.next_check_at else None,
             known_result_count=r.known_result_count,
             unread_count=r.unread_count,
             created_at=str(r.created_at) if r.created_at else None,
@@ -104,6 +106,7 @@ async def get_monitor(monitor_id: int, db: AsyncSession = Depends(get_db)):
         query=monitor.query,
         check_interval_hours=monitor.check_interval_hours,
         last_checked_at=str(monitor.last_checked_at) if monitor.last_checked_at else None,
+        next_check_at=str(monitor.next_check_at) if monitor.next_check_at else None,
         known_result_count=monitor.known_result_count,
         unread_count=unread,
         created_at=str(monitor.created_at) if monitor.created_at else None,
@@ -122,48 +125,25 @@ async def delete_monitor(monitor_id: int, db: AsyncSession = Depends(get_db)):
     return {"ok": True}
 
 
+@router.post("/monitors/check-all", response_model=MonitorCheckAllResponse)
+async def check_all_monitors(due_only: bool = False, db: AsyncSession = Depends(get_db)):
+    """Check every monitor (or only those due), sharing searches between identical monitors."""
+    stmt = select(MonitoredSearch)
+    if due_only:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        stmt = stmt.where(or_(MonitoredSearch.next_check_at.is_(None), MonitoredSearch.next_check_at <= now))
+    monitors = list((await db.execute(stmt)).scalars())
+    return await monitoring.check_monitors(db, monitors)
+
+
 @router.post("/monitors/{monitor_id}/check", response_model=MonitorDetail)
 async def check_monitor(monitor_id: int, db: AsyncSession = Depends(get_db)):
     """Force-check a monitored search for new results."""
-    stmt = (
-        select(MonitoredSearch)
-        .where(MonitoredSearch.id == monitor_id)
-        .options(selectinload(MonitoredSearch.results))
-    )
-    result = await db.execute(stmt)
-    monitor = result.scalar_one_or_none()
+    monitor = await db.get(MonitoredSearch, monitor_id)
     if not monitor:
         raise HTTPException(status_code=404, detail="Monitor not found")
 
-    # Get current known paper IDs
-    known_ids: Set[str] = {r.paper_openalex_id for r in monitor.results}
-
-    # Search OpenAlex
-    filters = monitor.filters or {}
-    resp, raw_works = await openalex_client.search_works(
-        query=monitor.query,
-        year_min=filters.get("year_min"),
-        year_max=filters.get("year_max"),
-        work_type=filters.get("type"),
-        per_page=50,
-    )
-    await openalex_client.cache_works(raw_works, db)
-
-    # Find new results
-    new_count = 0
-    for paper in resp.results:
-        if paper.openalex_id not in known_ids:
-            new_result = MonitoredSearchResult(
-                monitor_id=monitor.id,
-                paper_openalex_id=paper.openalex_id,
-                paper_title=paper.title,
-            )
-            db.add(new_result)
-            new_count += 1
-
-    monitor.last_checked_at = datetime.now(timezone.utc)
-    monitor.known_result_count = resp.meta.count
-    await db.commit()
+    await monitoring.check_monitor(db, monitor)
 
     # Reload for response
     return await get_monitor(monitor_id, db)
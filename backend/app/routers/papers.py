@@ -1,11 +1,15 @@
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.schemas.paper import PaperDetail, SearchResponse
+from app.models.paper import Paper
+from app.schemas.paper import PaperDetail, SearchResponse, SimilarPaper
 from app.services.openalex import openalex_client
+from app.services.paper_cache import normalize_id, paper_to_summary
+from app.services.similarity_index import similarity_index
 
 router = APIRouter(tags=["papers"])
 
@@ -18,7 +22,7 @@ async def get_paper(
     """Get full paper detail by OpenAlex ID."""
     try:
         parsed, raw = await openalex_client.get_work(openalex_id)
-        await openalex_client.cache_works([raw], db)
+        await openalex_client.cache_works([raw])
         return parsed
     except Exception as e:
         raise HTTPException(status_code=404, detail="Paper not found: {}".format(str(e)))
@@ -55,7 +59,7 @@ async def get_paper_references(
         )
 
     parsed, raw = await openalex_client.batch_get_works(page_ids)
-    await openalex_client.cache_works(raw, db)
+    await openalex_client.cache_works(raw)
 
     from app.schemas.paper import SearchMeta
     return SearchResponse(
@@ -75,5 +79,33 @@ async def get_paper_citations(
     parsed, raw = await openalex_client.get_work_citations(
         openalex_id, page=page, per_page=per_page
     )
-    await openalex_client.cache_works(raw, db)
+    await openalex_client.cache_works(raw)
     return parsed
+
+
+@router.get("/papers/{openalex_id}/similar", response_model=List[SimilarPaper])
+async def get_similar_papers(
+    openalex_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    min_similarity: float = Query(0.1, ge=0.0, le=1.0),
+    db: AsyncSession = Depends(get_db),
+):
+    """Cached papers with similar title and abstract wording, from the local MinHash index."""
+    openalex_id = normalize_id(openalex_id)
+    matches = await similarity_index.similar(db, openalex_id, limit, min_similarity)
+    if matches is None:
+        # Not cached yet: fetch it once, then match against the cache
+        try:
+            _, raw = await openalex_client.get_work(openalex_id)
+        except Exception as e:
+            raise HTTPException(status_code=404, detail="Paper not found: {}".format(str(e)))
+        await openalex_client.cache_works([raw])
+        await openalex_client.writer.sync()
+        matches = await similarity_index.similar(db, raw.get("id", openalex_id), limit, min_similarity) or []
+
+    result = await db.execute(select(Paper).where(Paper.openalex_id.in_([oa_id for oa_id, _ in matches])))
+    papers = {p.openalex_id: p for p in result.scalars()}
+    return [
+        SimilarPaper(paper=paper_to_summary(papers[oa_id]), similarity=score)
+        for oa_id, score in matches if oa_id in papers
+    ]
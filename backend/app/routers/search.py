@@ -32,5 +32,5 @@ async def search_works(
         per_page=per_page,
     )
     # Cache results in local DB
-    await openalex_client.cache_works(raw_works, db)
+    await openalex_client.cache_works(raw_works)
     return parsed
@@ -26,6 +26,10 @@ class TrackedAuthorOut(BaseModel):
     cited_by_count: int = 0
     institution: Optional[str] = None
     last_known_work_date: Optional[str] = None
+    new_works_count: int = 0
+    last_checked_at: Optional[str] = None
+    next_check_at: Optional[str] = None
+    works_synced_at: Optional[str] = None  # bibliography mirrored locally
     created_at: Optional[str] = None
 
 
@@ -43,3 +47,22 @@ class AuthorWorksResponse(BaseModel):
     total_count: int
     has_new: bool = False
     new_works: List[PaperSummary] = []
+    mirrored: bool = False  # served from the local bibliography mirror
+
+
+class AuthorCheckResult(BaseModel):
+    author_id: int
+    display_name: str
+    new_works: int = 0
+    last_known_work_date: Optional[str] = None
+    truncated: bool = False  # the page cap was hit; the remaining newer works are fetched by the next check
+    error: Optional[str] = None
+
+
+class AuthorCheckAllResponse(BaseModel):
+    checked: int
+    batches: int  # OR-filtered requests cover up to 50 authors each
+    requests: int
+    new_works: int
+    elapsed_ms: float
+    authors: List[AuthorCheckResult]
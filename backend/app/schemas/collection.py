@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.paper import PaperSummary
 
@@ -20,6 +20,24 @@ class CollectionPaperAdd(BaseModel):
     notes: Optional[str] = None
 
 
+class CollectionPapersBulk(BaseModel):
+    openalex_ids: List[str] = Field(max_length=5000)
+    notes: Optional[str] = None  # set on added papers
+
+
+class CollectionPapersTransfer(BaseModel):
+    openalex_ids: List[str] = Field(max_length=5000)
+    target_collection_id: int
+
+
+class CollectionBulkResult(BaseModel):
+    added: int = 0
+    removed: int = 0
+    skipped: int = 0  # already members (add, copy, move) or not members (remove)
+    failed: int = 0  # unknown to OpenAlex (add) or not in the source collection (copy, move)
+    failed_ids: List[str] = []
+
+
 class CollectionPaperInfo(BaseModel):
     openalex_id: str
     added_at: Optional[str] = None
@@ -41,3 +59,59 @@ class CollectionSummary(BaseModel):
 
 class CollectionDetail(CollectionSummary):
     papers: List[CollectionPaperInfo] = []
+    total: int = 0  # members matching the filters
+    next_cursor: Optional[str] = None  # pass back as `cursor` for the next page
+
+
+class CollectionGap(BaseModel):
+    openalex_id: str
+    cited_by_members: int
+    share: float  # of members with cached references
+    paper: Optional[PaperSummary] = None
+
+
+class CollectionGaps(BaseModel):
+    collection_id: int
+    member_count: int
+    members_with_references: int
+    gaps: List[CollectionGap] = []
+
+
+class CollectionStatCount(BaseModel):
+    key: str  # OpenAlex ID (authors, venues, topics) or year
+    label: Optional[str] = None
+    count: int
+
+
+class CitationQuantile(BaseModel):
+    quantile: float
+    cited_by_count: int
+
+
+class CollectionStats(BaseModel):
+    collection_id: int
+    member_count: int
+    papers_analyzed: int  # members with a cached paper row
+    open_access_count: int
+    open_access_share: float
+    mean_citations: float
+    citation_quantiles: List[CitationQuantile] = []
+    years: List[CollectionStatCount] = []
+    top_authors: List[CollectionStatCount] = []
+    top_venues: List[CollectionStatCount] = []
+    top_topics: List[CollectionStatCount] = []
+    cached: bool = False  # served from the stats cache
+
+
+class CollectionWarmup(BaseModel):
+    collection_id: int
+    status: str = "idle"  # idle | running | completed | failed | cancelled (last run in this process)
+    stage: Optional[str] = None  # references | citers | done
+    error: Optional[str] = None
+    requests_made: int = 0
+    failed_requests: int = 0
+    references_fetched: int = 0
+    citers_fetched: int = 0
+    member_count: int = 0
+    references_cached: int = 0  # members with a fresh reference list
+    citers_cached: int = 0  # members with a stored top-citer sample
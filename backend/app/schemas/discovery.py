@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -10,6 +10,26 @@ class DiscoveryRequest(BaseModel):
     strategy: str = "co_citation"  # "co_citation" | "bibliographic_coupling"
     max_results: int = 30
     citing_sample_size: int = 100
+    similarity: str = "count"  # "count" | "salton" | "jaccard" | "association"
+    # How co-citation samples each seed's citers: "top" | "cursor" | "random" | "stratified"
+    sampling: str = "top"
+    max_requests_per_seed: int = 10
+    max_works_per_seed: int = 5000
+    sample_seed: int = 42  # makes "random" and "stratified" samples reproducible
+
+
+class SeedCoverage(BaseModel):
+    """How much of one seed's citing set a discovery run sampled."""
+    seed_id: str
+    sampling: str
+    citing_total: Optional[int] = None
+    sampled: int = 0
+    coverage: Optional[float] = None  # sampled / citing_total
+    requests: int = 0
+    strata: int = 0  # publication-year bins ("stratified")
+    # What cut the sample short: "requests" | "memory" | "sample limit" | "error"
+    truncated: Optional[str] = None
+    cached: bool = False  # reused from an earlier run or the local cache
 
 
 class DiscoveryResult(BaseModel):
@@ -23,3 +43,28 @@ class DiscoveryResponse(BaseModel):
     strategy: str
     seed_count: int
     results: List[DiscoveryResult]
+    coverage: List[SeedCoverage] = []
+
+
+class DiscoveryJobProgress(BaseModel):
+    stage: str = "queued"
+    seeds_total: int = 0
+    seeds_scanned: int = 0
+    references_total: int = 0
+    references_scanned: int = 0
+    candidates_found: int = 0
+    requests_made: int = 0
+    coverage: List[SeedCoverage] = []
+
+
+class DiscoveryJobOut(BaseModel):
+    id: int
+    strategy: str
+    seed_count: int
+    params: Dict = {}
+    status: str  # pending | running | completed | failed | cancelled | interrupted
+    progress: Optional[DiscoveryJobProgress] = None
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    results: Optional[List[DiscoveryResult]] = None  # set once completed
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from pydantic import BaseModel
 
@@ -11,6 +11,8 @@ class GraphNode(BaseModel):
     authors: List[str] = []
     is_seed: bool = False
     depth: int = 0
+    x: Optional[float] = None  # set when a server-side layout was requested
+    y: Optional[float] = None
 
 
 class GraphEdge(BaseModel):
@@ -21,6 +23,8 @@ class GraphEdge(BaseModel):
 class GraphData(BaseModel):
     nodes: List[GraphNode]
     edges: List[GraphEdge]
+    session_id: Optional[str] = None  # set on /graph/build results; reusable by analysis endpoints
+    failed_nodes: List[str] = []  # nodes whose neighbors or metadata could not be fetched (e.g. rate limited)
 
 
 class GraphBuildRequest(BaseModel):
@@ -28,9 +32,57 @@ class GraphBuildRequest(BaseModel):
     depth: int = 1
     max_nodes: int = 500
     direction: str = "both"  # "references", "citations", or "both"
+    layout: bool = False  # precompute x/y positions server-side
+
+
+class GraphExportRequest(GraphBuildRequest):
+    format: str = "graphml"  # "graphml", "gexf", "nodes_csv" or "edges_csv"
 
 
 class GraphExpandRequest(BaseModel):
     node_id: str
     existing_ids: List[str] = []
     direction: str = "both"
+    session_id: Optional[str] = None  # merge the expansion into this graph session
+    layout: bool = False  # place new nodes around the existing (pinned) ones
+    positions: Dict[str, Tuple[float, float]] = {}  # current positions; defaults to the session's
+
+
+class GraphPathRequest(BaseModel):
+    source_id: str
+    target_id: str
+    k: int = 3  # number of shortest paths to return
+    max_hops: int = 4
+    max_requests: int = 40  # OpenAlex request budget for the search
+
+
+class CitationPathResult(GraphData):
+    paths: List[List[str]] = []  # node IDs, citing end first; each paper cites the next
+    requests_used: int = 0
+    failed_requests: int = 0  # OpenAlex requests that failed, so paths through those papers may be missing
+    exhausted: bool = False  # the request budget ran out, so shorter paths may have been missed
+
+
+class GraphAnalyzeRequest(BaseModel):
+    session_id: Optional[str] = None
+    graph: Optional[GraphData] = None
+    damping: float = 0.85
+    betweenness_samples: int = 64  # pivot sources for the betweenness approximation
+
+
+class NodeMetrics(BaseModel):
+    id: str
+    pagerank: float
+    in_degree: int
+    out_degree: int
+    betweenness: float
+    core_number: int
+    community: int
+
+
+class GraphAnalysis(BaseModel):
+    node_count: int
+    edge_count: int
+    community_count: int
+    max_core: int
+    nodes: List[NodeMetrics]
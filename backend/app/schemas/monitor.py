@@ -16,6 +16,7 @@ class MonitorSummary(BaseModel):
     query: str
     check_interval_hours: int
     last_checked_at: Optional[str] = None
+    next_check_at: Optional[str] = None
     known_result_count: int = 0
     unread_count: int = 0
     created_at: Optional[str] = None
@@ -32,3 +33,25 @@ class MonitorResultOut(BaseModel):
 class MonitorDetail(MonitorSummary):
     filters: Optional[Dict] = None
     results: List[MonitorResultOut] = []
+
+
+class MonitorCheckResult(BaseModel):
+    monitor_id: int
+    name: str
+    new_results: int = 0
+    result_count: int = 0
+    shared_with: int = 0  # other monitors that used the same search
+    requests: int = 0  # OpenAlex requests made by that search
+    elapsed_ms: float = 0.0
+    truncated: bool = False  # the page cap was hit, so only the newest of `matched` results were checked
+    matched: int = 0  # results published since the last check (minus the lookback)
+    error: Optional[str] = None
+
+
+class MonitorCheckAllResponse(BaseModel):
+    checked: int
+    searches: int
+    requests: int
+    new_results: int
+    elapsed_ms: float
+    monitors: List[MonitorCheckResult]
@@ -30,10 +30,16 @@ class PaperDetail(PaperSummary):
     referenced_work_ids: List[str] = []
 
 
+class SimilarPaper(BaseModel):
+    paper: PaperSummary
+    similarity: float  # estimated Jaccard similarity of title and abstract words
+
+
 class SearchMeta(BaseModel):
     count: int
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 
 class SearchResponse(BaseModel):
@@ -0,0 +1,85 @@
+"""Reads from the local author profile cache, falling back to OpenAlex for missing or stale authors."""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.author import AuthorProfile
+from app.schemas.author import AuthorSearchResult
+from app.services.openalex import openalex_client
+from app.services.paper_cache import staleness_cutoff
+
+_AUTHOR_URL = "https://openalex.org/"
+_CACHED_COLUMNS = ["display_name", "works_count", "cited_by_count", "institution", "fetched_at"]
+
+
+def author_url(openalex_id: str) -> str:
+    """Full OpenAlex URL for an author ID given either as A123 or as a URL."""
+    return openalex_id if openalex_id.startswith("http") else _AUTHOR_URL + openalex_id
+
+
+def author_to_result(raw: Dict) -> AuthorSearchResult:
+    """Parse a raw OpenAlex author record."""
+    institutions = raw.get("last_known_institutions") or []
+    return AuthorSearchResult(
+        openalex_id=raw.get("id", ""),
+        display_name=raw.get("display_name") or "",
+        works_count=raw.get("works_count") or 0,
+        cited_by_count=raw.get("cited_by_count") or 0,
+        institution=institutions[0].get("display_name") if institutions else None,
+    )
+
+
+async def cache_authors(db: AsyncSession, authors: List[AuthorSearchResult]):
+    """Upsert parsed author records into the profile cache."""
+    now = datetime.now(timezone.utc)
+    rows = [
+        dict(
+            openalex_id=author_url(a.openalex_id),
+            display_name=a.display_name,
+            works_count=a.works_count,
+            cited_by_count=a.cited_by_count,
+            institution=a.institution,
+            fetched_at=now,
+        )
+        for a in authors if a.openalex_id and a.display_name
+    ]
+    if not rows:
+        return
+    stmt = sqlite_insert(AuthorProfile)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AuthorProfile.openalex_id],
+        set_={col: stmt.excluded[col] for col in _CACHED_COLUMNS},
+    )
+    await db.execute(stmt, rows)
+    await db.commit()
+
+
+async def get_author_profile(openalex_id: str, db: AsyncSession) -> Optional[AuthorSearchResult]:
+    """The author's profile: the cached row if fresh, else fetched from OpenAlex and cached.
+
+    Falls back to a stale cached row, or None, if the author cannot be fetched.
+    """
+    url = author_url(openalex_id)
+    profile = await db.get(AuthorProfile, url)
+    cached: Optional[AuthorSearchResult] = None
+    if profile is not None:
+        cached = AuthorSearchResult(
+            openalex_id=profile.openalex_id,
+            display_name=profile.display_name,
+            works_count=profile.works_count,
+            cited_by_count=profile.cited_by_count,
+            institution=profile.institution,
+        )
+        if profile.fetched_at >= staleness_cutoff():
+            return cached
+    try:
+        author = author_to_result(await openalex_client.get_author(url.rsplit("/", 1)[-1]))
+    except httpx.HTTPError:
+        # Offline or failing: a stale profile beats none
+        return cached
+    await cache_authors(db, [author])
+    return author
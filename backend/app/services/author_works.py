@@ -0,0 +1,105 @@
+"""Local mirror of tracked authors' bibliographies.
+
+A tracked author's complete works list is fetched once with cursor paging
+(see `sync_author_works`) and kept current by the tracked-author checks,
+which add the new works they find. Works pages for mirrored authors are then
+sorted, filtered and paged in SQL, without OpenAlex requests.
+"""
+
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.author import TrackedAuthor, TrackedAuthorPaper
+from app.models.paper import Paper
+from app.schemas.paper import PaperSummary
+from app.services.openalex import openalex_client
+from app.services.paper_cache import paper_to_summary
+
+MAX_SYNC_PAGES = 100  # 200 works each
+# Sort options of the local works list (name -> ORDER BY), ties broken by ID for stable paging
+AUTHOR_WORK_SORTS = {
+    "publication_date:desc": (Paper.publication_date.desc(), Paper.openalex_id),
+    "publication_date:asc": (Paper.publication_date.asc(), Paper.openalex_id),
+    "cited_by_count:desc": (Paper.cited_by_count.desc(), Paper.openalex_id),
+    "title": (Paper.title, Paper.openalex_id),
+}
+
+
+async def add_author_papers(db: AsyncSession, author_id: int, paper_ids: List[str]):
+    """Add works to an author's mirror (no commit)."""
+    if paper_ids:
+        await db.execute(
+            sqlite_insert(TrackedAuthorPaper).prefix_with("OR IGNORE"),
+            [{"author_id": author_id, "paper_openalex_id": pid} for pid in paper_ids],
+        )
+
+
+async def sync_author_works(db: AsyncSession, author: TrackedAuthor) -> int:
+    """Mirror the author's complete works list, replacing any previous mirror.
+
+    Returns the number of works mirrored. A failed request leaves the
+    previous mirror in place.
+    """
+    ids: List[str] = []
+    total = 0
+    cursor: Optional[str] = "*"
+    pages = 0
+    while cursor and pages < MAX_SYNC_PAGES:
+        resp, raw_works = await openalex_client.get_works_by_authors(
+            [author.openalex_id.rstrip("/").rsplit("/", 1)[-1]], cursor=cursor,
+        )
+        pages += 1
+        total = resp.meta.count
+        await openalex_client.cache_works(raw_works)
+        ids.extend(w["id"] for w in raw_works if w.get("id"))
+        cursor = resp.meta.next_cursor if raw_works else None
+
+    # Marked synced only once the works are in the paper cache
+    await openalex_client.writer.sync()
+    await db.execute(delete(TrackedAuthorPaper).where(TrackedAuthorPaper.author_id == author.id))
+    await add_author_papers(db, author.id, ids)
+    author.works_synced_at = datetime.now(timezone.utc)
+    author.works_count = max(total, len(ids))
+    await db.commit()
+    return len(ids)
+
+
+async def local_author_works(
+    db: AsyncSession,
+    author_id: int,
+    sort: str = "publication_date:desc",
+    page: int = 1,
+    per_page: int = 25,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    work_type: Optional[str] = None,
+    q: Optional[str] = None,
+) -> Tuple[List[PaperSummary], int]:
+    """One page of a mirrored author's works and the number matching the filters."""
+    await openalex_client.writer.sync()
+    conditions = [TrackedAuthorPaper.author_id == author_id]
+    if year_min:
+        conditions.append(Paper.publication_year >= year_min)
+    if year_max:
+        conditions.append(Paper.publication_year <= year_max)
+    if work_type:
+        conditions.append(Paper.type == work_type)
+    if q:
+        # Match % and _ in the query literally
+        pattern = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        conditions.append(Paper.title.ilike("%{}%".format(pattern), escape="\\"))
+
+    joined = select(Paper).join(
+        TrackedAuthorPaper, TrackedAuthorPaper.paper_openalex_id == Paper.openalex_id,
+    ).where(*conditions)
+    total = (await db.execute(
+        select(func.count()).select_from(joined.with_only_columns(Paper.openalex_id).subquery())
+    )).scalar_one()
+    result = await db.execute(
+        joined.order_by(*AUTHOR_WORK_SORTS[sort]).offset((page - 1) * per_page).limit(per_page)
+    )
+    return [paper_to_summary(p) for p in result.scalars()], total
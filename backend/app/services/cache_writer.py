@@ -0,0 +1,123 @@
+"""Write-behind queue for cache writes.
+
+Request handlers enqueue items and return immediately; a single background
+task drains the bounded queue, merges everything that arrived within a short
+window into one batch, and hands it to the write function in one
+transaction. Each HTTP request gets a write scope (see ``open_scope``), so a
+handler that reads back what it cached can call ``sync()`` to wait for just
+its own writes; ``sync()`` raises if any of them failed.
+"""
+
+import asyncio
+import logging
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_scope: ContextVar[Optional[List[asyncio.Future]]] = ContextVar("cache_write_scope", default=None)
+
+
+class CacheWriteError(RuntimeError):
+    """A write enqueued in the current scope was not committed."""
+
+
+class CacheWriter:
+    def __init__(
+        self,
+        write: Callable[[List[Dict]], Awaitable[None]],
+        key: str = "id",
+        max_queue: int = 256,
+        max_batch: int = 2000,
+        linger: float = 0.05,
+    ):
+        self._write = write
+        self._key = key
+        self._max_queue = max_queue
+        self._max_batch = max_batch
+        self._linger = linger
+        self._queue: Optional["asyncio.Queue[Tuple[List[Dict], asyncio.Future]]"] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything queued, then stop the background task."""
+        if not self.running:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def open_scope(self):
+        """Start tracking writes for the current request (or background job)."""
+        _scope.set([])
+
+    async def enqueue(self, items: List[Dict]):
+        """Queue items for writing. Waits only if the queue is full.
+
+        Without a running writer (scripts, tests) the items are written inline.
+        """
+        if not items:
+            return
+        if not self.running:
+            await self._write(items)
+            return
+        future = asyncio.get_running_loop().create_future()
+        scope = _scope.get()
+        if scope is not None:
+            scope.append(future)
+        await self._queue.put((items, future))
+
+    async def sync(self):
+        """Wait until the writes enqueued in the current scope are committed.
+
+        Raises CacheWriteError if any of them failed, so callers can rely on the rows existing.
+        """
+        scope = _scope.get()
+        if not scope:
+            return
+        futures = list(scope)
+        scope.clear()
+        results = await asyncio.gather(*futures)
+        failed = sum(1 for ok in results if not ok)
+        if failed:
+            raise CacheWriteError("{} of {} cache writes failed".format(failed, len(results)))
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Give concurrent requests a moment to add to the same transaction
+            await asyncio.sleep(self._linger)
+            size = len(batch[0][0])
+            while size < self._max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                size += len(batch[-1][0])
+
+            merged: Dict[str, Dict] = {}
+            for items, _ in batch:
+                for item in items:
+                    merged[item.get(self._key)] = item  # later copies win
+            try:
+                await self._write(list(merged.values()))
+                ok = True
+            except Exception:
+                # The batch is dropped; scopes waiting on it see the failure in sync()
+                logger.exception("Cache write of %d items failed", len(merged))
+                ok = False
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(ok)
+                self._queue.task_done()
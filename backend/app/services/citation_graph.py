@@ -1,13 +1,212 @@
 import asyncio
-from typing import Dict, List, Set, Tuple
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
 
+from app.config import settings
+from app.database import async_session
 from app.schemas.graph import GraphData, GraphEdge, GraphNode
+from app.schemas.paper import PaperSummary
+from app.services.graph_core import CitationNetwork, PaperRecord
 from app.services.openalex import openalex_client
+from app.services.paper_cache import cached_citers, cached_references, cached_summaries
+
+
+class _GraphMemo:
+    """Explored state for one (seeds, direction) pair, reused by later builds.
+
+    Neighbor lists and paper metadata are kept per node, so a rebuild with a
+    greater depth or node budget replays the explored levels from memory and
+    only issues requests for the part of the frontier that was never expanded.
+    """
+
+    def __init__(self):
+        self.neighbors: Dict[Tuple[str, str], List[str]] = {}  # (node_id, direction) -> target ids
+        self.papers: Dict[str, PaperRecord] = {}
+        self.unresolved: Set[str] = set()  # IDs OpenAlex returned no metadata for
+        # IDs this memo refetched itself; their pending cache refresh does not invalidate it
+        self.own_refreshes: Set[str] = set()
 
 
 class CitationGraphBuilder:
     """Builds citation network graphs via BFS traversal of the OpenAlex citation network."""
 
+    MEMO_SIZE = 16
+    SESSION_SIZE = 32
+    NEIGHBORS = 30  # references / citers followed per node
+    BATCH_SIZE = 50  # IDs per `openalex:` request
+
+    def __init__(self):
+        self._memo: "OrderedDict[Tuple[Tuple[str, ...], str], _GraphMemo]" = OrderedDict()
+        self._sessions: "OrderedDict[str, GraphData]" = OrderedDict()
+        openalex_client.add_refresh_listener(self.invalidate_papers)
+
+    def save_session(self, graph: GraphData) -> GraphData:
+        """Keep a built graph so later analysis/export requests can refer to it by ID."""
+        graph.session_id = uuid.uuid4().hex
+        self._sessions[graph.session_id] = graph
+        while len(self._sessions) > self.SESSION_SIZE:
+            self._sessions.popitem(last=False)
+        return graph
+
+    def get_session(self, session_id: str) -> Optional[GraphData]:
+        graph = self._sessions.get(session_id)
+        if graph is not None:
+            self._sessions.move_to_end(session_id)
+        return graph
+
+    def merge_into_session(self, session_id: str, expansion: GraphData) -> bool:
+        """Append the nodes and edges of an expansion to a stored session."""
+        graph = self.get_session(session_id)
+        if graph is None:
+            return False
+        known = {n.id for n in graph.nodes}
+        for node in expansion.nodes:
+            if node.id not in known:
+                known.add(node.id)
+                graph.nodes.append(node)
+        seen = {(e.source, e.target) for e in graph.edges}
+        for edge in expansion.edges:
+            if (edge.source, edge.target) not in seen:
+                seen.add((edge.source, edge.target))
+                graph.edges.append(edge)
+        return True
+
+    def invalidate_papers(self, openalex_ids: List[str]):
+        """Drop memoized builds that include any of the given (refreshed) papers, unless the
+        build refetched those papers itself and already holds the new metadata."""
+        refreshed = set(openalex_ids)
+        stale = []
+        for key, memo in self._memo.items():
+            if (refreshed & memo.papers.keys()) - memo.own_refreshes:
+                stale.append(key)
+            memo.own_refreshes -= refreshed
+        for key in stale:
+            del self._memo[key]
+
+    def _get_memo(self, seed_ids: List[str], direction: str) -> _GraphMemo:
+        key = (tuple(sorted(set(seed_ids))), direction)
+        memo = self._memo.get(key)
+        if memo is None:
+            memo = _GraphMemo()
+            self._memo[key] = memo
+            while len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+        else:
+            self._memo.move_to_end(key)
+        return memo
+
+    async def _resolve_papers(
+        self, memo: _GraphMemo, ids: List[str], limit: asyncio.Semaphore, failed: Set[str],
+    ):
+        """Metadata for IDs the memo has not seen yet: fresh cached rows, then batches of 50
+        at most `limit` requests at a time. IDs of failed batches are added to `failed`.
+
+        Stale rows are refetched; the memo already holds the new metadata, so the cache
+        refresh this causes does not invalidate it (see `invalidate_papers`).
+        """
+        missing = [i for i in ids if i not in memo.papers and i not in memo.unresolved]
+        if not missing:
+            return
+        async with async_session() as db:
+            for paper in (await cached_summaries(missing, db)).values():
+                memo.papers[paper.openalex_id] = PaperRecord.from_summary(paper)
+        missing = [i for i in missing if i not in memo.papers]
+        batches = [missing[i:i + self.BATCH_SIZE] for i in range(0, len(missing), self.BATCH_SIZE)]
+
+        async def fetch(batch: List[str]) -> List[Dict]:
+            async with limit:
+                _, raw_works = await openalex_client.batch_get_works(batch)
+            return raw_works
+
+        results = await asyncio.gather(*[fetch(b) for b in batches], return_exceptions=True)
+        fetched: List[Dict] = []
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                failed.update(batch)  # not marked unresolved, so a later build retries them
+                continue
+            fetched.extend(result)
+            for work in result:
+                memo.papers[work["id"]] = PaperRecord.from_work(work)
+                memo.own_refreshes.add(work["id"])
+            memo.unresolved.update(i for i in batch if i not in memo.papers)
+        if fetched:
+            await openalex_client.cache_works(fetched)
+
+    async def _load_local_neighbors(self, memo: _GraphMemo, ids: List[str], directions: List[str]):
+        """Neighbor lists known locally: fresh cached reference lists and stored top-citer
+        samples (filled by collection warm-ups). Only the rest is requested from OpenAlex."""
+        if not ids:
+            return
+        async with async_session() as db:
+            if "references" in directions:
+                for oa_id, refs in (await cached_references(db, ids)).items():
+                    memo.neighbors.setdefault((oa_id, "references"), refs[:self.NEIGHBORS])
+            if "citations" in directions:
+                for oa_id, citers in (await cached_citers(db, ids, self.NEIGHBORS)).items():
+                    memo.neighbors.setdefault((oa_id, "citations"), citers[:self.NEIGHBORS])
+
+    async def _fetch_neighbors(
+        self,
+        memo: _GraphMemo,
+        node_ids: List[str],
+        directions: List[str],
+        limit: asyncio.Semaphore,
+        failed: Set[str],
+    ):
+        """Request the neighbor lists the memo lacks, at most `limit` requests at a time.
+
+        Reference lists come with the papers' records, 50 per `openalex:` request;
+        citers need one request per node. Failed nodes are added to `failed` and
+        left out of the memo, so a later build retries them.
+        """
+        need_refs: List[str] = []
+        need_cites: List[str] = []
+        if "references" in directions:
+            need_refs = [n for n in node_ids if (n, "references") not in memo.neighbors]
+        if "citations" in directions:
+            need_cites = [n for n in node_ids if (n, "citations") not in memo.neighbors]
+
+        async def references(batch: List[str]) -> Dict[str, List[str]]:
+            async with limit:
+                _, raw_works = await openalex_client.batch_get_works(batch)
+            refs: Dict[str, List[str]] = {i: [] for i in batch}  # papers OpenAlex does not return have none
+            for work in raw_works:
+                refs[work["id"]] = (work.get("referenced_works") or [])[:self.NEIGHBORS]
+            return refs
+
+        async def citations(node_id: str) -> Dict[str, List[str]]:
+            async with limit:
+                resp, _ = await openalex_client.get_work_citations(node_id, per_page=self.NEIGHBORS)
+            return {node_id: [p.openalex_id for p in resp.results]}
+
+        jobs = [
+            ("references", batch)
+            for batch in (need_refs[i:i + self.BATCH_SIZE] for i in range(0, len(need_refs), self.BATCH_SIZE))
+        ] + [("citations", [n]) for n in need_cites]
+        results = await asyncio.gather(
+            *[references(ids) if d == "references" else citations(ids[0]) for d, ids in jobs],
+            return_exceptions=True,
+        )
+        for (d, ids), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                failed.update(ids)
+                continue
+            for node_id, targets in result.items():
+                memo.neighbors[(node_id, d)] = targets
+
+    @staticmethod
+    def _to_node(paper: PaperSummary, is_seed: bool, depth: int) -> GraphNode:
+        return GraphNode(
+            id=paper.openalex_id,
+            title=paper.title,
+            publication_year=paper.publication_year or 0,
+            cited_by_count=paper.cited_by_count,
+            authors=[a.author_name for a in paper.authors[:3]],
+            is_seed=is_seed,
+            depth=depth,
+        )
+
     async def build_graph(
         self,
         seed_ids: List[str],
@@ -15,97 +214,77 @@ class CitationGraphBuilder:
         max_nodes: int = 500,
         direction: str = "both",
     ) -> GraphData:
-        nodes: Dict[str, GraphNode] = {}
-        edges: List[GraphEdge] = []
-        seen_edges: Set[Tuple[str, str]] = set()
-
-        # Fetch seed papers
-        seed_parsed, seed_raw = await openalex_client.batch_get_works(seed_ids)
-        for paper in seed_parsed:
-            nodes[paper.openalex_id] = GraphNode(
-                id=paper.openalex_id,
-                title=paper.title,
-                publication_year=paper.publication_year or 0,
-                cited_by_count=paper.cited_by_count,
-                authors=[a.author_name for a in paper.authors[:3]],
-                is_seed=True,
-                depth=0,
-            )
-
-        # BFS traversal
-        frontier = list(nodes.keys())
+        memo = self._get_memo(seed_ids, direction)
+        directions = [d for d in ("references", "citations") if direction in (d, "both")]
+        net = CitationNetwork()
+
+        # OpenAlex requests in flight for this build; nodes whose requests fail are reported
+        limit = asyncio.Semaphore(settings.discovery_concurrency)
+        failed: Set[str] = set()
+
+        # Fetch seed papers; sorted so that equivalent seed lists replay identically
+        seeds = sorted(set(seed_ids))
+        await self._resolve_papers(memo, seeds, limit, failed)
+        for sid in seeds:
+            if sid in memo.papers:
+                net.add_node(sid, memo.papers[sid], depth=0, is_seed=True)
+
+        # BFS traversal, replaying memoized levels and fetching only unexplored nodes
+        frontier = list(range(len(net)))
         for current_depth in range(1, depth + 1):
-            if len(nodes) >= max_nodes:
+            if len(net) >= max_nodes:
                 break
 
-            next_frontier: List[str] = []
-            tasks = []
+            await self._load_local_neighbors(memo, [
+                net.ids[idx] for idx in frontier
+                if any((net.ids[idx], d) not in memo.neighbors for d in directions)
+            ], directions)
+            await self._fetch_neighbors(memo, [net.ids[idx] for idx in frontier], directions, limit, failed)
 
-            for node_id in frontier:
-                if direction in ("references", "both"):
-                    tasks.append(self._get_references(node_id))
-                if direction in ("citations", "both"):
-                    tasks.append(self._get_citations(node_id))
+            # Edges to nodes already in the graph are added right away; edges to new
+            # nodes wait until the node's metadata has been resolved
+            next_frontier: Dict[str, None] = {}  # ordered set
+            pending: List[Tuple[int, str, bool]] = []  # (node index, new node id, node cites it)
+            for idx in frontier:
+                node_id = net.ids[idx]
+                for edge_direction in directions:
+                    target_ids = memo.neighbors.get((node_id, edge_direction))
+                    if target_ids is None:
+                        continue
+                    cites = edge_direction == "references"
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+                    for target_id in target_ids:
+                        target = net.index.get(target_id)
+                        if target is not None:
+                            if cites:
+                                net.add_edge(idx, target)
+                            else:
+                                net.add_edge(target, idx)
+                            continue
+                        if len(net) + len(next_frontier) >= max_nodes and target_id not in next_frontier:
+                            break
+                        next_frontier[target_id] = None
+                        pending.append((idx, target_id, cites))
 
-            for result in results:
-                if isinstance(result, Exception):
+            # Enrich new nodes with actual metadata; unresolved ones are dropped with their edges
+            await self._resolve_papers(memo, list(next_frontier), limit, failed)
+            frontier = [
+                net.add_node(nid, memo.papers[nid], depth=current_depth)
+                for nid in next_frontier
+                if nid in memo.papers
+            ]
+            for idx, target_id, cites in pending:
+                target = net.index.get(target_id)
+                if target is None:
                     continue
+                if cites:
+                    net.add_edge(idx, target)
+                else:
+                    net.add_edge(target, idx)
 
-                source_id, target_ids, edge_direction = result
-
-                for target_id in target_ids:
-                    if len(nodes) >= max_nodes:
-                        break
-
-                    # Add edge
-                    if edge_direction == "references":
-                        edge_key = (source_id, target_id)
-                    else:
-                        edge_key = (target_id, source_id)
-
-                    if edge_key not in seen_edges:
-                        seen_edges.add(edge_key)
-                        edges.append(GraphEdge(source=edge_key[0], target=edge_key[1]))
-
-                    # Track new nodes to fetch
-                    if target_id not in nodes:
-                        next_frontier.append(target_id)
-                        # Placeholder node — will be enriched below
-                        nodes[target_id] = GraphNode(
-                            id=target_id,
-                            title="Loading...",
-                            depth=current_depth,
-                        )
-
-            # Enrich new nodes with actual metadata
-            new_ids = [nid for nid in next_frontier if nodes[nid].title == "Loading..."]
-            if new_ids:
-                # Deduplicate
-                unique_ids = list(set(new_ids))[:max_nodes - len([n for n in nodes.values() if n.title != "Loading..."])]
-                if unique_ids:
-                    enriched, _ = await openalex_client.batch_get_works(unique_ids)
-                    for paper in enriched:
-                        if paper.openalex_id in nodes:
-                            nodes[paper.openalex_id] = GraphNode(
-                                id=paper.openalex_id,
-                                title=paper.title,
-                                publication_year=paper.publication_year or 0,
-                                cited_by_count=paper.cited_by_count,
-                                authors=[a.author_name for a in paper.authors[:3]],
-                                is_seed=False,
-                                depth=current_depth,
-                            )
-
-            frontier = list(set(next_frontier))
-
-        # Remove placeholder nodes that weren't enriched
-        final_nodes = [n for n in nodes.values() if n.title != "Loading..."]
-        final_node_ids = {n.id for n in final_nodes}
-        final_edges = [e for e in edges if e.source in final_node_ids and e.target in final_node_ids]
-
-        return GraphData(nodes=final_nodes, edges=final_edges)
+        graph = net.to_graph_data()
+        graph.failed_nodes = sorted(failed)
+        return graph
 
     async def expand_node(
         self,
@@ -128,8 +307,10 @@ class CitationGraphBuilder:
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         new_ids: List[str] = []
+        failed = False
         for result in results:
             if isinstance(result, Exception):
+                failed = True
                 continue
             source_id, target_ids, edge_dir = result
             for tid in target_ids:
@@ -148,38 +329,26 @@ class CitationGraphBuilder:
         if new_ids:
             enriched, _ = await openalex_client.batch_get_works(new_ids[:max_new])
             for paper in enriched:
-                new_nodes[paper.openalex_id] = GraphNode(
-                    id=paper.openalex_id,
-                    title=paper.title,
-                    publication_year=paper.publication_year or 0,
-                    cited_by_count=paper.cited_by_count,
-                    authors=[a.author_name for a in paper.authors[:3]],
-                    is_seed=False,
-                    depth=1,
-                )
+                new_nodes[paper.openalex_id] = self._to_node(paper, is_seed=False, depth=1)
 
         # Filter edges to only include known nodes
         all_known = existing_set | set(new_nodes.keys())
         final_edges = [e for e in new_edges if e.source in all_known and e.target in all_known]
 
-        return GraphData(nodes=list(new_nodes.values()), edges=final_edges)
+        return GraphData(
+            nodes=list(new_nodes.values()), edges=final_edges, failed_nodes=[node_id] if failed else [],
+        )
 
     async def _get_references(self, openalex_id: str) -> Tuple[str, List[str], str]:
-        """Get referenced work IDs for a paper."""
-        try:
-            detail, _ = await openalex_client.get_work(openalex_id)
-            return (openalex_id, detail.referenced_work_ids[:30], "references")
-        except Exception:
-            return (openalex_id, [], "references")
+        """Get referenced work IDs for a paper. Errors propagate so they are not memoized."""
+        detail, _ = await openalex_client.get_work(openalex_id)
+        return (openalex_id, detail.referenced_work_ids[:self.NEIGHBORS], "references")
 
     async def _get_citations(self, openalex_id: str) -> Tuple[str, List[str], str]:
-        """Get citing work IDs for a paper."""
-        try:
-            resp, _ = await openalex_client.get_work_citations(openalex_id, per_page=30)
-            ids = [p.openalex_id for p in resp.results]
-            return (openalex_id, ids, "citations")
-        except Exception:
-            return (openalex_id, [], "citations")
+        """Get citing work IDs for a paper. Errors propagate so they are not memoized."""
+        resp, _ = await openalex_client.get_work_citations(openalex_id, per_page=self.NEIGHBORS)
+        ids = [p.openalex_id for p in resp.results]
+        return (openalex_id, ids, "citations")
 
 
 graph_builder = CitationGraphBuilder()
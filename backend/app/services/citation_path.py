@@ -0,0 +1,314 @@
+"""Citation paths between two papers by bidirectional breadth-first search.
+
+The forward search follows references out of the citing-side paper and the
+backward search follows citations into the cited-side paper until the two
+meet in the middle. Each round expands whichever side needs fewer OpenAlex
+requests, and reference lists and citing papers are read from the local
+cache before anything is requested, so a path of length L costs about two
+searches of depth L/2 instead of one of depth L.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.paper import Paper
+from app.schemas.graph import CitationPathResult
+from app.services.graph_core import CitationNetwork, PaperRecord
+from app.services.openalex import openalex_client
+from app.services.paper_cache import local_citing_rows, normalize_id
+
+BATCH_SIZE = 50  # IDs per OR filter
+CITERS_PER_REQUEST = 200  # OpenAlex maximum page size
+_SQL_CHUNK = 500  # stay below SQLite's bound-parameter limit
+
+
+class _Side:
+    """BFS state for one direction: distances and shortest-path links back to the root."""
+
+    def __init__(self, root: str):
+        self.dist: Dict[str, int] = {root: 0}
+        self.links: Dict[str, List[str]] = {root: []}  # node -> neighbours one hop closer to the root
+        self.frontier: List[str] = [root]
+        self.level = 0
+
+    def visit(self, node: str, via: str) -> bool:
+        """Record a link found while expanding the current level; True if `node` is new."""
+        d = self.dist.get(node)
+        if d is None:
+            self.dist[node] = self.level + 1
+            self.links[node] = [via]
+            return True
+        if d == self.level + 1 and via not in self.links[node]:
+            self.links[node].append(via)
+        return False
+
+    def chains(self, node: str, limit: int) -> List[List[str]]:
+        """Up to `limit` shortest chains from `node` back to the root (node first)."""
+        if not self.links[node]:
+            return [[node]]
+        out: List[List[str]] = []
+        for nxt in self.links[node]:
+            for rest in self.chains(nxt, limit - len(out)):
+                out.append([node] + rest)
+                if len(out) >= limit:
+                    return out
+        return out
+
+
+class _PathSearch:
+    def __init__(self, db: AsyncSession, max_requests: int):
+        self.db = db
+        self.max_requests = max_requests
+        self.requests = 0
+        self.failed_requests = 0
+        self.exhausted = False
+        self.records: Dict[str, PaperRecord] = {}
+        self.refs: Dict[str, List[str]] = {}
+        self.fetched: Dict[str, Dict] = {}  # raw works from reference lookups, cached afterwards
+
+    def _remember(self, work: Dict):
+        oa_id = work.get("id")
+        if not oa_id:
+            return
+        self.records[oa_id] = PaperRecord.from_work(work)
+        self.refs[oa_id] = work.get("referenced_works") or []
+
+    def _budget(self, wanted: int) -> int:
+        allowed = max(0, min(wanted, self.max_requests - self.requests))
+        if allowed < wanted:
+            self.exhausted = True
+        self.requests += allowed
+        return allowed
+
+    async def load_works(self, ids: List[str]):
+        """Make metadata and reference lists available, from the cache first, then OpenAlex."""
+        missing = [i for i in ids if i not in self.refs]
+        await openalex_client.writer.sync()
+        for i in range(0, len(missing), _SQL_CHUNK):
+            rows = await self.db.execute(
+                select(
+                    Paper.openalex_id, Paper.title, Paper.publication_year, Paper.cited_by_count,
+                    Paper.authorships_json, Paper.referenced_work_ids,
+                ).where(Paper.openalex_id.in_(missing[i:i + _SQL_CHUNK]))
+            )
+            for row in rows:
+                if row.referenced_work_ids is not None:
+                    self._remember(self._row_to_work(row))
+
+        missing = [i for i in missing if i not in self.refs]
+        batches = self._budget((len(missing) + BATCH_SIZE - 1) // BATCH_SIZE)
+        if batches:
+            try:
+                _, raw = await openalex_client.batch_get_works(missing[:batches * BATCH_SIZE])
+            except httpx.HTTPError:
+                self.failed_requests += batches
+                return
+            for work in raw:
+                self._remember(work)
+                self.fetched[work["id"]] = work
+
+    async def citing_works(self, ids: List[str]) -> List[Dict]:
+        """Works citing any of `ids`: every cached citer, plus the most cited ones from OpenAlex."""
+        works: Dict[str, Dict] = {}
+        for row in await local_citing_rows(self.db, ids):
+            works[row.openalex_id] = self._row_to_work(row)
+
+        groups = self._citer_groups(ids)
+        groups = groups[:self._budget(len(groups))]
+        results = await asyncio.gather(
+            *[openalex_client.get_works_citing(g, per_page=CITERS_PER_REQUEST) for g in groups],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, httpx.HTTPError):
+                self.failed_requests += 1
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            for work in result[1]:
+                works.setdefault(work["id"], work)
+        return list(works.values())
+
+    def _citer_groups(self, ids: List[str]) -> List[List[str]]:
+        """Pack IDs into OR filters whose combined citation counts fit one page where possible."""
+        groups: List[List[str]] = []
+        current: List[str] = []
+        total = 0
+        for oa_id in sorted(ids, key=lambda i: self.records[i].cited_by_count if i in self.records else 0):
+            count = self.records[oa_id].cited_by_count if oa_id in self.records else CITERS_PER_REQUEST
+            if current and (total + count > CITERS_PER_REQUEST or len(current) >= BATCH_SIZE):
+                groups.append(current)
+                current, total = [], 0
+            current.append(oa_id)
+            total += count
+        if current:
+            groups.append(current)
+        return groups
+
+    def forward_cost(self, side: _Side) -> int:
+        unknown = sum(1 for n in side.frontier if n not in self.refs)
+        return (unknown + BATCH_SIZE - 1) // BATCH_SIZE
+
+    def backward_cost(self, side: _Side) -> int:
+        return len(self._citer_groups(side.frontier))
+
+    @staticmethod
+    def _row_to_work(row) -> Dict:
+        return {
+            "id": row.openalex_id,
+            "title": row.title,
+            "publication_year": row.publication_year,
+            "cited_by_count": row.cited_by_count,
+            "authorships": row.authorships_json,
+            "referenced_works": row.referenced_work_ids,
+        }
+
+
+class CitationPathFinder:
+    """Finds short citation chains A -> ... -> B, where each arrow means "cites"."""
+
+    async def find_paths(
+        self,
+        db: AsyncSession,
+        source_id: str,
+        target_id: str,
+        k: int = 3,
+        max_hops: int = 4,
+        max_requests: int = 40,
+    ) -> Optional[CitationPathResult]:
+        """Return up to k shortest paths as a subgraph, or None if an endpoint does not exist.
+
+        The newer of the two papers is used as the citing end; papers from the
+        same year are searched in both directions. The search stops once k
+        paths are known or the hop or request budget runs out.
+        """
+        search = _PathSearch(db, max_requests)
+        source, target = normalize_id(source_id), normalize_id(target_id)
+        await search.load_works([source, target])
+        if source not in search.records or target not in search.records:
+            return None
+        if source == target:
+            return await self._to_result(search, [[source]])
+        source_year = search.records[source].publication_year
+        target_year = search.records[target].publication_year
+        if source_year < target_year:
+            source, target = target, source
+        paths = await self._search(search, source, target, k, max_hops)
+        if source_year == target_year:
+            paths += await self._search(search, target, source, k, max_hops)
+            paths = sorted(paths, key=lambda p: (len(p), p))[:k]
+        return await self._to_result(search, paths)
+
+    async def _search(
+        self, search: _PathSearch, source: str, target: str, k: int, max_hops: int,
+    ) -> List[List[str]]:
+        """Up to k shortest paths on which `source` (directly or indirectly) cites `target`."""
+        # Citations point back in time, so papers outside these years cannot lie on a path
+        # (one year of slack for preprints and inconsistent publication dates)
+        oldest = search.records[target].publication_year - 1
+        newest = search.records[source].publication_year + 1
+
+        forward, backward = _Side(source), _Side(target)
+        paths = self._collect_paths(forward, backward, k)
+        while len(paths) < k and forward.level + backward.level < max_hops:
+            if not forward.frontier and not backward.frontier:
+                break
+            expand_forward = bool(forward.frontier) and (
+                not backward.frontier
+                or (search.forward_cost(forward), len(forward.frontier))
+                <= (search.backward_cost(backward), len(backward.frontier))
+            )
+            if expand_forward:
+                await self._expand_forward(search, forward, oldest)
+            else:
+                await self._expand_backward(search, backward, newest)
+            paths = self._collect_paths(forward, backward, k)
+        return paths
+
+    async def _expand_forward(self, search: _PathSearch, side: _Side, oldest: int):
+        await search.load_works(side.frontier)
+        next_frontier: List[str] = []
+        for node in side.frontier:
+            record = search.records.get(node)
+            if record is None or (record.publication_year and record.publication_year < oldest):
+                continue
+            for ref in search.refs.get(node, []):
+                if side.visit(ref, node):
+                    next_frontier.append(ref)
+        side.frontier = next_frontier
+        side.level += 1
+
+    async def _expand_backward(self, search: _PathSearch, side: _Side, newest: int):
+        frontier = set(side.frontier)
+        next_frontier: List[str] = []
+        for work in await search.citing_works(side.frontier):
+            year = work.get("publication_year") or 0
+            if year > newest:
+                continue
+            oa_id = work["id"]
+            if oa_id not in search.records:
+                search.records[oa_id] = PaperRecord.from_work(work)
+                search.refs[oa_id] = work.get("referenced_works") or []
+            for cited in search.refs[oa_id]:
+                if cited in frontier and side.visit(oa_id, cited):
+                    next_frontier.append(oa_id)
+        side.frontier = next_frontier
+        side.level += 1
+
+    @staticmethod
+    def _collect_paths(forward: _Side, backward: _Side, k: int) -> List[List[str]]:
+        small, large = sorted((forward.dist, backward.dist), key=len)
+        meeting = sorted(
+            (n for n in small if n in large),
+            key=lambda n: (forward.dist[n] + backward.dist[n], n),
+        )
+        found: Set[Tuple[str, ...]] = set()
+        last = 0
+        for node in meeting:
+            # Meeting nodes come in order of path length; stop once k paths of the lengths seen so far exist
+            total = forward.dist[node] + backward.dist[node]
+            if len(found) >= k and total > last:
+                break
+            last = total
+            for head in forward.chains(node, k):
+                for tail in backward.chains(node, k):
+                    path = tuple(head[::-1] + tail[1:])
+                    if len(set(path)) == len(path):
+                        found.add(path)
+        return [list(p) for p in sorted(found, key=lambda p: (len(p), p))[:k]]
+
+    async def _to_result(self, search: _PathSearch, paths: List[List[str]]) -> CitationPathResult:
+        net = CitationNetwork()
+        on_paths = list(dict.fromkeys(n for path in paths for n in path))
+        missing = [n for n in on_paths if n not in search.records]
+        if missing:
+            await search.load_works(missing)
+        for path in paths:
+            for hop, node in enumerate(path):
+                if node in search.records:
+                    net.add_node(node, search.records[node], depth=hop, is_seed=hop in (0, len(path) - 1))
+        for path in paths:
+            for citing, cited in zip(path, path[1:]):
+                if citing in net and cited in net:
+                    net.add_edge(net.index[citing], net.index[cited])
+
+        # Cache what was fetched for reference lookups so later searches start locally
+        if search.fetched:
+            await openalex_client.cache_works(list(search.fetched.values()))
+
+        graph = net.to_graph_data()
+        return CitationPathResult(
+            nodes=graph.nodes,
+            edges=graph.edges,
+            paths=paths,
+            requests_used=search.requests,
+            failed_requests=search.failed_requests,
+            exhausted=search.exhausted,
+        )
+
+
+path_finder = CitationPathFinder()
@@ -0,0 +1,221 @@
+"""Sampling the papers that cite a seed, with request and memory budgets.
+
+- "top": one page of the most cited citers (fast, biased toward old, famous papers)
+- "cursor": cursor-paged scan of the citing set until the sample size or a budget is hit
+- "random": OpenAlex `sample` with a fixed seed, so reruns draw the same papers
+- "stratified": per-publication-year random samples, allocated in proportion to
+  each year's share of the citing set
+
+Every sample reports how much of the citing set it covers.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from app.schemas.discovery import SeedCoverage
+from app.services.openalex import openalex_client
+
+SAMPLING_STRATEGIES = ("top", "cursor", "random", "stratified")
+PAGE_SIZE = 200  # OpenAlex per_page limit
+MAX_RANDOM_SAMPLE = 10_000  # OpenAlex limit for `sample`
+MAX_REQUESTS_PER_SEED = 100
+MAX_WORKS_PER_SEED = 50_000
+
+
+class CitingSample:
+    """Sampled citers of one seed: `works` maps citer ID to its reference list.
+
+    `raw` holds the full work records when the strategy fetched them (for the paper cache).
+    """
+
+    __slots__ = ("works", "raw", "coverage")
+
+    def __init__(self, works: Dict[str, List[str]], raw: List[Dict], coverage: SeedCoverage):
+        self.works = works
+        self.raw = raw
+        self.coverage = coverage
+
+
+def _year_bins(years: List[Tuple[int, int]], max_bins: int) -> List[Tuple[int, int, int]]:
+    """Merge consecutive (year, count) pairs into at most `max_bins` (first, last, count) bins of similar size."""
+    if max_bins < 1:
+        return []
+    if len(years) <= max_bins:
+        return [(year, year, count) for year, count in years]
+    remaining = sum(count for _, count in years)
+    bins: List[Tuple[int, int, int]] = []
+    first, acc = years[0][0], 0
+    for i, (year, count) in enumerate(years):
+        acc += count
+        bins_left = max_bins - len(bins)
+        # Close the bin at its share of what is left; the last bin takes the rest
+        if i + 1 < len(years) and bins_left > 1 and acc >= remaining / bins_left:
+            bins.append((first, year, acc))
+            remaining -= acc
+            first, acc = years[i + 1][0], 0
+    bins.append((first, years[-1][0], acc))
+    return bins
+
+
+class _Sampler:
+    def __init__(self, seed_id: str, sample_size: int, max_requests: int, max_works: int, random_seed: int):
+        self.seed_id = seed_id
+        self.max_requests = max(1, min(max_requests, MAX_REQUESTS_PER_SEED))
+        self.max_works = max(1, min(max_works, MAX_WORKS_PER_SEED))
+        self.target = min(max(sample_size, 1), self.max_works)
+        self.memory_capped = sample_size > self.max_works
+        self.random_seed = random_seed
+        self.filter = "cites:{}".format(seed_id)
+        self.works: Dict[str, List[str]] = {}
+        self.raw: List[Dict] = []
+        self.requests = 0
+        self.total: Optional[int] = None
+        self.strata = 0
+        self.truncated: Optional[str] = None
+
+    async def _get(self, select: Optional[str] = "id,referenced_works", **params) -> Dict:
+        self.requests += 1
+        if select:
+            params["select"] = select
+        resp = await openalex_client.client.get("/works", params=params)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _can_request(self) -> bool:
+        if self.requests >= self.max_requests:
+            self.truncated = "requests"
+            return False
+        return True
+
+    def _full(self) -> bool:
+        if len(self.works) >= self.target:
+            if self.memory_capped and (self.total is None or self.total > len(self.works)):
+                self.truncated = "memory"
+            return True
+        return False
+
+    def _add(self, results: List[Dict]):
+        for work in results:
+            if len(self.works) >= self.target:
+                return
+            wid = work.get("id")
+            if wid:
+                self.works[wid] = work.get("referenced_works") or []
+
+    async def top(self):
+        data = await self._get(
+            filter=self.filter, sort="cited_by_count:desc",
+            per_page=min(self.target, PAGE_SIZE), select=",".join(openalex_client.DEFAULT_SELECT),
+        )
+        self.total = data.get("meta", {}).get("count")
+        self.raw = data.get("results", [])
+        self._add(self.raw)
+        if self.target > PAGE_SIZE and (self.total or 0) > PAGE_SIZE:
+            self.truncated = "sample limit"
+
+    async def cursor(self):
+        cursor: Optional[str] = "*"
+        while cursor and not self._full() and self._can_request():
+            data = await self._get(
+                filter=self.filter, cursor=cursor,
+                per_page=min(self.target - len(self.works), PAGE_SIZE),
+            )
+            meta = data.get("meta", {})
+            self.total = meta.get("count", self.total)
+            self._add(data.get("results", []))
+            cursor = meta.get("next_cursor") if data.get("results") else None
+
+    async def _count(self) -> int:
+        data = await self._get(filter=self.filter, per_page=1, select="id")
+        return data.get("meta", {}).get("count", 0)
+
+    async def random(self):
+        self.total = await self._count()
+        if self.total <= self.target:
+            # The whole citing set fits: no need to sample
+            await self.cursor()
+            return
+        n = min(self.target, MAX_RANDOM_SAMPLE)
+        page = 1
+        while len(self.works) < n and self._can_request():
+            data = await self._get(
+                filter=self.filter, sample=n, seed=self.random_seed, per_page=PAGE_SIZE, page=page,
+            )
+            results = data.get("results", [])
+            self._add(results)
+            if len(results) < PAGE_SIZE:
+                break
+            page += 1
+        if n < self.target:
+            self.truncated = self.truncated or "sample limit"
+        self._full()
+
+    async def stratified(self):
+        data = await self._get(filter=self.filter, group_by="publication_year", select=None)
+        years = sorted(
+            (int(g["key"]), g["count"]) for g in data.get("group_by", [])
+            if str(g.get("key", "")).isdigit() and g.get("count")
+        )
+        self.total = sum(count for _, count in years)
+        if not self.total:
+            return
+        if self.total <= self.target:
+            await self.cursor()
+            return
+        bins = _year_bins(years, self.max_requests - self.requests)
+        self.strata = len(bins)
+        for first, last, count in bins:
+            if not self._can_request():
+                break
+            share = max(1, round(self.target * count / self.total))
+            if share > PAGE_SIZE:
+                self.truncated = self.truncated or "sample limit"
+            n = min(count, PAGE_SIZE, share)
+            params = {
+                "filter": "{},from_publication_date:{}-01-01,to_publication_date:{}-12-31".format(
+                    self.filter, first, last
+                ),
+                "per_page": n,
+            }
+            if n < count:
+                params.update(sample=n, seed=self.random_seed)
+            results = (await self._get(**params)).get("results", [])
+            for work in results:
+                wid = work.get("id")
+                if wid and len(self.works) < self.max_works:
+                    self.works[wid] = work.get("referenced_works") or []
+
+    def coverage(self, strategy: str) -> SeedCoverage:
+        return SeedCoverage(
+            seed_id=self.seed_id,
+            sampling=strategy,
+            citing_total=self.total,
+            sampled=len(self.works),
+            coverage=round(len(self.works) / self.total, 4) if self.total else None,
+            requests=self.requests,
+            strata=self.strata,
+            truncated=self.truncated,
+        )
+
+
+async def sample_citing_works(
+    seed_id: str,
+    strategy: str = "top",
+    sample_size: int = 100,
+    max_requests: int = 10,
+    max_works: int = 5000,
+    random_seed: int = 42,
+) -> CitingSample:
+    """Sample papers citing `seed_id` with one of SAMPLING_STRATEGIES.
+
+    Stops at `sample_size` papers, `max_requests` OpenAlex requests or
+    `max_works` papers held, whichever comes first. A failed request keeps
+    what was sampled so far and marks the coverage truncated by "error".
+    """
+    if strategy not in SAMPLING_STRATEGIES:
+        raise ValueError("Unknown sampling strategy: {}".format(strategy))
+    sampler = _Sampler(seed_id, sample_size, max_requests, max_works, random_seed)
+    try:
+        await getattr(sampler, strategy)()
+    except Exception:
+        sampler.truncated = "error"
+    return CitingSample(sampler.works, sampler.raw, sampler.coverage(strategy))
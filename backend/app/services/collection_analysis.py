@@ -0,0 +1,204 @@
+"""Collection analyses computed from the local paper cache."""
+
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from sqlalchemy import String, bindparam, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.collection import CollectionPaper
+from app.models.paper import Paper
+from app.schemas.collection import (
+    CitationQuantile,
+    CollectionGap,
+    CollectionGaps,
+    CollectionStatCount,
+    CollectionStats,
+)
+from app.services.openalex import openalex_client
+from app.services.paper_cache import get_paper_summaries
+
+# References cited by members but not themselves members, by number of citing members
+_GAPS = text(
+    "SELECT j.value AS openalex_id, COUNT(DISTINCT cp.paper_openalex_id) AS cited_by "
+    "FROM collection_papers cp "
+    "JOIN papers p ON p.openalex_id = cp.paper_openalex_id "
+    "JOIN json_each(p.referenced_work_ids) j "
+    "WHERE cp.collection_id = :collection_id "
+    "AND j.value NOT IN (SELECT paper_openalex_id FROM collection_papers WHERE collection_id = :collection_id) "
+    "GROUP BY j.value HAVING cited_by >= :min_count "
+    "ORDER BY cited_by DESC, j.value LIMIT :limit"
+).bindparams(bindparam("collection_id"), bindparam("min_count"), bindparam("limit")).columns(openalex_id=String)
+
+CITATION_QUANTILES = (0.0, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0)
+
+# All collection statistics in one statement over the members' cached rows, as
+# (kind, key, label, n, value) rows; the members CTE is read once and reused
+_STATS = text(
+    "WITH m AS ("
+    " SELECT p.openalex_id, p.publication_year AS year, COALESCE(p.cited_by_count, 0) AS cites,"
+    " json_extract(p.open_access_json, '$.is_oa') AS is_oa, p.authorships_json, p.topics_json,"
+    " json_extract(p.primary_location_json, '$.source.id') AS source_id,"
+    " json_extract(p.primary_location_json, '$.source.display_name') AS source_name"
+    " FROM collection_papers cp JOIN papers p ON p.openalex_id = cp.paper_openalex_id"
+    " WHERE cp.collection_id = :collection_id),"
+    " ranked AS (SELECT cites, ROW_NUMBER() OVER (ORDER BY cites) - 1 AS r, COUNT(*) OVER () AS total FROM m),"
+    " q(p) AS (VALUES {quantiles}) "
+    "SELECT 'summary' AS kind, NULL AS key, NULL AS label, COUNT(*) AS n, AVG(cites) AS value,"
+    " SUM(is_oa = 1) AS extra FROM m "
+    "UNION ALL SELECT 'year', year, NULL, COUNT(*), NULL, NULL FROM m WHERE year IS NOT NULL GROUP BY year "
+    "UNION ALL SELECT 'quantile', q.p, NULL, NULL, ranked.cites, NULL"
+    " FROM q JOIN ranked ON ranked.r = CAST(q.p * (ranked.total - 1) AS INTEGER) "
+    "UNION ALL SELECT * FROM ("
+    " SELECT 'author', json_extract(a.value, '$.author.id') AS aid, MAX(json_extract(a.value, '$.author.display_name')),"
+    " COUNT(DISTINCT m.openalex_id) AS n, NULL, NULL FROM m JOIN json_each(m.authorships_json) a"
+    " WHERE aid IS NOT NULL GROUP BY aid ORDER BY n DESC, aid LIMIT :top) "
+    "UNION ALL SELECT * FROM ("
+    " SELECT 'venue', source_id, MAX(source_name), COUNT(*) AS n, NULL, NULL FROM m"
+    " WHERE source_id IS NOT NULL GROUP BY source_id ORDER BY n DESC, source_id LIMIT :top) "
+    "UNION ALL SELECT * FROM ("
+    " SELECT 'topic', json_extract(t.value, '$.id') AS tid, MAX(json_extract(t.value, '$.display_name')),"
+    " COUNT(DISTINCT m.openalex_id) AS n, NULL, NULL FROM m JOIN json_each(m.topics_json) t"
+    " WHERE tid IS NOT NULL GROUP BY tid ORDER BY n DESC, tid LIMIT :top)".format(
+        quantiles=", ".join("({})".format(q) for q in CITATION_QUANTILES),
+    )
+).bindparams(bindparam("collection_id"), bindparam("top"))
+
+
+class CollectionStatsCache:
+    """Computed statistics per (collection, top), reused while the collection is unchanged.
+
+    An entry is valid for a signature of the membership (count, sum and max of
+    member row IDs) and of the members' cached papers (count, latest fetch),
+    so adding, removing or re-fetching a paper invalidates it. Checking the
+    signature is one indexed query, much cheaper than recomputing.
+    """
+
+    SIZE = 64
+
+    def __init__(self):
+        self._entries: "OrderedDict[Tuple[int, int], Tuple[tuple, CollectionStats]]" = OrderedDict()
+
+    async def _signature(self, db: AsyncSession, collection_id: int) -> tuple:
+        result = await db.execute(
+            select(
+                func.count(CollectionPaper.id), func.total(CollectionPaper.id), func.max(CollectionPaper.id),
+                func.count(Paper.openalex_id), func.max(Paper.fetched_at),
+            )
+            .outerjoin(Paper, Paper.openalex_id == CollectionPaper.paper_openalex_id)
+            .where(CollectionPaper.collection_id == collection_id)
+        )
+        return tuple(result.one())
+
+    def invalidate(self, collection_id: int):
+        for key in [k for k in self._entries if k[0] == collection_id]:
+            del self._entries[key]
+
+    async def get(self, db: AsyncSession, collection_id: int, top: int = 10) -> CollectionStats:
+        await openalex_client.writer.sync()
+        signature = await self._signature(db, collection_id)
+        key = (collection_id, top)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            self._entries.move_to_end(key)
+            return entry[1].model_copy(update={"cached": True})
+
+        stats = await compute_stats(db, collection_id, top, member_count=signature[0])
+        self._entries[key] = (signature, stats)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.SIZE:
+            self._entries.popitem(last=False)
+        return stats
+
+
+async def compute_stats(
+    db: AsyncSession, collection_id: int, top: int = 10, member_count: int = 0,
+) -> CollectionStats:
+    """Year histogram, citation quantiles, OA share and top authors, venues and topics of the
+    members' cached papers, in one query."""
+    rows = (await db.execute(_STATS, {"collection_id": collection_id, "top": top})).all()
+    by_kind: Dict[str, list] = {}
+    for r in rows:
+        by_kind.setdefault(r.kind, []).append(r)
+
+    summary = by_kind["summary"][0]
+    analyzed = summary.n or 0
+    oa = int(summary.extra or 0)
+
+    def counts(kind: str) -> List[CollectionStatCount]:
+        return [CollectionStatCount(key=str(r.key), label=r.label, count=r.n) for r in by_kind.get(kind, [])]
+
+    return CollectionStats(
+        collection_id=collection_id,
+        member_count=member_count,
+        papers_analyzed=analyzed,
+        open_access_count=oa,
+        open_access_share=round(oa / analyzed, 4) if analyzed else 0.0,
+        mean_citations=round(summary.value or 0.0, 2),
+        citation_quantiles=[
+            CitationQuantile(quantile=float(r.key), cited_by_count=int(r.value))
+            for r in sorted(by_kind.get("quantile", []), key=lambda r: float(r.key))
+        ],
+        years=sorted(counts("year"), key=lambda c: int(c.key)),
+        top_authors=counts("author"),
+        top_venues=counts("venue"),
+        top_topics=counts("topic"),
+    )
+
+
+collection_stats = CollectionStatsCache()
+
+
+async def _member_coverage(db: AsyncSession, collection_id: int) -> Tuple[int, List[str], int]:
+    """Member count, members without a cached paper row, and members with cached references."""
+    result = await db.execute(
+        select(CollectionPaper.paper_openalex_id, Paper.referenced_work_ids)
+        .outerjoin(Paper, Paper.openalex_id == CollectionPaper.paper_openalex_id)
+        .where(CollectionPaper.collection_id == collection_id)
+        .distinct()
+    )
+    members = result.all()
+    uncached = [oa_id for oa_id, refs in members if refs is None]
+    with_refs = sum(1 for _, refs in members if refs)
+    return len(members), uncached, with_refs
+
+
+async def find_gaps(
+    db: AsyncSession, collection_id: int, limit: int = 20, min_count: int = 2,
+) -> CollectionGaps:
+    """Papers cited by many collection members that are not in the collection.
+
+    One group-by over the members' cached reference lists; members missing
+    from the cache are fetched first in one batch, and the top references are
+    hydrated from the cache where fresh.
+    """
+    await openalex_client.writer.sync()
+    member_count, uncached, with_refs = await _member_coverage(db, collection_id)
+    if uncached:
+        try:
+            _, raw_works = await openalex_client.batch_get_works(uncached)
+            await openalex_client.cache_works(raw_works)
+            await openalex_client.writer.sync()
+            member_count, uncached, with_refs = await _member_coverage(db, collection_id)
+        except Exception:
+            pass
+
+    rows = (await db.execute(
+        _GAPS, {"collection_id": collection_id, "min_count": min_count, "limit": limit},
+    )).all()
+    summaries = await get_paper_summaries([r.openalex_id for r in rows], db) if rows else {}
+    gaps = [
+        CollectionGap(
+            openalex_id=r.openalex_id,
+            cited_by_members=r.cited_by,
+            share=round(r.cited_by / with_refs, 4) if with_refs else 0.0,
+            paper=summaries.get(r.openalex_id),
+        )
+        for r in rows
+    ]
+    return CollectionGaps(
+        collection_id=collection_id,
+        member_count=member_count,
+        members_with_references=with_refs,
+        gaps=gaps,
+    )
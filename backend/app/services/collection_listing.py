@@ -0,0 +1,143 @@
+"""Sorted, filtered, keyset-paginated listing of a collection's members.
+
+Only the columns a paper summary needs are read: OA status and source name
+are extracted from their JSON columns in SQL, and abstracts, topics and
+reference lists are never loaded. Pages are addressed by an opaque cursor
+holding the last row's sort key and member ID, so paging stays stable
+while papers are added or removed and costs the same on every page.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import String, func, or_, select, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.collection import CollectionPaper
+from app.models.paper import Paper
+from app.schemas.collection import CollectionPaperInfo
+from app.schemas.paper import PaperSummary
+from app.services.paper_cache import authorships_to_authors
+
+_IS_OA = func.json_extract(Paper.open_access_json, "$.is_oa")
+# Sort name -> key expression (NULLs mapped to a value so keyset comparisons work)
+MEMBER_SORTS = {
+    "added_at": type_coerce(CollectionPaper.added_at, String),  # always set; compared as stored text
+    "year": func.coalesce(Paper.publication_year, -1),
+    "citations": func.coalesce(Paper.cited_by_count, 0),
+    "title": func.coalesce(Paper.title, ""),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode_cursor(sort: str, desc: bool, value: Any, member_id: int) -> str:
+    raw = json.dumps([sort, desc, value, member_id], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str, desc: bool) -> Tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        c_sort, c_desc, value, member_id = json.loads(raw)
+        member_id = int(member_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Malformed cursor")
+    if c_sort != sort or c_desc != desc:
+        raise InvalidCursor("Cursor belongs to a different sort order")
+    return value, member_id
+
+
+async def list_members(
+    db: AsyncSession,
+    collection_id: int,
+    sort: str = "added_at",
+    desc: bool = True,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    is_oa: Optional[bool] = None,
+    work_type: Optional[str] = None,
+) -> Tuple[List[CollectionPaperInfo], int, Optional[str]]:
+    """One page of members, the number matching the filters, and the cursor of the next page.
+
+    Without `limit` every matching member is returned. Raises InvalidCursor
+    for a cursor not issued for this sort order.
+    """
+    key = MEMBER_SORTS[sort]
+    conditions = [CollectionPaper.collection_id == collection_id]
+    if year_min is not None:
+        conditions.append(Paper.publication_year >= year_min)
+    if year_max is not None:
+        conditions.append(Paper.publication_year <= year_max)
+    if is_oa is not None:
+        conditions.append(_IS_OA == 1 if is_oa else or_(_IS_OA.is_(None), _IS_OA == 0))
+    if work_type:
+        conditions.append(Paper.type == work_type)
+
+    total = (await db.execute(
+        select(func.count()).select_from(CollectionPaper)
+        .outerjoin(Paper, Paper.openalex_id == CollectionPaper.paper_openalex_id)
+        .where(*conditions)
+    )).scalar_one()
+
+    if cursor:
+        value, member_id = _decode_cursor(cursor, sort, desc)
+        after = tuple_(key, CollectionPaper.id)
+        conditions.append(after < tuple_(value, member_id) if desc else after > tuple_(value, member_id))
+
+    order = (key.desc(), CollectionPaper.id.desc()) if desc else (key.asc(), CollectionPaper.id.asc())
+    stmt = (
+        select(
+            CollectionPaper.id,
+            CollectionPaper.paper_openalex_id,
+            CollectionPaper.added_at,
+            CollectionPaper.notes,
+            key.label("sort_key"),
+            Paper.openalex_id,
+            Paper.doi,
+            Paper.title,
+            Paper.publication_year,
+            Paper.cited_by_count,
+            Paper.type,
+            Paper.authorships_json,
+            _IS_OA.label("is_oa"),
+            func.json_extract(Paper.primary_location_json, "$.source.display_name").label("source_name"),
+        )
+        .outerjoin(Paper, Paper.openalex_id == CollectionPaper.paper_openalex_id)
+        .where(*conditions)
+        .order_by(*order)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)  # one extra row tells whether there is a next page
+    rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(sort, desc, rows[-1].sort_key, rows[-1].id)
+
+    members = [
+        CollectionPaperInfo(
+            openalex_id=r.paper_openalex_id,
+            added_at=str(r.added_at) if r.added_at else None,
+            notes=r.notes,
+            paper=PaperSummary(
+                openalex_id=r.openalex_id,
+                doi=r.doi,
+                title=r.title or "Untitled",
+                publication_year=r.publication_year,
+                cited_by_count=r.cited_by_count or 0,
+                authors=authorships_to_authors(r.authorships_json),
+                type=r.type,
+                is_open_access=bool(r.is_oa),
+                source_name=r.source_name,
+            ) if r.openalex_id else None,
+        )
+        for r in rows
+    ]
+    return members, total, next_cursor
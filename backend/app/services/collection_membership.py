@@ -0,0 +1,160 @@
+"""Set-based collection membership changes: add, remove, copy and move many papers at once.
+
+Each operation runs in one transaction and relies on the unique
+(collection_id, paper_openalex_id) index, so papers already in the target
+collection are skipped by INSERT OR IGNORE instead of being looked up one by one.
+"""
+
+from typing import List, Optional, Set
+
+import httpx
+from sqlalchemy import delete, func, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.collection import Collection, CollectionPaper
+from app.models.paper import Paper
+from app.schemas.collection import CollectionBulkResult
+from app.services.cache_writer import CacheWriteError
+from app.services.openalex import openalex_client
+from app.services.paper_cache import normalize_id
+
+_SQL_CHUNK = 500  # stay below SQLite's bound-parameter limit
+
+
+def _unique_ids(openalex_ids: List[str]) -> List[str]:
+    return list(dict.fromkeys(normalize_id(i) for i in openalex_ids if i and i.strip()))
+
+
+async def _member_count(db: AsyncSession, collection_id: int) -> int:
+    result = await db.execute(
+        select(func.count()).select_from(CollectionPaper).where(CollectionPaper.collection_id == collection_id)
+    )
+    return result.scalar_one()
+
+
+async def _touch(db: AsyncSession, collection_id: int):
+    await db.execute(update(Collection).where(Collection.id == collection_id).values(updated_at=func.now()))
+
+
+async def _in_table(db: AsyncSession, column, ids: List[str], *where) -> Set[str]:
+    found: Set[str] = set()
+    for i in range(0, len(ids), _SQL_CHUNK):
+        result = await db.execute(select(column).where(column.in_(ids[i:i + _SQL_CHUNK]), *where))
+        found.update(result.scalars())
+    return found
+
+
+async def ensure_cached(db: AsyncSession, openalex_ids: List[str]) -> Set[str]:
+    """Make sure the papers are in the paper cache (members reference it); returns the IDs that are.
+
+    Papers not cached yet are fetched in one batched request per 50; IDs
+    OpenAlex does not know are left out.
+    """
+    cached = await _in_table(db, Paper.openalex_id, openalex_ids)
+    missing = [i for i in openalex_ids if i not in cached]
+    if missing:
+        _, raw_works = await openalex_client.batch_get_works(missing)
+        await openalex_client.cache_works(raw_works)
+        await openalex_client.writer.sync()
+        # Only what actually reached the cache
+        cached.update(await _in_table(db, Paper.openalex_id, [w["id"] for w in raw_works if w.get("id")]))
+    return cached
+
+
+async def add_papers(
+    db: AsyncSession, collection_id: int, openalex_ids: List[str], notes: Optional[str] = None,
+) -> CollectionBulkResult:
+    """Add papers to a collection, fetching any that are not cached yet."""
+    ids = _unique_ids(openalex_ids)
+    try:
+        available = await ensure_cached(db, ids)
+    except (httpx.HTTPError, CacheWriteError):
+        # OpenAlex unreachable or the fetched papers not cached: still add what is cached locally
+        available = await _in_table(db, Paper.openalex_id, ids)
+    to_add = [i for i in ids if i in available]
+
+    before = await _member_count(db, collection_id)
+    if to_add:
+        await db.execute(
+            sqlite_insert(CollectionPaper).prefix_with("OR IGNORE"),
+            [{"collection_id": collection_id, "paper_openalex_id": i, "notes": notes} for i in to_add],
+        )
+        await _touch(db, collection_id)
+    added = await _member_count(db, collection_id) - before
+    await db.commit()
+    return CollectionBulkResult(
+        added=added,
+        skipped=len(to_add) - added,
+        failed=len(ids) - len(to_add),
+        failed_ids=[i for i in ids if i not in available],
+    )
+
+
+async def remove_papers(db: AsyncSession, collection_id: int, openalex_ids: List[str]) -> CollectionBulkResult:
+    """Remove papers from a collection; IDs that are not members are skipped."""
+    ids = _unique_ids(openalex_ids)
+    before = await _member_count(db, collection_id)
+    for i in range(0, len(ids), _SQL_CHUNK):
+        await db.execute(
+            delete(CollectionPaper).where(
+                CollectionPaper.collection_id == collection_id,
+                CollectionPaper.paper_openalex_id.in_(ids[i:i + _SQL_CHUNK]),
+            )
+        )
+    removed = before - await _member_count(db, collection_id)
+    if removed:
+        await _touch(db, collection_id)
+    await db.commit()
+    return CollectionBulkResult(removed=removed, skipped=len(ids) - removed)
+
+
+async def copy_papers(
+    db: AsyncSession, source_id: int, target_id: int, openalex_ids: List[str], move: bool = False,
+) -> CollectionBulkResult:
+    """Copy (or move) members of one collection to another, keeping their notes.
+
+    IDs that are not members of the source fail; members already in the
+    target are skipped (and, when moving, still removed from the source).
+    """
+    ids = _unique_ids(openalex_ids)
+    members = await _in_table(
+        db, CollectionPaper.paper_openalex_id, ids, CollectionPaper.collection_id == source_id,
+    )
+    to_copy = [i for i in ids if i in members]
+
+    before = await _member_count(db, target_id)
+    for i in range(0, len(to_copy), _SQL_CHUNK):
+        rows = select(
+            literal(target_id), CollectionPaper.paper_openalex_id, CollectionPaper.notes,
+        ).where(
+            CollectionPaper.collection_id == source_id,
+            CollectionPaper.paper_openalex_id.in_(to_copy[i:i + _SQL_CHUNK]),
+        )
+        await db.execute(
+            sqlite_insert(CollectionPaper).prefix_with("OR IGNORE").from_select(
+                ["collection_id", "paper_openalex_id", "notes"], rows,
+            )
+        )
+    added = await _member_count(db, target_id) - before
+    removed = 0
+    if move and to_copy:
+        for i in range(0, len(to_copy), _SQL_CHUNK):
+            await db.execute(
+                delete(CollectionPaper).where(
+                    CollectionPaper.collection_id == source_id,
+                    CollectionPaper.paper_openalex_id.in_(to_copy[i:i + _SQL_CHUNK]),
+                )
+            )
+        removed = len(to_copy)
+        await _touch(db, source_id)
+    if added:
+        await _touch(db, target_id)
+    await db.commit()
+    return CollectionBulkResult(
+        added=added,
+        removed=removed,
+        skipped=len(to_copy) - added,
+        failed=len(ids) - len(to_copy),
+        failed_ids=[i for i in ids if i not in members],
+    )
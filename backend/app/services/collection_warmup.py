@@ -0,0 +1,247 @@
+"""Background warm-up of a collection's citation neighborhood.
+
+A warm-up job fetches, for every member of a collection, what graph builds and
+discovery would otherwise request from OpenAlex on first use:
+
+- the member's own record with its reference list, 50 members per request;
+- its most cited citers (one page of up to 200). Members whose citers fit one
+  page together are OR-ed into a single `cites:` filter; if stale counts let
+  the combined citers overflow the page, the members are re-requested singly.
+
+Citers go into the paper cache and into discovery_cache as "seed_citers"
+samples, the same entries top-sampled co-citation discovery reuses; graph
+builds read both through `paper_cache.cached_references` and
+`paper_cache.cached_citers`.
+
+Jobs issue one request at a time, paced to `warmup_requests_per_minute`
+shared by all running jobs, so interactive requests keep priority.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session
+from app.models.collection import CollectionPaper
+from app.models.discovery import DiscoveryCacheEntry
+from app.models.paper import Paper
+from app.schemas.collection import CollectionWarmup
+from app.services.openalex import openalex_client
+from app.services.paper_cache import SEED_CITERS_KIND, cached_citers, cached_references
+
+_SQL_CHUNK = 500  # stay below SQLite's bound-parameter limit
+CITERS_PER_MEMBER = 200  # one page
+_MAX_MEMBERS_PER_REQUEST = 10  # members OR-ed into one `cites:` filter
+
+
+async def _members(db: AsyncSession, collection_id: int) -> List[str]:
+    result = await db.execute(
+        select(CollectionPaper.paper_openalex_id).where(CollectionPaper.collection_id == collection_id)
+    )
+    return list(dict.fromkeys(result.scalars()))
+
+
+async def _store_citers(db: AsyncSession, samples: Dict[str, Dict[str, List[str]]]):
+    now = datetime.now(timezone.utc)
+    stmt = sqlite_insert(DiscoveryCacheEntry)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DiscoveryCacheEntry.kind, DiscoveryCacheEntry.openalex_id],
+        set_={col: stmt.excluded[col] for col in ("sample_size", "works", "fetched_at")},
+    )
+    await db.execute(stmt, [
+        {"kind": SEED_CITERS_KIND, "openalex_id": oa_id, "sample_size": CITERS_PER_MEMBER,
+         "works": works, "fetched_at": now}
+        for oa_id, works in samples.items()
+    ])
+    await db.commit()
+
+
+def _citer_groups(members: List[str], counts: Dict[str, int]) -> List[List[str]]:
+    """Members packed into `cites:` filters while their combined citers fit one page."""
+    groups: List[List[str]] = []
+    current: List[str] = []
+    total = 0
+    for oa_id in members:
+        count = counts.get(oa_id)
+        if count is None or count >= CITERS_PER_MEMBER:
+            groups.append([oa_id])
+            continue
+        if current and (total + count > CITERS_PER_MEMBER or len(current) >= _MAX_MEMBERS_PER_REQUEST):
+            groups.append(current)
+            current, total = [], 0
+        current.append(oa_id)
+        total += count
+    if current:
+        groups.append(current)
+    return groups
+
+
+class _Pacer:
+    """Spaces requests to the warm-up rate budget, across all jobs."""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._next = 0.0
+
+    async def wait(self):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next = loop.time() + 60.0 / max(settings.warmup_requests_per_minute, 1)
+
+
+class WarmupProgress:
+    FIELDS = ("requests_made", "failed_requests", "references_fetched", "citers_fetched")
+
+    def __init__(self):
+        self.status = "running"  # running | completed | failed | cancelled
+        self.stage = "queued"
+        self.error: Optional[str] = None
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+
+    def add(self, **deltas: int):
+        for name, delta in deltas.items():
+            setattr(self, name, getattr(self, name) + delta)
+
+
+async def warm_collection(db: AsyncSession, collection_id: int, progress: WarmupProgress, pacer: _Pacer):
+    """Fetch the members' missing reference lists, then their missing top-citer samples."""
+    members = await _members(db, collection_id)
+
+    progress.stage = "references"
+    refs = await cached_references(db, members)
+    missing = [m for m in members if m not in refs]
+    for i in range(0, len(missing), 50):
+        await pacer.wait()
+        progress.add(requests_made=1)
+        try:
+            _, raw_works = await openalex_client.batch_get_works(missing[i:i + 50])
+        except httpx.HTTPError:
+            progress.add(failed_requests=1)
+            continue
+        await openalex_client.cache_works(raw_works)
+        progress.add(references_fetched=len(raw_works))
+    await openalex_client.writer.sync()
+
+    progress.stage = "citers"
+    sampled = await cached_citers(db, members, CITERS_PER_MEMBER)
+    todo = [m for m in members if m not in sampled]
+    counts: Dict[str, int] = {}
+    for i in range(0, len(todo), _SQL_CHUNK):
+        result = await db.execute(
+            select(Paper.openalex_id, Paper.cited_by_count).where(Paper.openalex_id.in_(todo[i:i + _SQL_CHUNK]))
+        )
+        counts.update(result.all())
+    uncited = [m for m in todo if counts.get(m) == 0]
+    if uncited:
+        await _store_citers(db, {m: {} for m in uncited})
+
+    groups = _citer_groups([m for m in todo if counts.get(m) != 0], counts)
+    while groups:
+        group = groups.pop(0)
+        await pacer.wait()
+        progress.add(requests_made=1)
+        try:
+            resp, raw_works = await openalex_client.get_works_citing(group, per_page=CITERS_PER_MEMBER)
+        except httpx.HTTPError:
+            progress.add(failed_requests=1)
+            continue
+        await openalex_client.cache_works(raw_works)
+        if len(group) > 1 and resp.meta.count > len(raw_works):
+            # Stale counts packed more citers than one page holds: sample the members one by one
+            groups.extend([m] for m in group)
+            continue
+        samples: Dict[str, Dict[str, List[str]]] = {m: {} for m in group}
+        for work in raw_works:
+            work_refs = work.get("referenced_works") or []
+            for m in group:
+                if m in work_refs and work.get("id"):
+                    samples[m][work["id"]] = work_refs
+        await _store_citers(db, samples)
+        progress.add(citers_fetched=len(raw_works))
+    await openalex_client.writer.sync()
+    progress.stage = "done"
+
+
+async def warmup_coverage(db: AsyncSession, collection_id: int) -> Dict[str, int]:
+    """How many members have a fresh reference list and a stored top-citer sample."""
+    members = await _members(db, collection_id)
+    return {
+        "member_count": len(members),
+        "references_cached": len(await cached_references(db, members)),
+        "citers_cached": len(await cached_citers(db, members, CITERS_PER_MEMBER)),
+    }
+
+
+class CollectionWarmupManager:
+    """Runs one warm-up task per collection; progress of the last run is kept in memory."""
+
+    def __init__(self):
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._progress: Dict[int, WarmupProgress] = {}
+        self._pacer = _Pacer()
+
+    def running(self, collection_id: int) -> bool:
+        task = self._tasks.get(collection_id)
+        return task is not None and not task.done()
+
+    def start(self, collection_id: int) -> WarmupProgress:
+        """Start warming a collection, unless a warm-up of it is already running."""
+        if not self.running(collection_id):
+            progress = WarmupProgress()
+            self._progress[collection_id] = progress
+            self._tasks[collection_id] = asyncio.create_task(self._run(collection_id, progress))
+        return self._progress[collection_id]
+
+    async def cancel(self, collection_id: int) -> bool:
+        task = self._tasks.get(collection_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        await asyncio.wait([task])
+        return True
+
+    async def shutdown(self):
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def _run(self, collection_id: int, progress: WarmupProgress):
+        # Own write scope, so the coverage reads see the papers the job cached
+        openalex_client.writer.open_scope()
+        try:
+            async with async_session() as db:
+                await warm_collection(db, collection_id, progress, self._pacer)
+            progress.status = "completed"
+        except asyncio.CancelledError:
+            progress.status = "cancelled"
+        except Exception as e:
+            progress.status = "failed"
+            progress.error = str(e)
+        finally:
+            self._tasks.pop(collection_id, None)
+
+    async def status(self, db: AsyncSession, collection_id: int) -> CollectionWarmup:
+        progress = self._progress.get(collection_id)
+        return CollectionWarmup(
+            collection_id=collection_id,
+            status=progress.status if progress else "idle",
+            stage=progress.stage if progress else None,
+            error=progress.error if progress else None,
+            **({name: getattr(progress, name) for name in WarmupProgress.FIELDS} if progress else {}),
+            **await warmup_coverage(db, collection_id),
+        )
+
+
+collection_warmup = CollectionWarmupManager()
@@ -2,214 +2,529 @@
 
 import asyncio
 from collections import Counter
-from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
 
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.models.discovery import DiscoveryCacheEntry
 from app.models.paper import Paper
-from app.schemas.discovery import DiscoveryResult
-from app.schemas.paper import PaperSummary
+from app.schemas.discovery import DiscoveryRequest, DiscoveryResult, SeedCoverage
+from app.services.citation_matrix import IncidenceMatrix, bibliographic_coupling, co_citation
+from app.services.citing_sampler import CitingSample, sample_citing_works
 from app.services.openalex import openalex_client
+from app.services.paper_cache import get_paper_summaries, local_citing_rows, staleness_cutoff
 
 
-async def _get_paper_refs(openalex_id: str, db: AsyncSession) -> Optional[List[str]]:
-    """Get referenced_work_ids from cache or API."""
-    paper = await db.get(Paper, openalex_id)
-    if paper and paper.referenced_work_ids:
-        return paper.referenced_work_ids
-    # Fetch from API and cache
-    try:
-        detail, raw = await openalex_client.get_work(openalex_id)
-        await openalex_client.cache_works([raw], db)
-        return detail.referenced_work_ids
-    except Exception:
-        return None
+_SQL_CHUNK = 500  # stay below SQLite's bound-parameter limit
+_LOCAL_SHARED_REFS = 500  # seed references looked up in the local cache for coupling
+_REMOTE_SHARED_REFS = 50  # seed references whose citers are fetched from OpenAlex
+_MAX_REFS_PER_REQUEST = 10  # references OR-ed into one `cites:` filter
+_STABLE_CHECKS = 2  # unchanged top-k checks in a row before coupling stops fetching
 
+T = TypeVar("T")
+R = TypeVar("R")
 
-async def discover_co_citation(
-    seed_ids: List[str],
-    db: AsyncSession,
-    max_results: int = 30,
-    citing_sample_size: int = 100,
-) -> List[DiscoveryResult]:
-    """
-    Co-citation analysis: find papers frequently referenced alongside seed papers.
+class DiscoveryProgress:
+    """Live counters for one discovery run; `version` increases on every change."""
 
-    Algorithm:
-    1. For each seed, fetch papers that cite it (citing papers).
-    2. For each citing paper, collect its referenced_work_ids.
-    3. Count how often each referenced paper appears across all citing papers.
-    4. Exclude seeds themselves. Rank by frequency.
-    5. Fetch details for top candidates and return.
-    """
-    seed_set: Set[str] = set(seed_ids)
-    # Track which seeds each candidate is co-cited with
-    candidate_seeds: Dict[str, Set[str]] = {}
-    candidate_count: Counter = Counter()
+    FIELDS = (
+        "seeds_total", "seeds_scanned", "references_total", "references_scanned",
+        "candidates_found", "requests_made",
+    )
 
-    async def process_seed(seed_id: str) -> None:
-        try:
-            resp, raw_works = await openalex_client.get_work_citations(
-                seed_id, page=1, per_page=min(citing_sample_size, 200)
-            )
-            await openalex_client.cache_works(raw_works, db)
+    def __init__(self):
+        self.stage = "queued"
+        self.version = 0
+        self.coverage: List[SeedCoverage] = []
+        for name in self.FIELDS:
+            setattr(self, name, 0)
 
-            for work in raw_works:
-                refs = work.get("referenced_works") or []
-                for ref_id in refs:
-                    if ref_id not in seed_set:
-                        candidate_count[ref_id] += 1
-                        if ref_id not in candidate_seeds:
-                            candidate_seeds[ref_id] = set()
-                        candidate_seeds[ref_id].add(seed_id)
-        except Exception:
-            pass
+    def update(self, stage: Optional[str] = None, **values: int):
+        if stage is not None:
+            self.stage = stage
+        for name, value in values.items():
+            setattr(self, name, value)
+        self.version += 1
 
-    # Fetch citing papers for all seeds concurrently
-    await asyncio.gather(*[process_seed(sid) for sid in seed_ids])
+    def add(self, **deltas: int):
+        for name, delta in deltas.items():
+            setattr(self, name, getattr(self, name) + delta)
+        self.version += 1
 
-    # Rank candidates: prefer those co-cited with more seeds, then by raw count
-    ranked = sorted(
-        candidate_count.items(),
-        key=lambda x: (len(candidate_seeds.get(x[0], set())), x[1]),
-        reverse=True,
-    )
-    top_ids = [cid for cid, _ in ranked[:max_results]]
+    def add_coverage(self, coverage: SeedCoverage):
+        self.coverage.append(coverage)
+        self.version += 1
+
+    def to_dict(self) -> Dict:
+        data = {name: getattr(self, name) for name in self.FIELDS}
+        data["stage"] = self.stage
+        data["coverage"] = [c.model_dump() for c in self.coverage]
+        return data
+
+
+def _batches(n: int, size: int = 50) -> int:
+    return (n + size - 1) // size
 
-    if not top_ids:
-        return []
 
-    # Fetch paper details
-    summaries, raw_works = await openalex_client.batch_get_works(top_ids)
-    await openalex_client.cache_works(raw_works, db)
+async def _pipelined(
+    items: Iterable[T], fetch: Callable[[T], Awaitable[R]], concurrency: int,
+) -> AsyncIterator[Tuple[T, Optional[R]]]:
+    """Run `fetch` over `items` keeping up to `concurrency` calls in flight.
 
-    summary_map: Dict[str, PaperSummary] = {s.openalex_id: s for s in summaries}
-    total_seeds = len(seed_ids)
+    Yields (item, result) in completion order, with None for failed calls.
+    Closing the generator early cancels the calls still running.
+    """
+    remaining = iter(items)
+    pending: Dict[asyncio.Task, T] = {}
+    try:
+        while True:
+            for item in remaining:
+                pending[asyncio.ensure_future(fetch(item))] = item
+                if len(pending) >= concurrency:
+                    break
+            if not pending:
+                return
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = pending.pop(task)
+                yield item, (None if task.exception() else task.result())
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _local_citing_works(ids: List[str], db: AsyncSession) -> Dict[str, List[str]]:
+    """Cached papers referencing any of `ids`, mapped to their reference lists."""
+    await openalex_client.writer.sync()
+    return {row.openalex_id: row.referenced_work_ids or [] for row in await local_citing_rows(db, ids)}
+
+
+async def _get_papers_refs(
+    openalex_ids: List[str], db: AsyncSession, progress: DiscoveryProgress,
+) -> Dict[str, List[str]]:
+    """Get referenced_work_ids from cache, fetching the rest in batched API calls."""
+    await openalex_client.writer.sync()
+    refs: Dict[str, List[str]] = {}
+    for i in range(0, len(openalex_ids), _SQL_CHUNK):
+        result = await db.execute(
+            select(Paper.openalex_id, Paper.referenced_work_ids).where(
+                Paper.openalex_id.in_(openalex_ids[i:i + _SQL_CHUNK])
+            )
+        )
+        for oa_id, ref_ids in result:
+            if ref_ids:
+                refs[oa_id] = ref_ids
+    missing = [i for i in openalex_ids if i not in refs]
+    if missing:
+        progress.add(requests_made=_batches(len(missing)))
+        try:
+            _, raw_works = await openalex_client.batch_get_works(missing)
+            await openalex_client.cache_works(raw_works)
+            for work in raw_works:
+                refs[work["id"]] = work.get("referenced_works") or []
+        except Exception:
+            pass
+    return refs
+
+
+async def _load_cached(
+    db: AsyncSession, kind: str, ids: List[str], sample_size: int,
+) -> Dict[str, Dict[str, List[str]]]:
+    """Unexpired intermediate results from earlier runs sampled at least `sample_size` deep."""
+    entries: Dict[str, Dict[str, List[str]]] = {}
+    cutoff = staleness_cutoff()
+    for i in range(0, len(ids), _SQL_CHUNK):
+        result = await db.execute(
+            select(DiscoveryCacheEntry.openalex_id, DiscoveryCacheEntry.works).where(
+                DiscoveryCacheEntry.kind == kind,
+                DiscoveryCacheEntry.openalex_id.in_(ids[i:i + _SQL_CHUNK]),
+                DiscoveryCacheEntry.sample_size >= sample_size,
+                DiscoveryCacheEntry.fetched_at >= cutoff,
+            )
+        )
+        for oa_id, works in result:
+            entries[oa_id] = works
+    return entries
+
+
+async def _store_cached(
+    db: AsyncSession, kind: str, entries: Dict[str, Dict[str, List[str]]], sample_size: int,
+):
+    if not entries:
+        return
+    now = datetime.now(timezone.utc)
+    stmt = sqlite_insert(DiscoveryCacheEntry)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DiscoveryCacheEntry.kind, DiscoveryCacheEntry.openalex_id],
+        set_={col: stmt.excluded[col] for col in ("sample_size", "works", "fetched_at")},
+    )
+    await db.execute(stmt, [
+        {"kind": kind, "openalex_id": oa_id, "sample_size": sample_size, "works": works, "fetched_at": now}
+        for oa_id, works in entries.items()
+    ])
+    await db.commit()
 
+
+async def _to_results(
+    ranked: List[Tuple[str, float, int, int]],
+    reason: Callable[[int, int], str],
+    db: AsyncSession,
+    progress: DiscoveryProgress,
+) -> List[DiscoveryResult]:
+    if not ranked:
+        return []
+    progress.update(stage="hydrating")
+    # Paper details, from the cache where fresh
+    summary_map = await get_paper_summaries([cid for cid, _, _, _ in ranked], db)
     results: List[DiscoveryResult] = []
-    for cid, count in ranked[:max_results]:
+    for cid, score, overlap, count in ranked:
         paper = summary_map.get(cid)
         if not paper:
             continue
-        overlap = len(candidate_seeds.get(cid, set()))
-        score = (overlap / total_seeds) * 0.7 + min(count / 100.0, 1.0) * 0.3
         results.append(DiscoveryResult(
             paper=paper,
             score=round(score, 4),
             overlap_seeds=overlap,
-            reason="Co-cited with {}/{} seeds ({} citing papers)".format(
-                overlap, total_seeds, count
-            ),
+            reason=reason(overlap, count),
         ))
-
     return results
 
 
+def _seed_sample_kind(sampling: str, sample_seed: int) -> str:
+    """discovery_cache kind for seed samples; reproducible strategies are keyed by their seed too."""
+    if sampling == "top":
+        return "seed_citers"
+    if sampling in ("random", "stratified"):
+        return "seed_citers:{}:{}".format(sampling, sample_seed)
+    return "seed_citers:{}".format(sampling)
+
+
+async def discover_co_citation(
+    seed_ids: List[str],
+    db: AsyncSession,
+    max_results: int = 30,
+    citing_sample_size: int = 100,
+    similarity: str = "count",
+    progress: Optional[DiscoveryProgress] = None,
+    sampling: str = "top",
+    max_requests_per_seed: int = 10,
+    max_works_per_seed: int = 5000,
+    sample_seed: int = 42,
+) -> List[DiscoveryResult]:
+    """
+    Co-citation analysis: find papers frequently referenced alongside seed papers.
+
+    Algorithm:
+    1. Collect papers citing the seeds: up to `citing_sample_size` per seed from
+       OpenAlex, drawn with the `sampling` strategy (see citing_sampler) within
+       the per-seed request and memory budgets. With "top", every cached citer
+       is used too and seeds with enough cached citers are not fetched; the
+       other strategies use only their sample, so it stays unbiased.
+    2. Build the citing x cited incidence matrix from their reference lists.
+    3. Co-citation counts with each seed are one sparse product; normalize them
+       with `similarity` and average over the seeds.
+    4. Exclude seeds themselves, take the top candidates and fetch their details.
+    """
+    progress = progress or DiscoveryProgress()
+    seeds = list(dict.fromkeys(seed_ids))
+    seed_set: Set[str] = set(seeds)
+    progress.update(stage="citing papers", seeds_total=len(seeds))
+    if sampling == "top":
+        works = await _local_citing_works(seeds, db)
+        cached = Counter(ref for refs in works.values() for ref in refs if ref in seed_set)
+        to_fetch = [sid for sid in seeds if cached[sid] < citing_sample_size]
+        for sid in seeds:
+            if cached[sid] >= citing_sample_size:
+                progress.add_coverage(SeedCoverage(
+                    seed_id=sid, sampling=sampling, sampled=cached[sid], cached=True,
+                ))
+    else:
+        works = {}
+        to_fetch = seeds
+
+    # Seeds sampled by an earlier run are not fetched again
+    kind = _seed_sample_kind(sampling, sample_seed)
+    stored = await _load_cached(db, kind, to_fetch, citing_sample_size)
+    for sid, sample in stored.items():
+        works.update(sample)
+        progress.add_coverage(SeedCoverage(seed_id=sid, sampling=sampling, sampled=len(sample), cached=True))
+    to_fetch = [sid for sid in to_fetch if sid not in stored]
+    progress.update(seeds_scanned=len(seeds) - len(to_fetch))
+    fetched: List[Dict] = []
+    samples: Dict[str, Dict[str, List[str]]] = {}
+
+    async def fetch_citers(seed_id: str) -> CitingSample:
+        return await sample_citing_works(
+            seed_id, sampling, citing_sample_size,
+            max_requests=max_requests_per_seed, max_works=max_works_per_seed, random_seed=sample_seed,
+        )
+
+    async for seed_id, sample in _pipelined(to_fetch, fetch_citers, settings.discovery_concurrency):
+        if sample is None:
+            progress.add(seeds_scanned=1)
+            continue
+        progress.add(seeds_scanned=1, requests_made=sample.coverage.requests)
+        progress.add_coverage(sample.coverage)
+        fetched.extend(sample.raw)
+        works.update(sample.works)
+        if sample.coverage.truncated != "error":
+            samples[seed_id] = sample.works
+    if fetched:
+        await openalex_client.cache_works(fetched)
+    for sample in samples.values():
+        works.update(sample)
+    await _store_cached(db, kind, samples, citing_sample_size)
+
+    progress.update(stage="ranking", seeds_scanned=len(seeds))
+    matrix = IncidenceMatrix(works.items())
+    progress.update(candidates_found=max(matrix.shape[1] - len(seeds), 0))
+    ranked = co_citation(matrix, seeds, measure=similarity, k=max_results)
+    total_seeds = len(seeds)
+    return await _to_results(
+        ranked,
+        lambda overlap, count: "Co-cited with {}/{} seeds ({} citing papers)".format(
+            overlap, total_seeds, count
+        ),
+        db,
+        progress,
+    )
+
+
+async def _citation_counts(
+    openalex_ids: List[str], db: AsyncSession, progress: DiscoveryProgress,
+) -> Dict[str, int]:
+    """cited_by_count per ID from fresh cache rows, the rest in light batched requests."""
+    await openalex_client.writer.sync()
+    counts: Dict[str, int] = {}
+    cutoff = staleness_cutoff()
+    for i in range(0, len(openalex_ids), _SQL_CHUNK):
+        result = await db.execute(
+            select(Paper.openalex_id, Paper.cited_by_count).where(
+                Paper.openalex_id.in_(openalex_ids[i:i + _SQL_CHUNK]),
+                Paper.fetched_at >= cutoff,
+            )
+        )
+        counts.update(result.all())
+
+    async def fetch_counts(ids: List[str]) -> List[Dict]:
+        resp = await openalex_client.client.get("/works", params={
+            "filter": "openalex:{}".format("|".join(ids)),
+            "per_page": 50,
+            "select": "id,cited_by_count",
+        })
+        resp.raise_for_status()
+        return resp.json().get("results", [])
+
+    missing = [i for i in openalex_ids if i not in counts]
+    batches = [missing[i:i + 50] for i in range(0, len(missing), 50)]
+    async for _, results in _pipelined(batches, fetch_counts, settings.discovery_concurrency):
+        progress.add(requests_made=1)
+        for work in results or []:
+            counts[work["id"]] = work.get("cited_by_count") or 0
+    return counts
+
+
+def _reference_groups(
+    refs: List[str], counts: Dict[str, int], citing_sample_size: int,
+) -> List[List[str]]:
+    """Split references into `cites:` OR filters, keeping their order.
+
+    References with fewer known citers than the sample size are packed together
+    while their combined citers fit one page of 200, so each group returns
+    every citer of its members; the rest get a request of their own.
+    """
+    groups: List[List[str]] = []
+    current: List[str] = []
+    total = 0
+    for ref_id in refs:
+        count = counts.get(ref_id)
+        if count is None or count >= citing_sample_size:
+            groups.append([ref_id])
+            continue
+        if current and (total + count > 200 or len(current) >= _MAX_REFS_PER_REQUEST):
+            groups.append(current)
+            current, total = [], 0
+        current.append(ref_id)
+        total += count
+    if current:
+        groups.append(current)
+    return groups
+
+
+async def _sample_reference_citers(
+    refs: List[str],
+    counts: Dict[str, int],
+    works: Dict[str, List[str]],
+    seeds: List[str],
+    citing_sample_size: int,
+    similarity: str,
+    max_results: int,
+    progress: DiscoveryProgress,
+    early_stop: bool = True,
+) -> Dict[str, Dict[str, List[str]]]:
+    """Fetch the most cited citers of each reference, adding them to `works`.
+
+    Requests (see `_reference_groups`) run as a bounded pipeline and are
+    merged as they arrive. References come most shared first, so later ones
+    matter least: with `early_stop`, fetching ends once the top `max_results`
+    have not changed for a few checks. Returns the sample per fetched reference;
+    a packed group whose citers did not fit one page (its counts were stale) adds
+    its citers to `works` but returns no samples, as they would be incomplete.
+    """
+    groups = _reference_groups(refs, counts, citing_sample_size)
+    concurrency = settings.discovery_concurrency
+    check_every = max(concurrency // 2, 1)
+    seed_set = set(seeds)
+    samples: Dict[str, Dict[str, List[str]]] = {}
+
+    async def fetch_citers(group: List[str]) -> Tuple[List[Dict], bool]:
+        """The group's citers, and whether they are complete (or, for one reference, the full sample)."""
+        resp = await openalex_client.client.get("/works", params={
+            "filter": "cites:{}".format("|".join(group)),
+            "per_page": 200 if len(group) > 1 else min(citing_sample_size, 200),
+            "sort": "cited_by_count:desc",
+            "select": "id,referenced_works",
+        })
+        resp.raise_for_status()
+        data = resp.json()
+        results = data.get("results", [])
+        return results, len(group) == 1 or (data.get("meta") or {}).get("count", 0) <= len(results)
+
+    top: Optional[List[str]] = None
+    stable = 0
+    completed = 0
+    stream = _pipelined(groups, fetch_citers, concurrency)
+    try:
+        async for group, fetched in stream:
+            completed += 1
+            progress.add(references_scanned=len(group), requests_made=1)
+            if fetched is None:
+                continue
+            results, complete = fetched
+            sampled = group if complete else []
+            for ref_id in sampled:
+                samples[ref_id] = {}
+            for work in results:
+                wid = work.get("id", "")
+                if not wid:
+                    continue
+                work_refs = work.get("referenced_works") or []
+                works.setdefault(wid, work_refs)
+                cited = set(work_refs)
+                for ref_id in sampled:
+                    if ref_id in cited:
+                        samples[ref_id][wid] = work_refs
+            progress.update(candidates_found=len(works) - len(seed_set & works.keys()))
+
+            if early_stop and completed % check_every == 0 and completed < len(groups):
+                ranked = bibliographic_coupling(
+                    IncidenceMatrix(works.items()), seeds, measure=similarity, k=max_results,
+                )
+                ranking = [cid for cid, _, _, _ in ranked]
+                stable = stable + 1 if ranking == top else 0
+                top = ranking
+                if stable >= _STABLE_CHECKS:
+                    break
+    finally:
+        await stream.aclose()
+    return samples
+
+
 async def discover_bibliographic_coupling(
     seed_ids: List[str],
     db: AsyncSession,
     max_results: int = 30,
     citing_sample_size: int = 100,
+    similarity: str = "count",
+    progress: Optional[DiscoveryProgress] = None,
 ) -> List[DiscoveryResult]:
     """
     Bibliographic coupling: find papers that share references with seed papers.
 
     Algorithm:
     1. Collect all referenced_work_ids from seed papers.
-    2. Find the most common references (shared by multiple seeds).
-    3. For each top shared reference, find papers that also cite it.
-    4. Score candidates by how many shared references they also cite.
+    2. Rank the references by how many seeds cite them.
+    3. Collect papers citing the top shared references, from the cache and from
+       pipelined OpenAlex requests that stop once the ranking settles.
+    4. Coupling strength with each seed is one sparse product over the incidence
+       matrix; normalize it with `similarity` and average over the seeds.
     """
-    seed_set: Set[str] = set(seed_ids)
+    progress = progress or DiscoveryProgress()
+    seeds = list(dict.fromkeys(seed_ids))
+    seed_set: Set[str] = set(seeds)
 
     # Step 1: Collect references from all seeds
-    all_refs: List[Tuple[str, List[str]]] = []  # (seed_id, refs)
-    tasks = [_get_paper_refs(sid, db) for sid in seed_ids]
-    ref_results = await asyncio.gather(*tasks)
-
-    for sid, refs in zip(seed_ids, ref_results):
-        if refs:
-            all_refs.append((sid, refs))
-
-    if not all_refs:
+    progress.update(stage="seed references", seeds_total=len(seeds))
+    works = await _get_papers_refs(seeds, db, progress)
+    progress.update(seeds_scanned=len(works))
+    if not works:
         return []
 
     # Step 2: Count reference frequency across seeds
     ref_counter: Counter = Counter()
-    for _, refs in all_refs:
-        for ref_id in refs:
-            if ref_id not in seed_set:
-                ref_counter[ref_id] += 1
-
-    # Take top shared references (those appearing in multiple seeds)
-    # If only 1 seed, take its top references by just using all of them
-    top_refs = [ref_id for ref_id, count in ref_counter.most_common(50)]
-
+    for refs in works.values():
+        ref_counter.update(ref_id for ref_id in set(refs) if ref_id not in seed_set)
+    top_refs = [ref_id for ref_id, _ in ref_counter.most_common(_LOCAL_SHARED_REFS)]
     if not top_refs:
         return []
 
-    # Step 3: For top shared references, find papers that also cite them
-    candidate_refs: Dict[str, Set[str]] = {}  # candidate_id -> set of shared refs it cites
-
-    async def find_citers_of_ref(ref_id: str) -> None:
-        try:
-            # Find papers that reference this work
-            resp = await openalex_client.client.get("/works", params={
-                "filter": "cites:{}".format(ref_id),
-                "per_page": min(citing_sample_size, 200),
-                "sort": "cited_by_count:desc",
-                "select": "id,referenced_works",
-            })
-            resp.raise_for_status()
-            data = resp.json()
-            for work in data.get("results", []):
-                wid = work.get("id", "")
-                if wid and wid not in seed_set:
-                    if wid not in candidate_refs:
-                        candidate_refs[wid] = set()
-                    candidate_refs[wid].add(ref_id)
-        except Exception:
-            pass
-
-    # Process in batches to avoid overwhelming the API
-    batch_size = 10
-    for i in range(0, len(top_refs), batch_size):
-        batch = top_refs[i:i + batch_size]
-        await asyncio.gather(*[find_citers_of_ref(rid) for rid in batch])
-
-    # Step 4: Score candidates by number of shared references they cite
-    seed_ref_set = set(top_refs)
-    ranked = sorted(
-        candidate_refs.items(),
-        key=lambda x: len(x[1]),
-        reverse=True,
+    # Step 3: Papers citing the top shared references
+    remote_refs = top_refs[:_REMOTE_SHARED_REFS]
+    progress.update(stage="citing papers", references_total=len(remote_refs))
+    for wid, refs in (await _local_citing_works(top_refs, db)).items():
+        works.setdefault(wid, refs)
+    progress.update(candidates_found=len(works) - len(seed_set & works.keys()))
+
+    # References sampled by an earlier run are not fetched again
+    stored = await _load_cached(db, "reference_citers", remote_refs, citing_sample_size)
+    for sample in stored.values():
+        for wid, refs in sample.items():
+            works.setdefault(wid, refs)
+    remote_refs = [ref_id for ref_id in remote_refs if ref_id not in stored]
+    progress.update(references_scanned=len(stored))
+    counts = await _citation_counts(remote_refs, db, progress)
+    samples = await _sample_reference_citers(
+        remote_refs, counts, works, seeds, citing_sample_size, similarity, max_results, progress,
     )
-    top_ids = [cid for cid, _ in ranked[:max_results]]
 
-    if not top_ids:
-        return []
-
-    # Fetch paper details
-    summaries, raw_works = await openalex_client.batch_get_works(top_ids)
-    await openalex_client.cache_works(raw_works, db)
-
-    summary_map: Dict[str, PaperSummary] = {s.openalex_id: s for s in summaries}
-    total_shared_refs = len(seed_ref_set)
+    await _store_cached(db, "reference_citers", samples, citing_sample_size)
+
+    # Step 4: Rank candidates by coupling strength
+    progress.update(stage="ranking")
+    ranked = bibliographic_coupling(IncidenceMatrix(works.items()), seeds, measure=similarity, k=max_results)
+    total_seeds = len(seeds)
+    return await _to_results(
+        ranked,
+        lambda overlap, count: "Shares {} references with {}/{} seeds".format(
+            count, overlap, total_seeds
+        ),
+        db,
+        progress,
+    )
 
-    results: List[DiscoveryResult] = []
-    for cid, shared in ranked[:max_results]:
-        paper = summary_map.get(cid)
-        if not paper:
-            continue
-        overlap = len(shared)
-        score = overlap / max(total_shared_refs, 1)
-        results.append(DiscoveryResult(
-            paper=paper,
-            score=round(score, 4),
-            overlap_seeds=overlap,
-            reason="Shares {}/{} key references with seeds".format(
-                overlap, total_shared_refs
-            ),
-        ))
 
-    return results
+async def run_discovery(
+    body: DiscoveryRequest, db: AsyncSession, progress: Optional[DiscoveryProgress] = None,
+) -> List[DiscoveryResult]:
+    """Run the discovery strategy named in the request."""
+    params = dict(
+        seed_ids=body.seed_ids,
+        db=db,
+        max_results=body.max_results,
+        citing_sample_size=body.citing_sample_size,
+        similarity=body.similarity,
+        progress=progress,
+    )
+    if body.strategy == "bibliographic_coupling":
+        return await discover_bibliographic_coupling(**params)
+    return await discover_co_citation(
+        **params,
+        sampling=body.sampling,
+        max_requests_per_seed=body.max_requests_per_seed,
+        max_works_per_seed=body.max_works_per_seed,
+        sample_seed=body.sample_seed,
+    )
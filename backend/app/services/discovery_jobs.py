@@ -0,0 +1,148 @@
+"""Background discovery jobs with live progress, cancellation and stored results."""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import update
+
+from app.database import async_session
+from app.models.discovery import DiscoveryJob
+from app.schemas.discovery import DiscoveryJobOut, DiscoveryJobProgress, DiscoveryRequest, DiscoveryResult
+from app.services.discovery import DiscoveryProgress, run_discovery
+from app.services.openalex import openalex_client
+
+ACTIVE_STATUSES = ("pending", "running")
+
+
+class DiscoveryJobManager:
+    """Runs discovery requests as asyncio tasks and records their outcome in SQLite.
+
+    Progress is kept in memory while a job runs and written to the job row
+    when it finishes; results survive restarts, jobs cut short by a restart
+    are marked "interrupted".
+    """
+
+    def __init__(self):
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._progress: Dict[int, DiscoveryProgress] = {}
+        self._shutting_down = False
+
+    async def create(self, body: DiscoveryRequest) -> DiscoveryJob:
+        async with async_session() as db:
+            job = DiscoveryJob(
+                strategy=body.strategy,
+                seed_ids=body.seed_ids,
+                params={
+                    "max_results": body.max_results,
+                    "citing_sample_size": body.citing_sample_size,
+                    "similarity": body.similarity,
+                    "sampling": body.sampling,
+                    "max_requests_per_seed": body.max_requests_per_seed,
+                    "max_works_per_seed": body.max_works_per_seed,
+                    "sample_seed": body.sample_seed,
+                },
+                status="pending",
+            )
+            db.add(job)
+            await db.commit()
+            await db.refresh(job)
+
+        progress = DiscoveryProgress()
+        self._progress[job.id] = progress
+        self._tasks[job.id] = asyncio.create_task(self._run(job.id, body, progress))
+        return job
+
+    def progress(self, job_id: int) -> Optional[DiscoveryProgress]:
+        """Live progress of a job running in this process, else None."""
+        return self._progress.get(job_id)
+
+    async def cancel(self, job_id: int) -> bool:
+        task = self._tasks.get(job_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        await asyncio.wait([task])
+        return True
+
+    async def mark_interrupted(self):
+        """Flag jobs left active by a previous run of the app."""
+        async with async_session() as db:
+            await db.execute(
+                update(DiscoveryJob)
+                .where(DiscoveryJob.status.in_(ACTIVE_STATUSES))
+                .values(status="interrupted", finished_at=datetime.now(timezone.utc))
+            )
+            await db.commit()
+
+    async def shutdown(self):
+        self._shutting_down = True
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def _run(self, job_id: int, body: DiscoveryRequest, progress: DiscoveryProgress):
+        # Own write scope, so the job's local reads see the papers it cached
+        openalex_client.writer.open_scope()
+        try:
+            await self._set(job_id, status="running")
+            async with async_session() as db:
+                results = await run_discovery(body, db, progress)
+            progress.update(stage="done")
+            await self._set(
+                job_id, status="completed", progress=progress,
+                results=[r.model_dump() for r in results],
+            )
+        except asyncio.CancelledError:
+            status = "interrupted" if self._shutting_down else "cancelled"
+            await self._set(job_id, status=status, progress=progress)
+        except Exception as e:
+            await self._set(job_id, status="failed", progress=progress, error=str(e))
+        finally:
+            self._tasks.pop(job_id, None)
+            self._progress.pop(job_id, None)
+
+    async def _set(
+        self,
+        job_id: int,
+        status: str,
+        progress: Optional[DiscoveryProgress] = None,
+        results: Optional[List[Dict]] = None,
+        error: Optional[str] = None,
+    ):
+        values: Dict = {"status": status}
+        if progress is not None:
+            values["progress"] = progress.to_dict()
+        if results is not None:
+            values["results"] = results
+        if error is not None:
+            values["error"] = error
+        if status not in ACTIVE_STATUSES:
+            values["finished_at"] = datetime.now(timezone.utc)
+        async with async_session() as db:
+            await db.execute(update(DiscoveryJob).where(DiscoveryJob.id == job_id).values(**values))
+            await db.commit()
+
+    def to_out(self, job: DiscoveryJob, include_results: bool = False) -> DiscoveryJobOut:
+        live = self._progress.get(job.id)
+        progress = live.to_dict() if live is not None else job.progress
+        results = None
+        if include_results and job.results is not None:
+            results = [DiscoveryResult(**r) for r in job.results]
+        return DiscoveryJobOut(
+            id=job.id,
+            strategy=job.strategy,
+            seed_count=len(job.seed_ids or []),
+            params=job.params or {},
+            status=job.status,
+            progress=DiscoveryJobProgress(**progress) if progress else None,
+            error=job.error,
+            created_at=job.created_at.isoformat() if job.created_at else None,
+            finished_at=job.finished_at.isoformat() if job.finished_at else None,
+            results=results,
+        )
+
+
+discovery_jobs = DiscoveryJobManager()
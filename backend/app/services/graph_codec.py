@@ -0,0 +1,101 @@
+"""Compact columnar encodings of GraphData, negotiated via the Accept header.
+
+The columnar layout stores node attributes as parallel arrays, strips the
+shared OpenAlex URL prefix from node IDs, and encodes edges as two integer
+arrays indexing into the node table. It is served as JSON
+(``application/vnd.lithelper.graph+json``) or, when the optional ``msgpack``
+package is installed, as MessagePack (``application/x-msgpack``).
+"""
+
+import json
+from typing import Dict, Optional
+
+from fastapi.responses import Response
+
+from app.schemas.graph import GraphData
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+COLUMNAR_JSON = "application/vnd.lithelper.graph+json"
+MSGPACK_TYPES = ("application/x-msgpack", "application/msgpack")
+ID_PREFIX = "https://openalex.org/"
+
+
+def encode_columnar(graph: GraphData) -> Dict:
+    """Convert GraphData into the columnar dict layout."""
+    ids = [n.id for n in graph.nodes]
+    index = {nid: i for i, nid in enumerate(ids)}
+    cut = len(ID_PREFIX)
+    sources = []
+    targets = []
+    for e in graph.edges:
+        s = index.get(e.source)
+        t = index.get(e.target)
+        if s is not None and t is not None:
+            sources.append(s)
+            targets.append(t)
+
+    nodes = {
+        "id": [nid[cut:] if nid.startswith(ID_PREFIX) else nid for nid in ids],
+        "title": [n.title for n in graph.nodes],
+        "publication_year": [n.publication_year for n in graph.nodes],
+        "cited_by_count": [n.cited_by_count for n in graph.nodes],
+        "authors": [n.authors for n in graph.nodes],
+        "is_seed": [i for i, n in enumerate(graph.nodes) if n.is_seed],  # indices, seeds are few
+        "depth": [n.depth for n in graph.nodes],
+    }
+    if any(n.x is not None for n in graph.nodes):
+        nodes["x"] = [n.x for n in graph.nodes]
+        nodes["y"] = [n.y for n in graph.nodes]
+
+    return {
+        "format": "columnar",
+        "version": 1,
+        "id_prefix": ID_PREFIX,
+        "session_id": graph.session_id,
+        "nodes": nodes,
+        "edges": {"source": sources, "target": targets},
+        "failed_nodes": graph.failed_nodes,
+    }
+
+
+def _accepted(accept: str) -> Dict[str, float]:
+    """Media types listed in an Accept header with their q-values (q=0: not acceptable)."""
+    prefs: Dict[str, float] = {}
+    for part in accept.split(","):
+        media, *params = [p.strip() for p in part.split(";")]
+        if not media:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    q = 0.0
+        media = media.lower()
+        prefs[media] = max(q, prefs.get(media, 0.0))
+    return prefs
+
+
+def negotiated_response(graph: GraphData, accept: Optional[str]) -> Response:
+    """Encode the graph as the client prefers: columnar MessagePack or JSON when asked for
+    explicitly (and not ranked below plain JSON), else the default JSON."""
+    prefs = _accepted(accept or "")
+    msgpack_q = max(prefs.get(t, 0.0) for t in MSGPACK_TYPES)
+    columnar_q = prefs.get(COLUMNAR_JSON, 0.0)
+    if msgpack is None:
+        # MessagePack requested but unavailable: the columnar JSON is the next best thing
+        columnar_q, msgpack_q = max(columnar_q, msgpack_q), 0.0
+    headers = {"Vary": "Accept"}
+    if max(msgpack_q, columnar_q) > 0 and max(msgpack_q, columnar_q) >= prefs.get("application/json", 0.0):
+        if msgpack_q >= columnar_q:
+            body = msgpack.packb(encode_columnar(graph), use_bin_type=True)
+            return Response(content=body, media_type=MSGPACK_TYPES[0], headers=headers)
+        body = json.dumps(encode_columnar(graph), separators=(",", ":"), ensure_ascii=False)
+        return Response(content=body, media_type=COLUMNAR_JSON, headers=headers)
+    return Response(content=graph.model_dump_json(), media_type="application/json", headers=headers)
@@ -0,0 +1,109 @@
+"""Compact in-memory citation graph used while building graphs.
+
+Node IDs are interned to integer indices, edges live in two integer arrays,
+and node metadata is held in slotted records. Pydantic ``GraphData`` is only
+produced at the API boundary, so graphs of tens of thousands of nodes stay
+cheap to build and hold.
+"""
+
+from array import array
+from typing import Dict, List, Set, Tuple
+
+from app.schemas.graph import GraphData, GraphEdge, GraphNode
+from app.schemas.paper import PaperSummary
+
+
+class PaperRecord:
+    """The subset of paper metadata a graph node carries."""
+
+    __slots__ = ("title", "publication_year", "cited_by_count", "authors")
+
+    def __init__(self, title: str, publication_year: int, cited_by_count: int, authors: Tuple[str, ...]):
+        self.title = title
+        self.publication_year = publication_year
+        self.cited_by_count = cited_by_count
+        self.authors = authors
+
+    @classmethod
+    def from_summary(cls, paper: PaperSummary) -> "PaperRecord":
+        return cls(
+            paper.title,
+            paper.publication_year or 0,
+            paper.cited_by_count,
+            tuple(a.author_name for a in paper.authors[:3]),
+        )
+
+    @classmethod
+    def from_work(cls, work: Dict) -> "PaperRecord":
+        """Build from a raw OpenAlex work dict (or a cached row in the same shape)."""
+        authorships = work.get("authorships") or []
+        return cls(
+            work.get("title") or "Untitled",
+            work.get("publication_year") or 0,
+            work.get("cited_by_count") or 0,
+            tuple((a.get("author") or {}).get("display_name", "") for a in authorships[:3]),
+        )
+
+
+class CitationNetwork:
+    """Directed citation graph; an edge (i, j) means node i cites node j."""
+
+    __slots__ = ("ids", "index", "records", "depths", "seeds", "sources", "targets", "_edge_keys")
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.records: List[PaperRecord] = []
+        self.depths = array("i")
+        self.seeds = array("b")
+        self.sources = array("q")
+        self.targets = array("q")
+        self._edge_keys: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, openalex_id: str) -> bool:
+        return openalex_id in self.index
+
+    def add_node(self, openalex_id: str, record: PaperRecord, depth: int, is_seed: bool = False) -> int:
+        idx = self.index.get(openalex_id)
+        if idx is not None:
+            return idx
+        idx = len(self.ids)
+        self.index[openalex_id] = idx
+        self.ids.append(openalex_id)
+        self.records.append(record)
+        self.depths.append(depth)
+        self.seeds.append(1 if is_seed else 0)
+        return idx
+
+    def add_edge(self, citing: int, cited: int) -> bool:
+        key = (citing << 32) | cited
+        if key in self._edge_keys:
+            return False
+        self._edge_keys.add(key)
+        self.sources.append(citing)
+        self.targets.append(cited)
+        return True
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.sources)
+
+    def to_graph_data(self) -> GraphData:
+        nodes = [
+            GraphNode(
+                id=nid,
+                title=rec.title,
+                publication_year=rec.publication_year,
+                cited_by_count=rec.cited_by_count,
+                authors=list(rec.authors),
+                is_seed=bool(seed),
+                depth=depth,
+            )
+            for nid, rec, depth, seed in zip(self.ids, self.records, self.depths, self.seeds)
+        ]
+        ids = self.ids
+        edges = [GraphEdge(source=ids[s], target=ids[t]) for s, t in zip(self.sources, self.targets)]
+        return GraphData(nodes=nodes, edges=edges)
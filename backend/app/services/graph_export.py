@@ -0,0 +1,138 @@
+"""Streaming GraphML, GEXF and CSV serializers for citation graphs.
+
+Each serializer is a generator yielding text chunks of roughly CHUNK_SIZE
+characters, so large graphs can be sent with a StreamingResponse without
+building the whole document in memory.
+"""
+
+import csv
+import io
+from typing import Callable, Dict, Iterator, List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from app.schemas.graph import GraphData, GraphNode
+
+CHUNK_SIZE = 64 * 1024
+
+# Node attributes shared by all formats: (name, type, getter)
+_ATTRIBUTES: List[Tuple[str, str, Callable[[GraphNode], object]]] = [
+    ("title", "string", lambda n: n.title),
+    ("year", "int", lambda n: n.publication_year),
+    ("citations", "int", lambda n: n.cited_by_count),
+    ("authors", "string", lambda n: "; ".join(n.authors)),
+    ("depth", "int", lambda n: n.depth),
+    ("seed", "boolean", lambda n: n.is_seed),
+]
+
+
+def _has_layout(graph: GraphData) -> bool:
+    return any(n.x is not None for n in graph.nodes)
+
+
+def _text(v: object) -> str:
+    if v is None:
+        return ""  # empty CSV cell
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    return str(v)
+
+
+def _chunked(parts: Iterator[str]) -> Iterator[str]:
+    buf: List[str] = []
+    size = 0
+    for part in parts:
+        buf.append(part)
+        size += len(part)
+        if size >= CHUNK_SIZE:
+            yield "".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield "".join(buf)
+
+
+def _graphml_parts(graph: GraphData) -> Iterator[str]:
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+    attributes = list(_ATTRIBUTES)
+    if _has_layout(graph):
+        attributes += [("x", "double", lambda n: n.x), ("y", "double", lambda n: n.y)]
+    for name, kind, _ in attributes:
+        yield '  <key id="{0}" for="node" attr.name="{0}" attr.type="{1}"/>\n'.format(name, kind)
+    yield '  <graph id="citations" edgedefault="directed">\n'
+    for node in graph.nodes:
+        yield "    <node id={}>".format(quoteattr(node.id))
+        for name, _, get in attributes:
+            value = get(node)
+            if value is not None:  # missing values are omitted, "None" is not a valid double
+                yield '<data key="{}">{}</data>'.format(name, escape(_text(value)))
+        yield "</node>\n"
+    for edge in graph.edges:
+        yield "    <edge source={} target={}/>\n".format(quoteattr(edge.source), quoteattr(edge.target))
+    yield "  </graph>\n</graphml>\n"
+
+
+def _gexf_parts(graph: GraphData) -> Iterator[str]:
+    layout = _has_layout(graph)
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<gexf xmlns="http://gexf.net/1.3" xmlns:viz="http://gexf.net/1.3/viz" version="1.3">\n'
+    yield '  <graph defaultedgetype="directed" mode="static">\n'
+    yield '    <attributes class="node">\n'
+    for i, (name, kind, _) in enumerate(_ATTRIBUTES[1:]):  # the title is the node label
+        yield '      <attribute id="{}" title="{}" type="{}"/>\n'.format(i, name, kind)
+    yield "    </attributes>\n    <nodes>\n"
+    for node in graph.nodes:
+        yield "      <node id={} label={}><attvalues>".format(quoteattr(node.id), quoteattr(node.title))
+        for i, (_, _, get) in enumerate(_ATTRIBUTES[1:]):
+            value = get(node)
+            if value is not None:
+                yield '<attvalue for="{}" value={}/>'.format(i, quoteattr(_text(value)))
+        yield "</attvalues>"
+        if layout and node.x is not None:
+            yield '<viz:position x="{}" y="{}" z="0"/>'.format(node.x, node.y)
+        yield "</node>\n"
+    yield "    </nodes>\n    <edges>\n"
+    for i, edge in enumerate(graph.edges):
+        yield '      <edge id="{}" source={} target={}/>\n'.format(i, quoteattr(edge.source), quoteattr(edge.target))
+    yield "    </edges>\n  </graph>\n</gexf>\n"
+
+
+def _csv_parts(header: List[str], rows: Iterator[List[object]]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buf.tell() >= CHUNK_SIZE:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def _nodes_csv_parts(graph: GraphData) -> Iterator[str]:
+    header = ["id"] + [name for name, _, _ in _ATTRIBUTES]
+    layout = _has_layout(graph)
+    if layout:
+        header += ["x", "y"]
+
+    def rows():
+        for node in graph.nodes:
+            row = [node.id] + [_text(get(node)) for _, _, get in _ATTRIBUTES]
+            if layout:
+                row += [_text(node.x), _text(node.y)]
+            yield row
+
+    return _csv_parts(header, rows())
+
+
+def _edges_csv_parts(graph: GraphData) -> Iterator[str]:
+    return _csv_parts(["source", "target"], ([e.source, e.target] for e in graph.edges))
+
+
+# format -> (chunk generator, media type, file extension)
+EXPORT_FORMATS: Dict[str, Tuple[Callable[[GraphData], Iterator[str]], str, str]] = {
+    "graphml": (lambda g: _chunked(_graphml_parts(g)), "application/graphml+xml", "graphml"),
+    "gexf": (lambda g: _chunked(_gexf_parts(g)), "application/gexf+xml", "gexf"),
+    "nodes_csv": (_nodes_csv_parts, "text/csv", "nodes.csv"),
+    "edges_csv": (_edges_csv_parts, "text/csv", "edges.csv"),
+}
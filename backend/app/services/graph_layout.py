@@ -0,0 +1,271 @@
+"""Server-side 2D force-directed layout for citation graphs.
+
+Multilevel Fruchterman-Reingold (after Walshaw): the graph is repeatedly
+coarsened by matching and collapsing neighbouring nodes, the coarsest graph
+is laid out exactly, and each finer level starts from its parent's positions
+and is refined with repulsion limited to a cutoff radius (neighbour pairs
+from a k-d tree). Every iteration is a few vectorized NumPy passes, so 10k
+node graphs lay out in a few seconds. Layouts run in a worker process to
+keep the event loop (and the Electron renderer waiting on it) responsive.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+from app.schemas.graph import GraphData
+
+SCALE = 30.0  # output units per ideal edge length; matches the renderer's default link distance
+_COARSEST = 50  # stop coarsening below this many nodes
+_EXACT_MAX = 1000  # all-pairs repulsion for a coarsest graph up to this size (e.g. when coarsening stalls)
+_CUTOFF = 1.5  # repulsion radius in units of the level's spring length
+_GRAVITY = 1.0
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _symmetric(n: int, sources: np.ndarray, targets: np.ndarray) -> sparse.csr_matrix:
+    keep = sources != targets
+    s, t = sources[keep], targets[keep]
+    a = sparse.csr_matrix(
+        (np.ones(2 * len(s)), (np.r_[s, t], np.r_[t, s])), shape=(n, n),
+    )
+    a.sum_duplicates()
+    return a
+
+
+def _coarsen(a: sparse.csr_matrix, rng: np.random.Generator) -> np.ndarray:
+    """Map each node to a parent: mutual matches pair up, other nodes join their pick."""
+    n = a.shape[0]
+    rank = rng.random(n)
+    deg = np.diff(a.indptr)
+    has_nb = deg > 0
+    pick = np.full(n, -1, dtype=np.int64)
+    if has_nb.any():
+        # Each node picks its neighbour with the lowest random rank
+        vals = rank[a.indices]
+        starts = a.indptr[:-1][has_nb]
+        best = np.minimum.reduceat(vals, starts)
+        rows = np.repeat(np.arange(n), deg)
+        row_best = np.full(n, np.inf)
+        row_best[has_nb] = best
+        hit = vals == row_best[rows]
+        first = np.flatnonzero(hit)
+        first = first[np.r_[True, rows[first][1:] != rows[first][:-1]]]
+        pick[rows[first]] = a.indices[first]
+
+    parent = np.full(n, -1, dtype=np.int64)
+    idx = np.arange(n)
+    mutual = (pick >= 0) & (pick[np.maximum(pick, 0)] == idx)
+    leaders = idx[mutual & (idx < pick)]
+    parent[leaders] = np.arange(len(leaders))
+    parent[pick[leaders]] = parent[leaders]
+    # Unmatched nodes with a neighbour join their pick's group once it has one
+    for _ in range(2):
+        loose = (parent < 0) & (pick >= 0)
+        joinable = loose & (parent[np.maximum(pick, 0)] >= 0)
+        parent[joinable] = parent[pick[joinable]]
+    rest = parent < 0
+    parent[rest] = len(leaders) + np.arange(int(rest.sum()))
+    return parent
+
+
+def _refine(
+    pos: np.ndarray,
+    mass: np.ndarray,
+    src: np.ndarray,
+    dst: np.ndarray,
+    k: float,
+    movable: np.ndarray,
+    iterations: int,
+    t0: float,
+    exact: bool = False,
+):
+    """Fruchterman-Reingold iterations; repulsion is cut off at _CUTOFF * k unless `exact`.
+
+    Only the exact (coarsest) pass applies gravity: with cutoff repulsion it
+    would keep compressing the layout, and the coarse placement already keeps
+    components together.
+    """
+    n = len(pos)
+    deg = np.bincount(src, minlength=n) + np.bincount(dst, minlength=n)
+    damp = 1.0 / np.sqrt(np.maximum(deg[src] * deg[dst], 1))
+    for it in range(iterations):
+        disp = np.zeros_like(pos)
+        if exact:
+            dx = pos[:, 0, None] - pos[None, :, 0]
+            dy = pos[:, 1, None] - pos[None, :, 1]
+            f = (k * k) * mass[None, :] / np.maximum(dx * dx + dy * dy, 1e-4 * k * k)
+            np.fill_diagonal(f, 0.0)
+            disp[:, 0] += (dx * f).sum(axis=1)
+            disp[:, 1] += (dy * f).sum(axis=1)
+        else:
+            pairs = cKDTree(pos).query_pairs(_CUTOFF * k, output_type="ndarray")
+            i, j = pairs[:, 0], pairs[:, 1]
+            d = pos[i] - pos[j]
+            f = (k * k) / np.maximum((d * d).sum(axis=1), 1e-4 * k * k)
+            for axis in (0, 1):
+                disp[:, axis] += np.bincount(i, d[:, axis] * f * mass[j], n)
+                disp[:, axis] -= np.bincount(j, d[:, axis] * f * mass[i], n)
+
+        # Attraction along citation links, damped for hubs so their neighbourhoods don't collapse
+        d = pos[src] - pos[dst]
+        pull = d * (np.sqrt((d * d).sum(axis=1)) / k * damp)[:, None]
+        for axis in (0, 1):
+            disp[:, axis] -= np.bincount(src, pull[:, axis], n)
+            disp[:, axis] += np.bincount(dst, pull[:, axis], n)
+
+        if exact:
+            # Weak gravity keeps disconnected components from drifting apart
+            disp -= _GRAVITY * (pos - pos.mean(axis=0))
+
+        t = t0 * (1.0 - it / iterations)
+        length = np.maximum(np.sqrt((disp * disp).sum(axis=1)), 1e-9)
+        step = disp * (np.minimum(length, t) / length)[:, None]
+        pos[movable] += step[movable]
+
+
+def force_layout(
+    n: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    initial: Optional[np.ndarray] = None,
+    pinned: Optional[np.ndarray] = None,
+    iterations: int = 60,
+    seed: int = 0,
+) -> np.ndarray:
+    """Lay out n nodes; returns an (n, 2) array of positions in output units.
+
+    `initial` holds known positions (NaN rows for unplaced nodes) and `pinned`
+    marks nodes that must not move, so incremental layouts keep the existing
+    picture stable and only place the new nodes around it.
+    """
+    if n == 0:
+        return np.zeros((0, 2))
+    rng = np.random.default_rng(seed)
+    keep = sources != targets
+    src, dst = sources[keep], targets[keep]
+
+    if initial is not None and not np.isnan(initial).all():
+        return _incremental_layout(n, src, dst, initial / SCALE, pinned, iterations, rng) * SCALE
+
+    # Coarsen until the graph is small or stops shrinking
+    levels: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []  # (parent map, src, dst) per level
+    cur_n, cur_src, cur_dst = n, src, dst
+    while cur_n > _COARSEST:
+        parent = _coarsen(_symmetric(cur_n, cur_src, cur_dst), rng)
+        next_n = int(parent.max()) + 1
+        if next_n > 0.9 * cur_n:
+            break
+        levels.append((parent, cur_src, cur_dst))
+        ps, pt = parent[cur_src], parent[cur_dst]
+        keep = ps != pt
+        cur_n, cur_src, cur_dst = next_n, ps[keep], pt[keep]
+
+    # A coarse node repels with the weight of the nodes it stands for
+    masses = [np.ones(n)]
+    for parent, _, _ in levels:
+        masses.append(np.bincount(parent, masses[-1]))
+    masses = [m / m.mean() for m in masses]
+    # Keep the drawing area constant across levels: k grows as the node count shrinks
+    sizes = [n] + [int(parent.max()) + 1 for parent, _, _ in levels]
+    k = np.sqrt(n / cur_n)
+    side = np.sqrt(cur_n) * k
+
+    # Global layout of the coarsest graph
+    pos = rng.random((cur_n, 2)) * side
+    everything = np.ones(cur_n, dtype=bool)
+    _refine(pos, masses[-1], cur_src, cur_dst, k, everything, iterations * 2, side / 5.0,
+            exact=cur_n <= _EXACT_MAX)
+
+    # Prolong to each finer level and refine locally
+    for level in range(len(levels) - 1, -1, -1):
+        parent, lsrc, ldst = levels[level]
+        k = np.sqrt(n / sizes[level])
+        # Spread siblings over a disk sized to their number around the parent's position
+        siblings = np.bincount(parent)[parent]
+        angle = rng.random(len(parent)) * 2.0 * np.pi
+        radius = 0.5 * k * np.sqrt(siblings * rng.random(len(parent)))
+        pos = pos[parent] + np.stack([np.cos(angle), np.sin(angle)], axis=1) * radius[:, None]
+        # Finer levels start close to their final shape and need fewer iterations
+        level_iterations = max(iterations // 3, int(iterations * (sizes[-1] / sizes[level]) ** 0.25))
+        _refine(pos, masses[level], lsrc, ldst, k, np.ones(len(parent), dtype=bool), level_iterations, k)
+
+    return (pos - pos.mean(axis=0)) * SCALE
+
+
+def _incremental_layout(n, src, dst, pos, pinned, iterations, rng) -> np.ndarray:
+    k = 1.0
+    placed = ~np.isnan(pos).any(axis=1)
+    pinned = placed if pinned is None else pinned & placed
+    # Start unplaced nodes next to their placed neighbours, else near the centre
+    centre = pos[placed].mean(axis=0)
+    nb_sum = np.zeros((n, 2))
+    nb_cnt = np.zeros(n)
+    for a, b in ((src, dst), (dst, src)):
+        ok = placed[b]
+        np.add.at(nb_sum, a[ok], pos[b[ok]])
+        np.add.at(nb_cnt, a[ok], 1)
+    start = np.where(nb_cnt[:, None] > 0, nb_sum / np.maximum(nb_cnt, 1)[:, None], centre)
+    pos = np.where(placed[:, None], pos, start + rng.normal(scale=k, size=(n, 2)))
+    movable = ~pinned
+    if movable.any():
+        _refine(pos, np.ones(n), src, dst, k, movable, iterations, 3.0 * k)
+    return pos
+
+
+def _layout_graph(
+    ids: List[str],
+    edges: List[Tuple[str, str]],
+    fixed: Dict[str, Tuple[float, float]],
+) -> List[Tuple[float, float]]:
+    index = {nid: i for i, nid in enumerate(ids)}
+    pairs = [(index[s], index[t]) for s, t in edges if s in index and t in index]
+    sources = np.asarray([p[0] for p in pairs], dtype=np.int64)
+    targets = np.asarray([p[1] for p in pairs], dtype=np.int64)
+    initial = None
+    pinned = None
+    if fixed:
+        initial = np.full((len(ids), 2), np.nan)
+        pinned = np.zeros(len(ids), dtype=bool)
+        for nid, xy in fixed.items():
+            if nid in index:
+                initial[index[nid]] = xy
+                pinned[index[nid]] = True
+    pos = force_layout(len(ids), sources, targets, initial=initial, pinned=pinned)
+    return [(round(float(x), 2), round(float(y), 2)) for x, y in pos]
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # "spawn" everywhere, so workers start the same way as in the frozen macOS/Windows builds
+        _executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def shutdown_layout_workers():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+async def apply_layout(graph: GraphData, fixed: Optional[Dict[str, Tuple[float, float]]] = None):
+    """Set x/y on the graph's nodes. Nodes in `fixed` keep their given positions."""
+    fixed = fixed or {}
+    ids = [n.id for n in graph.nodes]
+    known = set(ids)
+    # Pinned context nodes take part in the layout even if the graph only holds new nodes
+    ids += [nid for nid in fixed if nid not in known]
+    edges = [(e.source, e.target) for e in graph.edges]
+    loop = asyncio.get_running_loop()
+    positions = await loop.run_in_executor(_get_executor(), _layout_graph, ids, edges, fixed)
+    for node, (x, y) in zip(graph.nodes, positions):
+        node.x = x
+        node.y = y
@@ -0,0 +1,485 @@
+"""Monitored-search and tracked-author checks, and the background scheduler that runs them."""
+
+import asyncio
+import json
+import random
+import time
+from datetime import date as date_type, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session
+from app.models.author import TrackedAuthor, TrackedAuthorWork
+from app.models.monitor import MonitoredSearch, MonitoredSearchResult
+from app.schemas.author import AuthorCheckAllResponse, AuthorCheckResult
+from app.schemas.monitor import MonitorCheckAllResponse, MonitorCheckResult
+from app.schemas.paper import PaperSummary, SearchResponse
+from app.services.author_works import add_author_papers, sync_author_works
+from app.services.openalex import openalex_client
+
+_JITTER = 0.1  # next checks are spread by up to ±10% of the interval ...
+_MAX_JITTER = timedelta(minutes=30)  # ... but at most half an hour
+_MAX_MONITOR_PAGES = 25  # 200 results each; bounds a check of a very broad query
+_AUTHOR_BATCH = 50  # author IDs per OR filter
+_MAX_AUTHOR_PAGES = 10
+_SYNCS_PER_POLL = 5  # full bibliography mirrors fetched per scheduler poll
+
+
+def _now() -> datetime:
+    """Naive UTC, as the DateTime columns store it."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def next_check_time(interval_hours: int, now: Optional[datetime] = None) -> datetime:
+    """`interval_hours` from now, jittered so checks created together do not stay aligned."""
+    interval = timedelta(hours=max(interval_hours, 1))
+    spread = min(interval * _JITTER, _MAX_JITTER)
+    return (now or _now()) + interval + spread * random.uniform(-1, 1)
+
+
+def _group_key(monitor: MonitoredSearch) -> Tuple[str, str]:
+    """Monitors with the same key run the same OpenAlex search."""
+    return " ".join(monitor.query.lower().split()), json.dumps(monitor.filters or {}, sort_keys=True)
+
+
+class _Group:
+    """One shared search for the monitors with the same query and filters."""
+
+    def __init__(self, monitors: List[MonitoredSearch]):
+        self.monitors = monitors
+        self.total = 0
+        self.baseline: List[PaperSummary] = []
+        self.incremental: List[PaperSummary] = []
+        self.matched = 0  # results in the incremental window, from its first page's count
+        self.truncated = False  # the page cap stopped the incremental fetch early
+        self.requests = 0
+        self.elapsed_ms = 0.0
+        self.error: Optional[str] = None
+
+    async def _search(self, **params) -> Tuple[SearchResponse, List[Dict]]:
+        filters = self.monitors[0].filters or {}
+        self.requests += 1
+        resp, raw_works = await openalex_client.search_works(
+            query=self.monitors[0].query,
+            year_min=filters.get("year_min"),
+            year_max=filters.get("year_max"),
+            work_type=filters.get("type"),
+            **params,
+        )
+        await openalex_client.cache_works(raw_works)
+        return resp, raw_works
+
+    async def fetch(self):
+        """Monitors never checked get the top relevance page. The others get a
+        count probe and, if the count moved, everything published since the
+        oldest of their last checks (minus `monitor_lookback_days`)."""
+        checked = [m for m in self.monitors if m.last_checked_at is not None]
+        if len(checked) < len(self.monitors):
+            resp, _ = await self._search(per_page=50)
+            self.baseline = resp.results
+            self.total = resp.meta.count
+        if not checked:
+            return
+        if not self.requests:
+            probe, _ = await self._search(per_page=1)
+            self.total = probe.meta.count
+        if all(m.known_result_count == self.total for m in checked):
+            return
+        oldest = min(m.last_checked_at for m in checked)
+        since = (oldest - timedelta(days=settings.monitor_lookback_days)).date()
+        cursor: Optional[str] = "*"
+        pages = 0
+        while cursor and pages < _MAX_MONITOR_PAGES:
+            resp, _ = await self._search(
+                sort="publication_date:desc", per_page=200,
+                from_publication_date=since.isoformat(), cursor=cursor,
+            )
+            if not pages:
+                self.matched = resp.meta.count
+            pages += 1
+            self.incremental.extend(resp.results)
+            cursor = resp.meta.next_cursor if resp.results else None
+        # Only the newest `_MAX_MONITOR_PAGES` pages were fetched; the rest of the window is skipped
+        self.truncated = bool(cursor)
+
+    async def run(self, semaphore: asyncio.Semaphore):
+        started = time.perf_counter()
+        try:
+            async with semaphore:
+                await self.fetch()
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+        self.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _result_counts(db: AsyncSession, monitor_ids: List[int]) -> Dict[int, int]:
+    result = await db.execute(
+        select(MonitoredSearchResult.monitor_id, func.count())
+        .where(MonitoredSearchResult.monitor_id.in_(monitor_ids))
+        .group_by(MonitoredSearchResult.monitor_id)
+    )
+    return dict(result.all())
+
+
+async def check_monitors(
+    db: AsyncSession, monitors: List[MonitoredSearch], concurrency: Optional[int] = None,
+) -> MonitorCheckAllResponse:
+    """Check several monitors, sharing one search between monitors with the same query and filters.
+
+    Searches run concurrently, at most `concurrency` (default
+    `discovery_concurrency`) at a time; new results for all monitors are
+    written with one INSERT OR IGNORE, so papers a monitor already reported
+    are skipped by its unique (monitor_id, paper_openalex_id) index. Monitors whose search
+    failed keep their schedule state and report the error.
+    """
+    started = time.perf_counter()
+    grouped: Dict[Tuple[str, str], List[MonitoredSearch]] = {}
+    for monitor in monitors:
+        grouped.setdefault(_group_key(monitor), []).append(monitor)
+    groups = [_Group(members) for members in grouped.values()]
+    semaphore = asyncio.Semaphore(max(concurrency or settings.discovery_concurrency, 1))
+    await asyncio.gather(*[g.run(semaphore) for g in groups])
+
+    rows: List[Dict] = []
+    for group in groups:
+        if group.error:
+            continue
+        for monitor in group.monitors:
+            papers = group.baseline if monitor.last_checked_at is None else group.incremental
+            rows.extend(
+                {"monitor_id": monitor.id, "paper_openalex_id": p.openalex_id, "paper_title": p.title}
+                for p in papers if p.openalex_id
+            )
+
+    ids = [m.id for m in monitors]
+    before = await _result_counts(db, ids)
+    if rows:
+        await db.execute(sqlite_insert(MonitoredSearchResult).prefix_with("OR IGNORE"), rows)
+    after = await _result_counts(db, ids)
+
+    now = _now()
+    results: List[MonitorCheckResult] = []
+    for group in groups:
+        for monitor in group.monitors:
+            if not group.error:
+                monitor.last_checked_at = now
+                monitor.next_check_at = next_check_time(monitor.check_interval_hours, now)
+                monitor.known_result_count = group.total
+            results.append(MonitorCheckResult(
+                monitor_id=monitor.id,
+                name=monitor.name,
+                new_results=after.get(monitor.id, 0) - before.get(monitor.id, 0),
+                result_count=monitor.known_result_count,
+                shared_with=len(group.monitors) - 1,
+                requests=group.requests,
+                elapsed_ms=group.elapsed_ms,
+                truncated=group.truncated and monitor.last_checked_at is not None,
+                matched=group.matched,
+                error=group.error,
+            ))
+    await db.commit()
+    return MonitorCheckAllResponse(
+        checked=len(results),
+        searches=len(groups),
+        requests=sum(g.requests for g in groups),
+        new_results=sum(r.new_results for r in results),
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        monitors=results,
+    )
+
+
+async def check_monitor(db: AsyncSession, monitor: MonitoredSearch) -> int:
+    """Check one monitored search for new results and schedule the next check.
+
+    Returns the number of new results; raises if the search failed.
+    """
+    result = (await check_monitors(db, [monitor])).monitors[0]
+    if result.error:
+        raise RuntimeError(result.error)
+    return result.new_results
+
+
+def _short_author_id(openalex_id: str) -> str:
+    return openalex_id.rstrip("/").rsplit("/", 1)[-1]
+
+
+def _baseline_date(author: TrackedAuthor) -> Optional[str]:
+    """Works published after this date are new. Bare years (older rows) mean the end of that year."""
+    date = author.last_known_work_date
+    if date and len(date) == 4:
+        return date + "-12-31"
+    return date
+
+
+class _AuthorBatch:
+    """One OR-filtered works query for up to `_AUTHOR_BATCH` tracked authors."""
+
+    def __init__(self, authors: List[TrackedAuthor]):
+        self.authors = authors
+        self.new_works: Dict[int, List[Dict]] = {a.id: [] for a in authors}
+        self.baselines: Dict[int, str] = {}
+        # Set when the page cap stopped the fetch: works after this date were not all seen
+        self.fetched_through: Optional[str] = None
+        self.requests = 0
+        self.error: Optional[str] = None
+
+    async def fetch(self):
+        by_short_id = {_short_author_id(a.openalex_id): a for a in self.authors}
+        # Authors without a known latest work (tracked before dates were recorded)
+        # first need a baseline; only their newest work is fetched
+        for author in self.authors:
+            if _baseline_date(author) is None:
+                self.requests += 1
+                _, raw = await openalex_client.get_author_works(
+                    author.openalex_id, sort="publication_date:desc", per_page=1,
+                )
+                if raw and raw[0].get("publication_date"):
+                    self.baselines[author.id] = raw[0]["publication_date"]
+
+        checked = [a for a in self.authors if _baseline_date(a) is not None]
+        if not checked:
+            return
+        since = min(_baseline_date(a) for a in checked)
+        cursor: Optional[str] = "*"
+        pages = 0
+        last_date: Optional[str] = None
+        # Oldest first, so a fetch cut short by the page cap leaves only the newest works for the next check
+        while cursor and pages < _MAX_AUTHOR_PAGES:
+            resp, raw_works = await openalex_client.get_works_by_authors(
+                [_short_author_id(a.openalex_id) for a in checked], from_publication_date=since, cursor=cursor,
+                sort="publication_date:asc",
+            )
+            self.requests += 1
+            pages += 1
+            await openalex_client.cache_works(raw_works)
+            for work in raw_works:
+                date = work.get("publication_date")
+                if not date:
+                    continue
+                # Split the shared results back per author
+                for authorship in work.get("authorships") or []:
+                    author = by_short_id.get(_short_author_id((authorship.get("author") or {}).get("id") or ""))
+                    if author is not None and date > (_baseline_date(author) or date):
+                        self.new_works[author.id].append(work)
+                last_date = date
+            cursor = resp.meta.next_cursor if raw_works else None
+        if cursor and last_date:
+            # Other works of the last fetched day may be on the next page; resume the day before
+            self.fetched_through = (date_type.fromisoformat(last_date[:10]) - timedelta(days=1)).isoformat()
+
+    async def run(self, semaphore: asyncio.Semaphore):
+        try:
+            async with semaphore:
+                await self.fetch()
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+
+
+async def _work_counts(db: AsyncSession, author_ids: List[int]) -> Dict[int, int]:
+    result = await db.execute(
+        select(TrackedAuthorWork.author_id, func.count())
+        .where(TrackedAuthorWork.author_id.in_(author_ids))
+        .group_by(TrackedAuthorWork.author_id)
+    )
+    return dict(result.all())
+
+
+async def check_authors(
+    db: AsyncSession, authors: List[TrackedAuthor], concurrency: Optional[int] = None,
+) -> AuthorCheckAllResponse:
+    """Look for works published since each tracked author's last known work.
+
+    Authors are checked 50 at a time with one OR-filtered, date-filtered
+    query per batch (sorted by last known date so each batch's window stays
+    tight), and the results are split back per author. New works are stored
+    as unread `TrackedAuthorWork` rows with one INSERT OR IGNORE, and all
+    authors are updated in one transaction. Authors in a failed batch keep
+    their state and report the error.
+    """
+    started = time.perf_counter()
+    ordered = sorted(authors, key=lambda a: _baseline_date(a) or "")
+    batches = [_AuthorBatch(ordered[i:i + _AUTHOR_BATCH]) for i in range(0, len(ordered), _AUTHOR_BATCH)]
+    semaphore = asyncio.Semaphore(max(concurrency or settings.discovery_concurrency, 1))
+    await asyncio.gather(*[b.run(semaphore) for b in batches])
+
+    rows: List[Dict] = []
+    for batch in batches:
+        if batch.error:
+            continue
+        for author_id, works in batch.new_works.items():
+            rows.extend(
+                {
+                    "author_id": author_id,
+                    "paper_openalex_id": w["id"],
+                    "paper_title": w.get("title"),
+                    "publication_date": w.get("publication_date"),
+                }
+                for w in works if w.get("id")
+            )
+
+    # New works must be in the paper cache before mirrors and unread lists point at them
+    await openalex_client.writer.sync()
+    ids = [a.id for a in authors]
+    before = await _work_counts(db, ids)
+    if rows:
+        await db.execute(sqlite_insert(TrackedAuthorWork).prefix_with("OR IGNORE"), rows)
+        # Keep mirrored bibliographies current
+        for batch in batches:
+            for author in batch.authors:
+                if author.works_synced_at is not None and batch.new_works[author.id]:
+                    await add_author_papers(db, author.id, [w["id"] for w in batch.new_works[author.id]])
+    after = await _work_counts(db, ids)
+
+    now = _now()
+    results: List[AuthorCheckResult] = []
+    for batch in batches:
+        for author in batch.authors:
+            new_count = after.get(author.id, 0) - before.get(author.id, 0)
+            if not batch.error:
+                dates = [w["publication_date"] for w in batch.new_works[author.id]]
+                if batch.fetched_through:
+                    # Do not move past works the capped fetch did not reach
+                    dates = [d for d in dates if d <= batch.fetched_through] + [batch.fetched_through]
+                if author.id in batch.baselines:
+                    dates.append(batch.baselines[author.id])
+                if dates:
+                    author.last_known_work_date = max(dates + [_baseline_date(author) or ""])
+                author.new_works_count = (author.new_works_count or 0) + new_count
+                author.last_checked_at = now
+                author.next_check_at = next_check_time(settings.author_check_interval_hours, now)
+            results.append(AuthorCheckResult(
+                author_id=author.id,
+                display_name=author.display_name,
+                new_works=new_count,
+                last_known_work_date=author.last_known_work_date,
+                truncated=batch.fetched_through is not None,
+                error=batch.error,
+            ))
+    await db.commit()
+    return AuthorCheckAllResponse(
+        checked=len(results),
+        batches=len(batches),
+        requests=sum(b.requests for b in batches),
+        new_works=sum(r.new_works for r in results),
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        authors=results,
+    )
+
+
+def _interval_hours(row) -> int:
+    if isinstance(row, MonitoredSearch):
+        return row.check_interval_hours or 24
+    return settings.author_check_interval_hours
+
+
+class MonitorScheduler:
+    """Runs due monitor and tracked-author checks in the background.
+
+    An APScheduler job polls every `scheduler_poll_minutes` for rows whose
+    persisted `next_check_at` has passed (rows never scheduled are due one
+    interval after their last check) and checks them in bulk (see
+    `check_monitors` and `check_authors`), with at most
+    `scheduler_concurrency` OpenAlex searches in flight. Because the schedule
+    lives in the rows, it survives restarts, and checks missed while the app
+    was closed run on the first poll. Failed checks stay due and are retried
+    on the next poll. Each poll also mirrors the bibliographies of a few
+    tracked authors that have none yet (see `author_works`).
+    """
+
+    def __init__(self):
+        self._scheduler: Optional[AsyncIOScheduler] = None
+        self._poll: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._scheduler is not None or not settings.scheduler_enabled:
+            return
+        self._scheduler = AsyncIOScheduler(timezone=timezone.utc)
+        self._scheduler.add_job(
+            self.run_due,
+            "interval",
+            minutes=settings.scheduler_poll_minutes,
+            jitter=30,
+            max_instances=1,
+            coalesce=True,
+            # First poll shortly after startup, once interactive startup traffic has settled
+            next_run_time=datetime.now(timezone.utc) + timedelta(seconds=30),
+        )
+        self._scheduler.start()
+
+    async def stop(self):
+        if self._scheduler is None:
+            return
+        self._scheduler.shutdown(wait=False)
+        self._scheduler = None
+        if self._poll is not None and not self._poll.done():
+            self._poll.cancel()
+            try:
+                await self._poll
+            except asyncio.CancelledError:
+                pass
+        self._poll = None
+
+    async def run_due(self):
+        """Check every due monitor and tracked author."""
+        self._poll = asyncio.current_task()
+        # Own write scope, so the checks do not wait on request writes (or vice versa)
+        openalex_client.writer.open_scope()
+        now = _now()
+        async with async_session() as db:
+            monitors = await self._due(db, MonitoredSearch, now)
+            if monitors:
+                await check_monitors(db, monitors, concurrency=settings.scheduler_concurrency)
+        async with async_session() as db:
+            authors = await self._due(db, TrackedAuthor, now)
+            if authors:
+                await check_authors(db, authors, concurrency=settings.scheduler_concurrency)
+        await self._sync_bibliographies()
+
+    @staticmethod
+    async def _sync_bibliographies():
+        """Mirror the works of a few tracked authors that have no local bibliography yet.
+
+        Authors whose last attempt failed go to the back of the queue, so a
+        few failing ones cannot hold up the rest.
+        """
+        async with async_session() as db:
+            result = await db.execute(
+                select(TrackedAuthor.id)
+                .where(TrackedAuthor.works_synced_at.is_(None))
+                # NULLs (never failed) sort first
+                .order_by(TrackedAuthor.works_sync_failed_at, TrackedAuthor.id)
+                .limit(_SYNCS_PER_POLL)
+            )
+            for author_id in result.scalars().all():
+                try:
+                    # Loaded per author: a rollback after a failed sync expires every loaded row
+                    await sync_author_works(db, await db.get(TrackedAuthor, author_id))
+                except Exception:
+                    await db.rollback()
+                    await db.execute(
+                        update(TrackedAuthor).where(TrackedAuthor.id == author_id).values(works_sync_failed_at=_now())
+                    )
+                    await db.commit()
+
+    @staticmethod
+    async def _due(db: AsyncSession, model, now: datetime) -> list:
+        result = await db.execute(
+            select(model).where(or_(model.next_check_at.is_(None), model.next_check_at <= now))
+        )
+        due = []
+        for row in result.scalars():
+            if row.next_check_at is None and row.last_checked_at is not None:
+                # Never scheduled (checked before the scheduler existed): due one interval later
+                row.next_check_at = row.last_checked_at + timedelta(hours=_interval_hours(row))
+            if row.next_check_at is None or row.next_check_at <= now:
+                due.append(row)
+        await db.commit()
+        return due
+
+
+monitor_scheduler = MonitorScheduler()
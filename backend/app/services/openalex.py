@@ -1,17 +1,28 @@
 import asyncio
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import httpx
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.config import settings
+from app.database import async_session
 from app.models.paper import Paper
 from app.schemas.paper import AuthorShip, PaperDetail, PaperSummary, SearchMeta, SearchResponse
+from app.services.cache_writer import CacheWriter
+from app.services.similarity_index import similarity_index
 
 
 class OpenAlexClient:
     BASE_URL = "https://api.openalex.org"
+    # Paper columns overwritten when a cached work is fetched again
+    CACHED_COLUMNS = [
+        "doi", "title", "publication_year", "publication_date",
+        "cited_by_count", "type", "abstract_inverted_index",
+        "authorships_json", "primary_location_json", "open_access_json",
+        "topics_json", "referenced_work_ids", "fetched_at",
+    ]
     DEFAULT_SELECT = [
         "id", "doi", "title", "publication_year", "publication_date",
         "cited_by_count", "authorships", "primary_location", "open_access",
@@ -27,6 +38,13 @@ class OpenAlexClient:
             headers=headers,
             timeout=30.0,
         )
+        self._refresh_listeners: List[Callable[[List[str]], None]] = []
+        # Cache writes go through one background writer instead of each request's session
+        self.writer = CacheWriter(self._upsert_works)
+
+    def add_refresh_listener(self, listener: Callable[[List[str]], None]):
+        """Register a callback invoked with the IDs of cached papers that were refreshed."""
+        self._refresh_listeners.append(listener)
 
     async def close(self):
         await self.client.aclose()
@@ -84,11 +102,11 @@ class OpenAlexClient:
             referenced_work_ids=ref_works,
         )
 
-    def _work_to_db_paper(self, work: Dict) -> Paper:
-        return Paper(
+    def _work_to_row(self, work: Dict) -> Dict:
+        return dict(
             openalex_id=work.get("id", ""),
             doi=work.get("doi"),
-            title=work.get("title", "Untitled"),
+            title=work.get("title") or "Untitled",
             publication_year=work.get("publication_year"),
             publication_date=work.get("publication_date"),
             cited_by_count=work.get("cited_by_count", 0),
@@ -111,15 +129,23 @@ class OpenAlexClient:
         sort: str = "relevance_score:desc",
         page: int = 1,
         per_page: int = 25,
+        from_publication_date: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> Tuple[SearchResponse, List[Dict]]:
-        """Search OpenAlex works. Returns (parsed response, raw work dicts for caching)."""
+        """Search OpenAlex works. Returns (parsed response, raw work dicts for caching).
+
+        Pass `cursor="*"` (then `meta.next_cursor`) to page past the 10,000-result page limit.
+        """
         params: Dict = {
             "search": query,
             "sort": sort,
-            "page": page,
             "per_page": per_page,
             "select": ",".join(self.DEFAULT_SELECT),
         }
+        if cursor:
+            params["cursor"] = cursor
+        else:
+            params["page"] = page
 
         filters = []
         if year_min:
@@ -128,6 +154,8 @@ class OpenAlexClient:
             filters.append("publication_year:<{}".format(year_max + 1))
         if work_type:
             filters.append("type:{}".format(work_type))
+        if from_publication_date:
+            filters.append("from_publication_date:{}".format(from_publication_date))
         if filters:
             params["filter"] = ",".join(filters)
 
@@ -141,8 +169,9 @@ class OpenAlexClient:
         parsed = SearchResponse(
             meta=SearchMeta(
                 count=meta.get("count", 0),
-                page=meta.get("page", page),
+                page=meta.get("page") or page,
                 per_page=meta.get("per_page", per_page),
+                next_cursor=meta.get("next_cursor"),
             ),
             results=[self._parse_work(w) for w in results],
         )
@@ -180,6 +209,28 @@ class OpenAlexClient:
         )
         return parsed, results
 
+    async def get_works_citing(
+        self, openalex_ids: List[str], per_page: int = 200
+    ) -> Tuple[SearchResponse, List[Dict]]:
+        """Get works citing any of the given papers (one OR-filtered request, most cited first)."""
+        params = {
+            "filter": "cites:{}".format("|".join(openalex_ids)),
+            "sort": "cited_by_count:desc",
+            "per_page": per_page,
+            "select": ",".join(self.DEFAULT_SELECT),
+        }
+        resp = await self.client.get("/works", params=params)
+        resp.raise_for_status()
+        data = resp.json()
+        meta = data.get("meta", {})
+        results = data.get("results", [])
+
+        parsed = SearchResponse(
+            meta=SearchMeta(count=meta.get("count", 0), page=1, per_page=per_page),
+            results=[self._parse_work(w) for w in results],
+        )
+        return parsed, results
+
     async def batch_get_works(self, openalex_ids: List[str]) -> Tuple[List[PaperSummary], List[Dict]]:
         """Fetch multiple works by ID in batches of 50 using OR filter."""
         all_parsed: List[PaperSummary] = []
@@ -219,12 +270,38 @@ class OpenAlexClient:
         resp.raise_for_status()
         return resp.json()
 
+    async def get_author(self, author_id: str) -> Dict:
+        """Get a single author by OpenAlex ID."""
+        resp = await self.client.get("/authors/{}".format(author_id), params={
+            "select": "id,display_name,works_count,cited_by_count,last_known_institutions",
+        })
+        resp.raise_for_status()
+        return resp.json()
+
     async def get_author_works(
-        self, author_id: str, sort: str = "publication_year:desc", page: int = 1, per_page: int = 25
+        self,
+        author_id: str,
+        sort: str = "publication_year:desc",
+        page: int = 1,
+        per_page: int = 25,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        work_type: Optional[str] = None,
+        title_search: Optional[str] = None,
     ) -> Tuple[SearchResponse, List[Dict]]:
-        """Get works by a specific author."""
+        """Get works by a specific author, optionally filtered by year, type and title words."""
+        filters = ["authorships.author.id:{}".format(author_id)]
+        if year_min:
+            filters.append("publication_year:>{}".format(year_min - 1))
+        if year_max:
+            filters.append("publication_year:<{}".format(year_max + 1))
+        if work_type:
+            filters.append("type:{}".format(work_type))
+        if title_search and title_search.strip():
+            # Commas separate filters
+            filters.append("title.search:{}".format(title_search.replace(",", " ").strip()))
         params = {
-            "filter": "authorships.author.id:{}".format(author_id),
+            "filter": ",".join(filters),
             "sort": sort,
             "page": page,
             "per_page": per_page,
@@ -242,25 +319,68 @@ class OpenAlexClient:
         )
         return parsed, results
 
-    async def cache_works(self, raw_works: List[Dict], db: AsyncSession):
-        """Upsert raw work dicts into the local paper cache."""
-        for work in raw_works:
-            oa_id = work.get("id", "")
-            if not oa_id:
-                continue
-            existing = await db.get(Paper, oa_id)
-            paper = self._work_to_db_paper(work)
-            if existing:
-                for attr in [
-                    "doi", "title", "publication_year", "publication_date",
-                    "cited_by_count", "type", "abstract_inverted_index",
-                    "authorships_json", "primary_location_json", "open_access_json",
-                    "topics_json", "referenced_work_ids", "fetched_at",
-                ]:
-                    setattr(existing, attr, getattr(paper, attr))
-            else:
-                db.add(paper)
-        await db.commit()
+    async def get_works_by_authors(
+        self,
+        author_ids: List[str],
+        from_publication_date: Optional[str] = None,
+        cursor: str = "*",
+        per_page: int = 200,
+        sort: str = "publication_date:desc",
+    ) -> Tuple[SearchResponse, List[Dict]]:
+        """Get works by any of the given authors (one OR-filtered request, newest first by default)."""
+        filters = ["authorships.author.id:{}".format("|".join(author_ids))]
+        if from_publication_date:
+            filters.append("from_publication_date:{}".format(from_publication_date))
+        params = {
+            "filter": ",".join(filters),
+            "sort": sort,
+            "cursor": cursor,
+            "per_page": per_page,
+            "select": ",".join(self.DEFAULT_SELECT),
+        }
+        resp = await self.client.get("/works", params=params)
+        resp.raise_for_status()
+        data = resp.json()
+        meta = data.get("meta", {})
+        results = data.get("results", [])
+
+        parsed = SearchResponse(
+            meta=SearchMeta(
+                count=meta.get("count", 0), page=1, per_page=per_page, next_cursor=meta.get("next_cursor"),
+            ),
+            results=[self._parse_work(w) for w in results],
+        )
+        return parsed, results
+
+    async def cache_works(self, raw_works: List[Dict]):
+        """Queue raw work dicts for upserting into the local paper cache (write-behind)."""
+        await self.writer.enqueue(raw_works)
+
+    async def _upsert_works(self, raw_works: List[Dict]):
+        """Upsert a batch of raw works and their similarity index entries in one transaction,
+        then notify refresh listeners."""
+        rows = [self._work_to_row(w) for w in raw_works if w.get("id")]
+        if not rows:
+            return
+        ids = [r["openalex_id"] for r in rows]
+        existing = set()
+        async with async_session() as db:
+            for i in range(0, len(ids), 500):
+                result = await db.execute(select(Paper.openalex_id).where(Paper.openalex_id.in_(ids[i:i + 500])))
+                existing.update(result.scalars())
+            stmt = sqlite_insert(Paper)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Paper.openalex_id],
+                set_={col: stmt.excluded[col] for col in self.CACHED_COLUMNS},
+            )
+            await db.execute(stmt, rows)
+            await similarity_index.index_rows(db, rows)
+            await db.commit()
+
+        refreshed = [i for i in ids if i in existing]
+        if refreshed:
+            for listener in self._refresh_listeners:
+                listener(refreshed)
 
 
 # Singleton client instance
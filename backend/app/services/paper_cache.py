@@ -0,0 +1,145 @@
+"""Reads from the local paper cache, falling back to OpenAlex for missing or stale papers."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import JSON, Integer, String, bindparam, select, text
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.discovery import DiscoveryCacheEntry
+from app.models.paper import Paper
+from app.schemas.paper import AuthorShip, PaperSummary
+from app.services.graph_codec import ID_PREFIX
+from app.services.openalex import openalex_client
+
+_SQL_CHUNK = 500  # stay below SQLite's bound-parameter limit
+SEED_CITERS_KIND = "seed_citers"  # discovery_cache kind of stored top-citer samples
+
+# Cached papers whose reference lists contain any of :ids
+_LOCAL_CITERS = text(
+    "SELECT p.openalex_id, p.title, p.publication_year, p.cited_by_count, "
+    "p.authorships_json, p.referenced_work_ids FROM papers p "
+    "WHERE EXISTS (SELECT 1 FROM json_each(p.referenced_work_ids) j WHERE j.value IN :ids)"
+).bindparams(bindparam("ids", expanding=True)).columns(
+    openalex_id=String, title=String, publication_year=Integer, cited_by_count=Integer,
+    authorships_json=JSON, referenced_work_ids=JSON,
+)
+
+
+def normalize_id(openalex_id: str) -> str:
+    """Accept bare work IDs ("W123") as well as full OpenAlex URLs."""
+    openalex_id = openalex_id.strip()
+    if openalex_id[:1] in ("W", "w") and openalex_id[1:].isdigit():
+        return ID_PREFIX + "W" + openalex_id[1:]
+    return openalex_id
+
+
+def staleness_cutoff() -> datetime:
+    """Cached rows fetched before this (naive UTC, as stored) are considered stale."""
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=settings.cache_staleness_days)
+
+
+def authorships_to_authors(authorships: Optional[list]) -> List[AuthorShip]:
+    """Authors from a cached OpenAlex authorships list, first institution only."""
+    authors = []
+    for a in authorships or []:
+        author = a.get("author", {})
+        institutions = a.get("institutions", [])
+        authors.append(AuthorShip(
+            author_id=author.get("id"),
+            author_name=author.get("display_name", ""),
+            institution=institutions[0].get("display_name") if institutions else None,
+        ))
+    return authors
+
+
+def paper_to_summary(paper: Paper) -> PaperSummary:
+    authors = authorships_to_authors(paper.authorships_json)
+    oa = paper.open_access_json or {}
+    loc = paper.primary_location_json or {}
+    source = loc.get("source") or {}
+    return PaperSummary(
+        openalex_id=paper.openalex_id,
+        doi=paper.doi,
+        title=paper.title,
+        publication_year=paper.publication_year,
+        cited_by_count=paper.cited_by_count,
+        authors=authors,
+        type=paper.type,
+        is_open_access=oa.get("is_oa", False),
+        source_name=source.get("display_name"),
+    )
+
+
+async def cached_summaries(
+    openalex_ids: List[str], db: AsyncSession, fresh_only: bool = True,
+) -> Dict[str, PaperSummary]:
+    """Summaries of the given IDs found in the cache (only fresh rows unless `fresh_only` is off)."""
+    await openalex_client.writer.sync()
+    summaries: Dict[str, PaperSummary] = {}
+    cutoff = staleness_cutoff()
+    for i in range(0, len(openalex_ids), _SQL_CHUNK):
+        stmt = select(Paper).where(Paper.openalex_id.in_(openalex_ids[i:i + _SQL_CHUNK]))
+        if fresh_only:
+            stmt = stmt.where(Paper.fetched_at >= cutoff)
+        for paper in (await db.execute(stmt)).scalars():
+            summaries[paper.openalex_id] = paper_to_summary(paper)
+    return summaries
+
+
+async def get_paper_summaries(openalex_ids: List[str], db: AsyncSession) -> Dict[str, PaperSummary]:
+    """Summaries for the given IDs: fresh cached rows first, one batched fetch for the rest."""
+    summaries = await cached_summaries(openalex_ids, db)
+    missing = [i for i in openalex_ids if i not in summaries]
+    if missing:
+        parsed, raw_works = await openalex_client.batch_get_works(missing)
+        await openalex_client.cache_works(raw_works)
+        for paper in parsed:
+            summaries[paper.openalex_id] = paper
+    return summaries
+
+
+async def local_citing_rows(db: AsyncSession, openalex_ids: List[str]) -> List[Row]:
+    """Cached papers citing any of the given IDs (openalex_id, title, publication_year,
+    cited_by_count, authorships_json and referenced_work_ids)."""
+    rows: List[Row] = []
+    for i in range(0, len(openalex_ids), _SQL_CHUNK):
+        rows.extend(await db.execute(_LOCAL_CITERS, {"ids": openalex_ids[i:i + _SQL_CHUNK]}))
+    return rows
+
+
+async def cached_references(db: AsyncSession, openalex_ids: List[str]) -> Dict[str, List[str]]:
+    """Reference lists of the given papers from fresh cache rows."""
+    await openalex_client.writer.sync()
+    refs: Dict[str, List[str]] = {}
+    cutoff = staleness_cutoff()
+    for i in range(0, len(openalex_ids), _SQL_CHUNK):
+        result = await db.execute(
+            select(Paper.openalex_id, Paper.referenced_work_ids).where(
+                Paper.openalex_id.in_(openalex_ids[i:i + _SQL_CHUNK]),
+                Paper.referenced_work_ids.isnot(None),
+                Paper.fetched_at >= cutoff,
+            )
+        )
+        refs.update(result.all())
+    return refs
+
+
+async def cached_citers(db: AsyncSession, openalex_ids: List[str], min_sample: int = 1) -> Dict[str, List[str]]:
+    """Citer IDs (most cited first) from unexpired top-citer samples at least `min_sample` deep."""
+    citers: Dict[str, List[str]] = {}
+    cutoff = staleness_cutoff()
+    for i in range(0, len(openalex_ids), _SQL_CHUNK):
+        result = await db.execute(
+            select(DiscoveryCacheEntry.openalex_id, DiscoveryCacheEntry.works).where(
+                DiscoveryCacheEntry.kind == SEED_CITERS_KIND,
+                DiscoveryCacheEntry.openalex_id.in_(openalex_ids[i:i + _SQL_CHUNK]),
+                DiscoveryCacheEntry.sample_size >= min_sample,
+                DiscoveryCacheEntry.fetched_at >= cutoff,
+            )
+        )
+        for oa_id, works in result:
+            citers[oa_id] = list(works)
+    return citers
@@ -0,0 +1,284 @@
+"""Local "more like this" and near-duplicate index over cached papers.
+
+Each paper's title and abstract are reduced to a set of content words and
+summarised by a MinHash signature; the fraction of equal signature values
+estimates the Jaccard similarity of two word sets. Signatures are split into
+LSH bands, and papers sharing a band bucket become candidates, so a lookup
+reads a few index rows instead of comparing against the whole cache. The
+index is updated in the same transaction as the paper cache upsert.
+"""
+
+import asyncio
+import re
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.models.paper import Paper
+from app.models.similarity import PaperBucket, PaperSignature
+
+NUM_PERM = 64
+# Candidate threshold about (1/BANDS)^(1/ROWS) = 0.5: pairs at the 0.8 duplicate cutoff
+# share a bucket with probability 0.9998, pairs below 0.3 rarely do
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DUPLICATE_THRESHOLD = 0.8
+_OLD_BUCKETS = "paper_lsh_buckets"  # bucket table of the previous band layout
+
+_rng = np.random.default_rng(20240611)
+_A = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)  # odd multipliers
+_B = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+# Each band's values are folded into one uint64, starting from a per-band salt that keeps bands apart
+_BAND_SALT = _rng.integers(0, 2 ** 63, BANDS, dtype=np.uint64)
+_FOLD = np.uint64(0x100000001B3)  # 64-bit FNV prime
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("""
+a about above after again all also an and any are as at be been before being between both but by
+can could did do does doing during each for from further had has have having here how i if in into
+is it its itself more most no nor not of on once only or other our out over own same should so some
+such than that the their them then there these they this those through to too under until up very
+via was we were what when where which while who whom why will with within without would you your
+""".split())
+_SQL_CHUNK = 500
+
+
+def abstract_text(inverted_index: Optional[Dict[str, List[int]]]) -> str:
+    """Rebuild an abstract from OpenAlex's word -> positions index."""
+    if not inverted_index:
+        return ""
+    words: Dict[int, str] = {}
+    for word, positions in inverted_index.items():
+        for pos in positions:
+            words[pos] = word
+    return " ".join(words[pos] for pos in sorted(words))
+
+
+def _tokens(title: Optional[str], abstract_index: Optional[Dict]) -> Set[str]:
+    text = "{} {}".format(title or "", abstract_text(abstract_index)).lower()
+    return {w for w in _WORD.findall(text) if len(w) > 1 and w not in _STOPWORDS}
+
+
+def signature(tokens: Set[str]) -> Optional[np.ndarray]:
+    """MinHash signature (NUM_PERM uint32 values), or None for an empty token set."""
+    hashes = np.fromiter((zlib.crc32(t.encode()) for t in tokens), dtype=np.uint64, count=len(tokens))
+    if not hashes.size:
+        return None
+    # Multiply-shift hashing: wrapping 64-bit arithmetic, top 32 bits kept
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+def _buckets(sig: np.ndarray) -> List[int]:
+    """One bucket key per band (signed 64-bit, as SQLite stores integers)."""
+    bands = sig.reshape(BANDS, ROWS).astype(np.uint64)
+    keys = _BAND_SALT.copy()
+    for row in range(ROWS):
+        keys = (keys ^ bands[:, row]) * _FOLD  # wrapping multiply
+    return keys.view(np.int64).tolist()
+
+
+def _similarity(sig: np.ndarray, others: np.ndarray) -> np.ndarray:
+    return (others == sig[None, :]).mean(axis=1)
+
+
+class SimilarityIndex:
+    def __init__(self):
+        self._backfill: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Index papers cached before the index existed, in the background."""
+        if self._backfill is None or self._backfill.done():
+            self._backfill = asyncio.create_task(self.backfill())
+
+    async def stop(self):
+        if self._backfill is not None and not self._backfill.done():
+            self._backfill.cancel()
+            try:
+                await self._backfill
+            except asyncio.CancelledError:
+                pass
+        self._backfill = None
+
+    async def index_rows(self, db: AsyncSession, rows: List[Dict]):
+        """(Re)index paper rows ({openalex_id, title, abstract_inverted_index}) in the caller's transaction.
+
+        Papers whose signature did not change are skipped; papers without
+        indexable words get an empty signature and no buckets.
+        """
+        if not rows:
+            return
+        old = await self._signatures(db, [row["openalex_id"] for row in rows], keep_empty=True)
+        values: List[Dict] = []
+        stale: List[Tuple[int, str]] = []
+        buckets: List[Tuple[int, str]] = []
+        for row in rows:
+            oa_id = row["openalex_id"]
+            sig = signature(_tokens(row.get("title"), row.get("abstract_inverted_index")))
+            blob = b"" if sig is None else sig.tobytes()
+            previous = old.get(oa_id)
+            if previous is not None and previous.tobytes() == blob:
+                continue
+            values.append({"openalex_id": oa_id, "signature": blob})
+            if previous is not None and previous.size:
+                stale.extend((b, oa_id) for b in _buckets(previous))
+            if sig is not None:
+                buckets.extend((b, oa_id) for b in _buckets(sig))
+        if not values:
+            return
+
+        stmt = sqlite_insert(PaperSignature)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PaperSignature.openalex_id],
+            set_={"signature": stmt.excluded.signature, "indexed_at": func.now()},
+        )
+        await db.execute(stmt, values)
+        # BANDS rows per paper: plain executemany skips per-row statement compilation
+        conn = await db.connection()
+        if stale:
+            await conn.exec_driver_sql(
+                "DELETE FROM paper_lsh_bands WHERE bucket = ? AND openalex_id = ?", stale,
+            )
+        if buckets:
+            buckets.sort()  # in key order, inserts touch each B-tree page once
+            await conn.exec_driver_sql(
+                "INSERT OR IGNORE INTO paper_lsh_bands (bucket, openalex_id) VALUES (?, ?)", buckets,
+            )
+
+    async def backfill(self, batch_size: int = 500):
+        """Index cached papers that have no signature yet."""
+        await self._rebuild_old_buckets(batch_size)
+        while True:
+            async with async_session() as db:
+                result = await db.execute(
+                    select(Paper.openalex_id, Paper.title, Paper.abstract_inverted_index)
+                    .outerjoin(PaperSignature, PaperSignature.openalex_id == Paper.openalex_id)
+                    .where(PaperSignature.openalex_id.is_(None))
+                    .limit(batch_size)
+                )
+                rows = [dict(r._mapping) for r in result]
+                if not rows:
+                    return
+                await self.index_rows(db, rows)
+                await db.commit()
+            await asyncio.sleep(0)  # let requests run between batches
+
+    async def _rebuild_old_buckets(self, batch_size: int):
+        """Bucket the stored signatures for the current band layout, then drop the old layout's table."""
+        async with async_session() as db:
+            conn = await db.connection()
+            result = await conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (_OLD_BUCKETS,),
+            )
+            if result.first() is None:
+                return
+        last = ""
+        while True:
+            async with async_session() as db:
+                result = await db.execute(
+                    select(PaperSignature.openalex_id, PaperSignature.signature)
+                    .where(PaperSignature.openalex_id > last)
+                    .order_by(PaperSignature.openalex_id)
+                    .limit(batch_size)
+                )
+                rows = result.all()
+                if not rows:
+                    break
+                last = rows[-1][0]
+                buckets = sorted(
+                    (b, oa_id) for oa_id, blob in rows if blob
+                    for b in _buckets(np.frombuffer(blob, dtype=np.uint32))
+                )
+                if buckets:
+                    conn = await db.connection()
+                    await conn.exec_driver_sql(
+                        "INSERT OR IGNORE INTO paper_lsh_bands (bucket, openalex_id) VALUES (?, ?)", buckets,
+                    )
+                await db.commit()
+            await asyncio.sleep(0)
+        async with async_session() as db:
+            conn = await db.connection()
+            await conn.exec_driver_sql("DROP TABLE IF EXISTS {}".format(_OLD_BUCKETS))
+            await db.commit()
+
+    async def _signatures(
+        self, db: AsyncSession, ids: List[str], keep_empty: bool = False,
+    ) -> Dict[str, np.ndarray]:
+        sigs: Dict[str, np.ndarray] = {}
+        for i in range(0, len(ids), _SQL_CHUNK):
+            result = await db.execute(
+                select(PaperSignature.openalex_id, PaperSignature.signature)
+                .where(PaperSignature.openalex_id.in_(ids[i:i + _SQL_CHUNK]))
+            )
+            for oa_id, blob in result:
+                if blob or keep_empty:
+                    sigs[oa_id] = np.frombuffer(blob, dtype=np.uint32)
+        return sigs
+
+    @staticmethod
+    async def _signature_blob(db: AsyncSession, openalex_id: str) -> Optional[bytes]:
+        result = await db.execute(
+            select(PaperSignature.signature).where(PaperSignature.openalex_id == openalex_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def similar(
+        self, db: AsyncSession, openalex_id: str, limit: int = 20, min_similarity: float = 0.1,
+    ) -> Optional[List[Tuple[str, float]]]:
+        """Cached papers most similar to `openalex_id` as (id, estimated Jaccard), best first.
+
+        None if the paper is not in the local cache.
+        """
+        blob = await self._signature_blob(db, openalex_id)
+        if blob is None:
+            paper = await db.get(Paper, openalex_id)
+            if paper is None:
+                return None
+            await self.index_rows(db, [{
+                "openalex_id": paper.openalex_id,
+                "title": paper.title,
+                "abstract_inverted_index": paper.abstract_inverted_index,
+            }])
+            await db.commit()
+            blob = await self._signature_blob(db, openalex_id)
+        if not blob:
+            return []
+        sig = np.frombuffer(blob, dtype=np.uint32)
+
+        result = await db.execute(
+            select(PaperBucket.openalex_id).distinct()
+            .where(PaperBucket.bucket.in_(_buckets(sig)), PaperBucket.openalex_id != openalex_id)
+        )
+        sigs = await self._signatures(db, list(result.scalars()))
+        if not sigs:
+            return []
+        ids = list(sigs)
+        scores = _similarity(sig, np.stack([sigs[i] for i in ids]))
+        order = np.argsort(-scores, kind="stable")
+        return [
+            (ids[i], round(float(scores[i]), 4)) for i in order[:limit] if scores[i] >= min_similarity
+        ]
+
+    async def duplicates(
+        self,
+        db: AsyncSession,
+        openalex_ids: List[str],
+        among: Optional[Set[str]] = None,
+        threshold: float = DUPLICATE_THRESHOLD,
+    ) -> List[Tuple[str, str, float]]:
+        """Near-duplicate pairs (id, other, similarity) for the given papers, e.g. preprint
+        and published versions. `among` restricts the other side (default: whole cache).
+        """
+        pairs: Dict[Tuple[str, str], float] = {}
+        for oa_id in dict.fromkeys(openalex_ids):
+            for other, score in await self.similar(db, oa_id, limit=50, min_similarity=threshold) or []:
+                if (among is None or other in among) and (other, oa_id) not in pairs:
+                    pairs[(oa_id, other)] = score
+        return [(a, b, score) for (a, b), score in pairs.items()]
+
+
+similarity_index = SimilarityIndex()
@@ -140,7 +140,7 @@ async def resolve_zotero_items_via_openalex(
             try:
                 doi_url = doi if doi.startswith("http") else "https://doi.org/{}".format(doi)
                 detail, raw = await openalex_client.get_work(doi_url)
-                await openalex_client.cache_works([raw], db)
+                await openalex_client.cache_works([raw])
                 openalex_id = detail.openalex_id
             except Exception:
                 pass
@@ -150,7 +150,7 @@ async def resolve_zotero_items_via_openalex(
             try:
                 search_resp, raw_works = await openalex_client.search_works(title, per_page=3)
                 if raw_works:
-                    await openalex_client.cache_works(raw_works, db)
+                    await openalex_client.cache_works(raw_works)
                 # Check for title match
                 for r in search_resp.results:
                     if r.title and title.lower() in r.title.lower():
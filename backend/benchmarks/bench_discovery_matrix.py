@@ -0,0 +1,73 @@
+"""Co-citation ranking for 2,000 seeds over 100k cached reference lists:
+Counter/dict-of-sets counting (the previous implementation) vs. the sparse
+incidence-matrix engine.
+
+Run from the backend directory:  python -m benchmarks.bench_discovery_matrix
+"""
+
+import time
+from collections import Counter
+from typing import Dict, List, Set
+
+import numpy as np
+
+from app.services.citation_matrix import IncidenceMatrix, bibliographic_coupling, co_citation
+
+N_WORKS = 100_000
+N_CITED = 50_000
+REFS = 30
+N_SEEDS = 2_000
+
+
+def synthetic_works(seed: int = 0) -> Dict[str, List[str]]:
+    rng = np.random.default_rng(seed)
+    # Skewed popularity, as in real citation data
+    cited = (rng.power(0.4, size=(N_WORKS, REFS)) * N_CITED).astype(np.int64)
+    return {
+        "W{}".format(1_000_000 + i): ["W{}".format(c) for c in np.unique(row)]
+        for i, row in enumerate(cited)
+    }
+
+
+def counter_co_citation(works: Dict[str, List[str]], seeds: List[str], k: int):
+    seed_set = set(seeds)
+    candidate_seeds: Dict[str, Set[str]] = {}
+    candidate_count: Counter = Counter()
+    for refs in works.values():
+        cited_seeds = [r for r in refs if r in seed_set]
+        for seed_id in cited_seeds:
+            for ref_id in refs:
+                if ref_id not in seed_set:
+                    candidate_count[ref_id] += 1
+                    candidate_seeds.setdefault(ref_id, set()).add(seed_id)
+    ranked = sorted(
+        candidate_count.items(),
+        key=lambda x: (len(candidate_seeds.get(x[0], set())), x[1]),
+        reverse=True,
+    )
+    return ranked[:k]
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    out = fn()
+    print("{:<34} {:>8.2f} s".format(label, time.perf_counter() - start))
+    return out
+
+
+def main():
+    works = synthetic_works()
+    rng = np.random.default_rng(1)
+    seeds = ["W{}".format(c) for c in rng.choice(N_CITED // 4, size=N_SEEDS, replace=False)]
+
+    timed("Counter co-citation", lambda: counter_co_citation(works, seeds, 30))
+    matrix = timed("build incidence matrix", lambda: IncidenceMatrix(works.items()))
+    for measure in ("count", "salton", "jaccard", "association"):
+        timed("matrix co-citation ({})".format(measure), lambda: co_citation(matrix, seeds, measure, 30))
+
+    coupling_seeds = list(works)[:N_SEEDS]
+    timed("matrix coupling (salton)", lambda: bibliographic_coupling(matrix, coupling_seeds, "salton", 30))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Wall-clock time of the bibliographic-coupling fetch stage against a simulated
+OpenAlex with long-tailed latency: the previous serial batches of 10 against
+the bounded pipeline, with and without OR-grouped `cites:` filters and early
+stopping. Reports requests made and top-k overlap with the full ranking.
+
+Run from the backend directory:  python -m benchmarks.bench_discovery_pipeline
+"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from app.services.citation_matrix import IncidenceMatrix, bibliographic_coupling
+from app.services.discovery import DiscoveryProgress, _sample_reference_citers
+from app.services.openalex import openalex_client
+
+N_WORKS = 200_000
+N_CITED = 400_000
+REFS = 30
+N_SEEDS = 20
+SAMPLE = 100
+K = 30
+REMOTE_REFS = 50
+MEDIAN_LATENCY = 0.2  # seconds, lognormal with a long tail
+
+
+class FakeResponse:
+    def __init__(self, data: Dict):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self) -> Dict:
+        return self._data
+
+
+class SimulatedOpenAlex:
+    """Answers `cites:` filters from an in-memory citation network after a random delay."""
+
+    def __init__(self, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        cited = (rng.power(0.4, size=(N_WORKS, REFS)) * N_CITED).astype(np.int64)
+        self.refs = {}
+        self.citers: Dict[str, List[str]] = {}
+        for i, row in enumerate(cited):
+            wid = "W{}".format(1_000_000 + i)
+            self.refs[wid] = ["W{}".format(c) for c in np.unique(row)]
+            for ref in self.refs[wid]:
+                self.citers.setdefault(ref, []).append(wid)
+        self.rank = {wid: r for r, wid in enumerate(rng.permutation(list(self.refs)))}
+        self.rng = np.random.default_rng(seed + 1)
+        self.requests = 0
+
+    async def get(self, path: str, params: Dict) -> FakeResponse:
+        self.requests += 1
+        await asyncio.sleep(MEDIAN_LATENCY * float(self.rng.lognormal(0, 0.6)))
+        field, value = params["filter"].split(":", 1)
+        ids = value.split("|")
+        if field == "openalex":
+            return FakeResponse({"results": [{"id": i, "cited_by_count": len(self.citers.get(i, ()))} for i in ids]})
+        found = {wid for ref in ids for wid in self.citers.get(ref, ())}
+        top = sorted(found, key=self.rank.__getitem__)[:params["per_page"]]
+        return FakeResponse({"results": [{"id": w, "referenced_works": self.refs[w]} for w in top]})
+
+
+async def serial_batches(refs: List[str], works: Dict[str, List[str]]):
+    """The previous implementation: batches of 10, each waiting for its slowest request."""
+    async def find_citers_of_ref(ref_id: str):
+        resp = await openalex_client.client.get("/works", params={
+            "filter": "cites:{}".format(ref_id),
+            "per_page": SAMPLE,
+            "sort": "cited_by_count:desc",
+            "select": "id,referenced_works",
+        })
+        for work in resp.json().get("results", []):
+            works.setdefault(work["id"], work["referenced_works"])
+
+    for i in range(0, len(refs), 10):
+        await asyncio.gather(*[find_citers_of_ref(r) for r in refs[i:i + 10]])
+
+
+async def main():
+    sim = SimulatedOpenAlex()
+    openalex_client.client = sim
+    seeds = list(sim.refs)[:N_SEEDS]
+    seed_works = {s: sim.refs[s] for s in seeds}
+    counter = Counter(r for refs in seed_works.values() for r in refs)
+    refs = [r for r, _ in counter.most_common(REMOTE_REFS)]
+
+    def ranking(works):
+        # Sorted so equal samples give equal tie-breaking
+        ranked = bibliographic_coupling(IncidenceMatrix(sorted(works.items())), seeds, "salton", K)
+        return [cid for cid, _, _, _ in ranked]
+
+    async def run(label, fn, repeat=5):
+        times = []
+        for _ in range(repeat):
+            works = dict(seed_works)
+            sim.requests = 0
+            start = time.perf_counter()
+            await fn(works)
+            times.append(time.perf_counter() - start)
+        return label, float(np.median(times)), sim.requests, ranking(works)
+
+    def pipeline(grouped, early_stop):
+        async def fn(works):
+            counts = {}
+            if grouped:  # one light request for the citation counts used to pack filters
+                resp = await sim.get("/works", {"filter": "openalex:{}".format("|".join(refs))})
+                counts = {w["id"]: w["cited_by_count"] for w in resp.json()["results"]}
+            await _sample_reference_citers(
+                refs, counts, works, seeds, SAMPLE, "salton", K, DiscoveryProgress(), early_stop=early_stop,
+            )
+        return fn
+
+    rows = [
+        await run("serial batches of 10", lambda works: serial_batches(refs, works)),
+        await run("pipeline, 1 ref/request", pipeline(False, False)),
+        await run("pipeline, OR-grouped", pipeline(True, False)),
+        await run("pipeline, OR-grouped, early stop", pipeline(True, True)),
+    ]
+    full = set(rows[0][3])
+    for label, elapsed, requests, top in rows:
+        print("{:<34} {:>6.2f} s (median) {:>4} requests   top-{} overlap {:>3.0%}".format(
+            label, elapsed, requests, K, len(full & set(top)) / max(len(full), 1),
+        ))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+"""Timing benchmark for the /graph/analyze metrics at 1k, 10k and 100k edges.
+
+Run from the backend directory:  python -m benchmarks.bench_graph_analytics
+"""
+
+import time
+
+import numpy as np
+
+from app.services.graph_analytics import analyze_arrays
+
+
+def synthetic_citation_graph(n_edges: int, seed: int = 0):
+    """Random citation DAG (newer papers cite older ones, skewed toward early papers)."""
+    rng = np.random.default_rng(seed)
+    n_nodes = max(n_edges // 5, 10)
+    sources = rng.integers(1, n_nodes, size=n_edges)
+    targets = (sources * rng.power(0.6, size=n_edges)).astype(np.int64)
+    ids = ["https://openalex.org/W{}".format(i) for i in range(n_nodes)]
+    return ids, sources, targets
+
+
+def main():
+    print("{:>8} {:>8} {:>10} {:>12}".format("edges", "nodes", "seconds", "communities"))
+    for n_edges in (1_000, 10_000, 100_000):
+        ids, sources, targets = synthetic_citation_graph(n_edges)
+        start = time.perf_counter()
+        result = analyze_arrays(ids, sources, targets)
+        elapsed = time.perf_counter() - start
+        print("{:>8} {:>8} {:>10.3f} {:>12}".format(
+            result.edge_count, result.node_count, elapsed, result.community_count,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Build time and memory of a 20,000-node citation graph, with OpenAlex replaced
+by an in-process synthetic citation network (so only the builder is measured).
+
+Run from the backend directory:  python -m benchmarks.bench_graph_build
+
+The builder reads the local paper cache first, so the benchmark runs against a
+fresh, empty database in a temporary directory.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+# Before the app modules are imported, so the engine is created on the temporary database
+os.environ["LITHELPER_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="lithelper-bench-"), "bench.db")
+
+from app.database import init_db  # noqa: E402
+from app.schemas.paper import AuthorShip, PaperDetail, PaperSummary, SearchMeta, SearchResponse  # noqa: E402
+from app.services import citation_graph  # noqa: E402
+from app.services.citation_graph import CitationGraphBuilder  # noqa: E402
+
+N_PAPERS = 200_000
+FANOUT = 30
+
+
+class SyntheticOpenAlex:
+    def __init__(self, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        # Each paper cites FANOUT older papers, preferring well-cited ones
+        self.refs = {}
+        self.citers = {}
+        for i in range(1, N_PAPERS):
+            cited = np.unique((rng.power(0.3, FANOUT) * i).astype(np.int64))
+            self.refs[i] = cited.tolist()
+            for c in self.refs[i]:
+                self.citers.setdefault(c, []).append(i)
+
+    @staticmethod
+    def _id(i: int) -> str:
+        return "https://openalex.org/W{}".format(i)
+
+    @staticmethod
+    def _num(openalex_id: str) -> int:
+        return int(openalex_id.rsplit("W", 1)[1])
+
+    def _summary(self, i: int) -> PaperSummary:
+        return PaperSummary(
+            openalex_id=self._id(i),
+            title="Synthetic paper {}".format(i),
+            publication_year=1950 + i * 75 // N_PAPERS,
+            cited_by_count=len(self.citers.get(i, ())),
+            authors=[AuthorShip(author_name="Author {}".format(i))],
+        )
+
+    def add_refresh_listener(self, listener):
+        pass
+
+    async def get_work(self, openalex_id: str):
+        i = self._num(openalex_id)
+        s = self._summary(i)
+        detail = PaperDetail(**s.model_dump(), referenced_work_ids=[self._id(r) for r in self.refs.get(i, ())])
+        return detail, {}
+
+    async def get_work_citations(self, openalex_id: str, page: int = 1, per_page: int = 50):
+        citers = self.citers.get(self._num(openalex_id), [])
+        # OpenAlex sorts by cited_by_count:desc
+        top = sorted(citers, key=lambda c: -len(self.citers.get(c, ())))[:per_page]
+        meta = SearchMeta(count=len(citers), page=page, per_page=per_page)
+        return SearchResponse(meta=meta, results=[self._summary(c) for c in top]), []
+
+    def _work(self, i: int) -> dict:
+        return {
+            "id": self._id(i),
+            "title": "Synthetic paper {}".format(i),
+            "publication_year": 1950 + i * 75 // N_PAPERS,
+            "cited_by_count": len(self.citers.get(i, ())),
+            "authorships": [{"author": {"display_name": "Author {}".format(i)}}],
+            "referenced_works": [self._id(r) for r in self.refs.get(i, ())],
+        }
+
+    async def batch_get_works(self, openalex_ids):
+        nums = [self._num(i) for i in openalex_ids]
+        return [self._summary(i) for i in nums], [self._work(i) for i in nums]
+
+    async def cache_works(self, raw_works):
+        # Nothing is written, so every cold build starts from an empty cache
+        pass
+
+
+async def run(builder: CitationGraphBuilder, seeds, depth: int, max_nodes: int):
+    start = time.perf_counter()
+    graph = await builder.build_graph(seeds, depth=depth, max_nodes=max_nodes, direction="both")
+    return graph, time.perf_counter() - start
+
+
+async def bench(builder: CitationGraphBuilder, seeds):
+    await init_db()
+    tracemalloc.start()
+    graph, cold = await run(builder, seeds, 4, 20_000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    _, warm = await run(builder, seeds, 4, 20_000)
+    return graph, cold, peak, warm
+
+
+def main():
+    citation_graph.openalex_client = SyntheticOpenAlex()
+    builder = CitationGraphBuilder()
+    seeds = ["https://openalex.org/W{}".format(i) for i in (150_000, 120_000, 90_000)]
+
+    # One event loop for the whole run, as the database engine's connections are bound to it
+    graph, cold, peak, warm = asyncio.run(bench(builder, seeds))
+
+    print("nodes {:>6}  edges {:>7}".format(len(graph.nodes), len(graph.edges)))
+    print("cold build {:>7.2f} s  (peak traced memory {:.0f} MB)".format(cold, peak / 2**20))
+    print("memoized   {:>7.2f} s".format(warm))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Payload size and serialize time of GraphData encodings for a 1,000-node graph.
+
+Run from the backend directory:  python -m benchmarks.bench_graph_codec
+"""
+
+import json
+import time
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas.graph import GraphData, GraphEdge, GraphNode
+from app.services.graph_codec import encode_columnar, msgpack
+
+
+def synthetic_graph(n_nodes: int = 1_000, n_edges: int = 2_500, seed: int = 0) -> GraphData:
+    rng = np.random.default_rng(seed)
+    ids = ["https://openalex.org/W{}".format(2_000_000_000 + i * 7919) for i in range(n_nodes)]
+    nodes = [
+        GraphNode(
+            id=nid,
+            title="A study of citation dynamics in field {} and its consequences".format(i),
+            publication_year=int(1990 + i % 35),
+            cited_by_count=int(rng.integers(0, 5_000)),
+            authors=["Author {}".format(i), "Author {}".format(i + 1), "Author {}".format(i + 2)],
+            is_seed=i < 3,
+            depth=int(i % 3),
+        )
+        for i, nid in enumerate(ids)
+    ]
+    src = rng.integers(0, n_nodes, size=n_edges)
+    dst = rng.integers(0, n_nodes, size=n_edges)
+    edges = [GraphEdge(source=ids[s], target=ids[t]) for s, t in zip(src, dst)]
+    return GraphData(nodes=nodes, edges=edges, session_id="0" * 32)
+
+
+def timed(fn, repeat: int = 20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return out, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    graph = synthetic_graph()
+    encoders = [
+        # What FastAPI does for a response_model return value
+        ("GraphData default", lambda: json.dumps(jsonable_encoder(graph)).encode()),
+        ("GraphData JSON", lambda: graph.model_dump_json().encode()),
+        ("columnar JSON", lambda: json.dumps(
+            encode_columnar(graph), separators=(",", ":"), ensure_ascii=False).encode()),
+    ]
+    if msgpack is not None:
+        encoders.append(("columnar msgpack", lambda: msgpack.packb(encode_columnar(graph), use_bin_type=True)))
+
+    print("{:<18} {:>10} {:>10} {:>12}".format("encoding", "bytes", "encode ms", "decode ms"))
+    for name, encode in encoders:
+        body, encode_ms = timed(encode)
+        if "msgpack" in name:
+            _, decode_ms = timed(lambda: msgpack.unpackb(body, raw=False))
+        else:
+            _, decode_ms = timed(lambda: json.loads(body))
+        print("{:<18} {:>10} {:>10.2f} {:>12.2f}".format(name, len(body), encode_ms, decode_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Timing benchmark for the server-side force-directed layout at 500, 2k and 10k nodes.
+
+Run from the backend directory:  python -m benchmarks.bench_graph_layout
+
+Besides wall-clock time it reports the ratio of mean edge length to mean
+distance between random node pairs (lower means linked papers sit closer
+together than unrelated ones).
+"""
+
+import time
+
+import numpy as np
+
+from app.services.graph_layout import force_layout
+
+
+def synthetic_citation_graph(n_nodes: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n_edges = n_nodes * 2
+    sources = rng.integers(1, n_nodes, size=n_edges)
+    targets = (sources * rng.power(0.6, size=n_edges)).astype(np.int64)
+    return sources, targets
+
+
+def edge_ratio(pos: np.ndarray, sources: np.ndarray, targets: np.ndarray, seed: int = 1) -> float:
+    rng = np.random.default_rng(seed)
+    edge_len = np.linalg.norm(pos[sources] - pos[targets], axis=1).mean()
+    a = rng.integers(0, len(pos), size=5000)
+    b = rng.integers(0, len(pos), size=5000)
+    return float(edge_len / np.linalg.norm(pos[a] - pos[b], axis=1).mean())
+
+
+def main():
+    print("{:>8} {:>8} {:>10} {:>12}".format("nodes", "edges", "seconds", "edge ratio"))
+    for n_nodes in (500, 2_000, 10_000):
+        sources, targets = synthetic_citation_graph(n_nodes)
+        start = time.perf_counter()
+        pos = force_layout(n_nodes, sources, targets)
+        elapsed = time.perf_counter() - start
+        print("{:>8} {:>8} {:>10.3f} {:>12.3f}".format(
+            n_nodes, len(sources), elapsed, edge_ratio(pos, sources, targets),
+        ))
+
+    # Incremental: pin a 2k-node layout and place 50 new nodes around it
+    sources, targets = synthetic_citation_graph(2_050)
+    base = force_layout(2_000, *[a[(sources < 2_000) & (targets < 2_000)] for a in (sources, targets)])
+    initial = np.full((2_050, 2), np.nan)
+    initial[:2_000] = base
+    pinned = np.zeros(2_050, dtype=bool)
+    pinned[:2_000] = True
+    start = time.perf_counter()
+    pos = force_layout(2_050, sources, targets, initial=initial, pinned=pinned)
+    elapsed = time.perf_counter() - start
+    moved = float(np.abs(pos[:2_000] - base).max())
+    print("incremental +50 on 2000: {:.3f}s, max pinned displacement {:.3f}".format(elapsed, moved))
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,10 @@ export interface TrackedAuthorOut {
   cited_by_count: number;
   institution: string | null;
   last_known_work_date: string | null;
+  new_works_count: number;
+  last_checked_at: string | null;
+  next_check_at: string | null;
+  works_synced_at: string | null;
   created_at: string | null;
 }
 
@@ -31,6 +35,26 @@ export interface AuthorWorksResponse {
   total_count: number;
   has_new: boolean;
   new_works: PaperSummary[];
+  mirrored: boolean;
+}
+
+export interface AuthorCheckResult {
+  author_id: number;
+  display_name: string;
+  new_works: number;
+  last_known_work_date: string | null;
+  /** The page cap was hit; the remaining newer works are fetched by the next check. */
+  truncated: boolean;
+  error: string | null;
+}
+
+export interface AuthorCheckAllResponse {
+  checked: number;
+  batches: number;
+  requests: number;
+  new_works: number;
+  elapsed_ms: number;
+  authors: AuthorCheckResult[];
 }
 
 export async function searchAuthors(q: string): Promise<AuthorSearchResponse> {
@@ -38,8 +62,24 @@ export async function searchAuthors(q: string): Promise<AuthorSearchResponse> {
   return resp.data;
 }
 
-export async function getAuthorWorks(openalexId: string): Promise<AuthorWorksResponse> {
-  const resp = await api.get<AuthorWorksResponse>(`/authors/${encodeURIComponent(openalexId)}/works`);
+export interface AuthorWorksQuery {
+  page?: number;
+  per_page?: number;
+  sort?: 'publication_date:desc' | 'publication_date:asc' | 'cited_by_count:desc' | 'title';
+  /** Filters apply locally to mirrored bibliographies and via OpenAlex otherwise. */
+  year_min?: number;
+  year_max?: number;
+  type?: string;
+  q?: string;
+}
+
+export async function getAuthorWorks(
+  openalexId: string,
+  query: AuthorWorksQuery = {}
+): Promise<AuthorWorksResponse> {
+  const resp = await api.get<AuthorWorksResponse>(`/authors/${encodeURIComponent(openalexId)}/works`, {
+    params: query,
+  });
   return resp.data;
 }
 
@@ -59,6 +99,26 @@ export async function trackAuthor(author: {
   return resp.data;
 }
 
+/** Mark the works found by checks of a tracked author as seen. */
+export async function markTrackedAuthorRead(id: number): Promise<TrackedAuthorOut> {
+  const resp = await api.post<TrackedAuthorOut>(`/authors/tracked/${id}/mark-read`);
+  return resp.data;
+}
+
+/** Rebuild the local mirror of a tracked author's bibliography. */
+export async function syncTrackedAuthor(id: number): Promise<TrackedAuthorOut> {
+  const resp = await api.post<TrackedAuthorOut>(`/authors/tracked/${id}/sync`);
+  return resp.data;
+}
+
 export async function untrackAuthor(id: number): Promise<void> {
   await api.delete(`/authors/tracked/${id}`);
 }
+
+/** Check tracked authors for new works (50 authors per OpenAlex request). */
+export async function checkAllTrackedAuthors(dueOnly = false): Promise<AuthorCheckAllResponse> {
+  const resp = await api.post<AuthorCheckAllResponse>('/authors/tracked/check-all', null, {
+    params: { due_only: dueOnly },
+  });
+  return resp.data;
+}
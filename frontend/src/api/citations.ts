@@ -8,6 +8,8 @@ export interface GraphNode {
   authors: string[];
   is_seed: boolean;
   depth: number;
+  x?: number | null;
+  y?: number | null;
 }
 
 export interface GraphEdge {
@@ -18,6 +20,9 @@ export interface GraphEdge {
 export interface GraphData {
   nodes: GraphNode[];
   edges: GraphEdge[];
+  session_id?: string | null;
+  /** Nodes whose neighbors or metadata could not be fetched (e.g. rate limited); retried on the next build. */
+  failed_nodes?: string[];
 }
 
 export interface GraphBuildParams {
@@ -25,20 +30,127 @@ export interface GraphBuildParams {
   depth?: number;
   max_nodes?: number;
   direction?: 'references' | 'citations' | 'both';
+  layout?: boolean;
 }
 
 export interface GraphExpandParams {
   node_id: string;
   existing_ids: string[];
   direction?: string;
+  session_id?: string | null;
+  layout?: boolean;
+  positions?: Record<string, [number, number]>;
+}
+
+export interface GraphPathParams {
+  source_id: string;
+  target_id: string;
+  k?: number;
+  max_hops?: number;
+  max_requests?: number;
+}
+
+export interface CitationPathResult extends GraphData {
+  paths: string[][];
+  requests_used: number;
+  /** OpenAlex requests that failed, so paths through those papers may be missing. */
+  failed_requests: number;
+  exhausted: boolean;
+}
+
+export interface NodeMetrics {
+  id: string;
+  pagerank: number;
+  in_degree: number;
+  out_degree: number;
+  betweenness: number;
+  core_number: number;
+  community: number;
+}
+
+export interface GraphAnalysis {
+  node_count: number;
+  edge_count: number;
+  community_count: number;
+  max_core: number;
+  nodes: NodeMetrics[];
+}
+
+const COLUMNAR_GRAPH = 'application/vnd.lithelper.graph+json';
+
+interface ColumnarGraph {
+  format: 'columnar';
+  id_prefix: string;
+  session_id: string | null;
+  nodes: {
+    id: string[];
+    title: string[];
+    publication_year: number[];
+    cited_by_count: number[];
+    authors: string[][];
+    is_seed: number[];
+    depth: number[];
+    x?: (number | null)[];
+    y?: (number | null)[];
+  };
+  edges: { source: number[]; target: number[] };
+  failed_nodes?: string[];
+}
+
+function decodeGraph(data: GraphData | ColumnarGraph): GraphData {
+  if (!('format' in data) || data.format !== 'columnar') return data as GraphData;
+  const cols = data.nodes;
+  const ids = cols.id.map((id) => (id.startsWith('http') ? id : data.id_prefix + id));
+  const seeds = new Set(cols.is_seed);
+  const nodes: GraphNode[] = ids.map((id, i) => ({
+    id,
+    title: cols.title[i],
+    publication_year: cols.publication_year[i],
+    cited_by_count: cols.cited_by_count[i],
+    authors: cols.authors[i],
+    is_seed: seeds.has(i),
+    depth: cols.depth[i],
+    x: cols.x ? cols.x[i] : null,
+    y: cols.y ? cols.y[i] : null,
+  }));
+  const edges: GraphEdge[] = data.edges.source.map((s, i) => ({
+    source: ids[s],
+    target: ids[data.edges.target[i]],
+  }));
+  return { nodes, edges, session_id: data.session_id, failed_nodes: data.failed_nodes ?? [] };
 }
 
 export async function buildGraph(params: GraphBuildParams): Promise<GraphData> {
-  const resp = await api.post<GraphData>('/graph/build', params);
-  return resp.data;
+  const resp = await api.post<GraphData | ColumnarGraph>('/graph/build', params, {
+    headers: { Accept: COLUMNAR_GRAPH },
+  });
+  return decodeGraph(resp.data);
 }
 
 export async function expandNode(params: GraphExpandParams): Promise<GraphData> {
-  const resp = await api.post<GraphData>('/graph/expand', params);
+  const resp = await api.post<GraphData | ColumnarGraph>('/graph/expand', params, {
+    headers: { Accept: COLUMNAR_GRAPH },
+  });
+  return decodeGraph(resp.data);
+}
+
+export async function findCitationPath(params: GraphPathParams): Promise<CitationPathResult> {
+  const resp = await api.post<CitationPathResult>('/graph/path', params);
+  return resp.data;
+}
+
+export type GraphExportFormat = 'graphml' | 'gexf' | 'nodes_csv' | 'edges_csv';
+
+export async function exportGraphSession(sessionId: string, format: GraphExportFormat = 'graphml'): Promise<Blob> {
+  const resp = await api.get(`/graph/sessions/${sessionId}/export`, {
+    params: { format },
+    responseType: 'blob',
+    timeout: 0,
+  });
+  return resp.data as Blob;
+}
+
+export async function analyzeGraph(sessionId: string): Promise<GraphAnalysis> {
+  const resp = await api.post<GraphAnalysis>('/graph/analyze', { session_id: sessionId });
   return resp.data;
 }
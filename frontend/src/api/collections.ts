@@ -18,6 +18,22 @@ export interface CollectionPaperInfo {
 
 export interface CollectionDetail extends CollectionSummary {
   papers: CollectionPaperInfo[];
+  /** Members matching the filters. */
+  total: number;
+  /** Pass back as `cursor` to get the next page; null on the last page. */
+  next_cursor: string | null;
+}
+
+export interface CollectionMembersQuery {
+  sort?: 'added_at' | 'year' | 'citations' | 'title';
+  desc?: boolean;
+  /** Page size (default 100); follow `next_cursor` for the rest. */
+  limit?: number;
+  cursor?: string;
+  year_min?: number;
+  year_max?: number;
+  is_oa?: boolean;
+  type?: string;
 }
 
 export async function listCollections(): Promise<CollectionSummary[]> {
@@ -30,8 +46,8 @@ export async function createCollection(name: string, description?: string): Prom
   return resp.data;
 }
 
-export async function getCollection(id: number): Promise<CollectionDetail> {
-  const resp = await api.get<CollectionDetail>(`/collections/${id}`);
+export async function getCollection(id: number, query: CollectionMembersQuery = {}): Promise<CollectionDetail> {
+  const resp = await api.get<CollectionDetail>(`/collections/${id}`, { params: query });
   return resp.data;
 }
 
@@ -51,3 +67,126 @@ export async function addPaperToCollection(collectionId: number, openalexId: str
 export async function removePaperFromCollection(collectionId: number, openalexId: string): Promise<void> {
   await api.delete(`/collections/${collectionId}/papers/${encodeURIComponent(openalexId)}`);
 }
+
+export interface CollectionBulkResult {
+  added: number;
+  removed: number;
+  skipped: number;
+  failed: number;
+  failed_ids: string[];
+}
+
+/** Add many papers in one request; papers not cached yet are fetched by the backend. */
+export async function addPapersToCollection(
+  collectionId: number,
+  openalexIds: string[],
+  notes?: string
+): Promise<CollectionBulkResult> {
+  const resp = await api.post<CollectionBulkResult>(`/collections/${collectionId}/papers/bulk-add`, {
+    openalex_ids: openalexIds,
+    notes,
+  });
+  return resp.data;
+}
+
+export async function removePapersFromCollection(
+  collectionId: number,
+  openalexIds: string[]
+): Promise<CollectionBulkResult> {
+  const resp = await api.post<CollectionBulkResult>(`/collections/${collectionId}/papers/bulk-remove`, {
+    openalex_ids: openalexIds,
+  });
+  return resp.data;
+}
+
+export async function copyPapersToCollection(
+  collectionId: number,
+  targetCollectionId: number,
+  openalexIds: string[],
+  move = false
+): Promise<CollectionBulkResult> {
+  const resp = await api.post<CollectionBulkResult>(
+    `/collections/${collectionId}/papers/${move ? 'move' : 'copy'}`,
+    { openalex_ids: openalexIds, target_collection_id: targetCollectionId }
+  );
+  return resp.data;
+}
+
+export interface CollectionGap {
+  openalex_id: string;
+  cited_by_members: number;
+  share: number;
+  paper: PaperSummary | null;
+}
+
+export interface CollectionGaps {
+  collection_id: number;
+  member_count: number;
+  members_with_references: number;
+  gaps: CollectionGap[];
+}
+
+/** Papers cited by many members but missing from the collection (computed locally). */
+export async function getCollectionGaps(collectionId: number, limit = 20, minCount = 2): Promise<CollectionGaps> {
+  const resp = await api.get<CollectionGaps>(`/collections/${collectionId}/gaps`, {
+    params: { limit, min_count: minCount },
+  });
+  return resp.data;
+}
+
+export interface CollectionStatCount {
+  key: string;
+  label: string | null;
+  count: number;
+}
+
+export interface CollectionStats {
+  collection_id: number;
+  member_count: number;
+  papers_analyzed: number;
+  open_access_count: number;
+  open_access_share: number;
+  mean_citations: number;
+  citation_quantiles: { quantile: number; cited_by_count: number }[];
+  years: CollectionStatCount[];
+  top_authors: CollectionStatCount[];
+  top_venues: CollectionStatCount[];
+  top_topics: CollectionStatCount[];
+  cached: boolean;
+}
+
+/** Collection statistics computed on the server and cached until the members change. */
+export async function getCollectionStats(collectionId: number, top = 10): Promise<CollectionStats> {
+  const resp = await api.get<CollectionStats>(`/collections/${collectionId}/stats`, { params: { top } });
+  return resp.data;
+}
+
+export interface CollectionWarmup {
+  collection_id: number;
+  status: 'idle' | 'running' | 'completed' | 'failed' | 'cancelled';
+  stage: string | null;
+  error: string | null;
+  requests_made: number;
+  failed_requests: number;
+  references_fetched: number;
+  citers_fetched: number;
+  member_count: number;
+  references_cached: number;
+  citers_cached: number;
+}
+
+/** Prefetch members' references and top citers in the background, so graphs and discovery run locally. */
+export async function startCollectionWarmup(collectionId: number): Promise<CollectionWarmup> {
+  const resp = await api.post<CollectionWarmup>(`/collections/${collectionId}/warmup`);
+  return resp.data;
+}
+
+export async function getCollectionWarmup(collectionId: number): Promise<CollectionWarmup> {
+  const resp = await api.get<CollectionWarmup>(`/collections/${collectionId}/warmup`);
+  return resp.data;
+}
+
+export async function cancelCollectionWarmup(collectionId: number): Promise<CollectionWarmup> {
+  const resp = await api.delete<CollectionWarmup>(`/collections/${collectionId}/warmup`);
+  return resp.data;
+}
@@ -8,21 +8,127 @@ export interface DiscoveryResult {
   reason: string | null;
 }
 
+/** How much of one seed's citing set was sampled. */
+export interface SeedCoverage {
+  seed_id: string;
+  sampling: string;
+  citing_total: number | null;
+  sampled: number;
+  coverage: number | null;
+  requests: number;
+  strata: number;
+  truncated: 'requests' | 'memory' | 'sample limit' | 'error' | null;
+  cached: boolean;
+}
+
 export interface DiscoveryResponse {
   strategy: string;
   seed_count: number;
   results: DiscoveryResult[];
+  coverage: SeedCoverage[];
+}
+
+export type SimilarityMeasure = 'count' | 'salton' | 'jaccard' | 'association';
+
+export type SamplingStrategy = 'top' | 'cursor' | 'random' | 'stratified';
+
+/** Co-citation sampling of each seed's citers, with per-seed budgets. */
+export interface SamplingOptions {
+  sampling?: SamplingStrategy;
+  citing_sample_size?: number;
+  max_requests_per_seed?: number;
+  max_works_per_seed?: number;
+  sample_seed?: number;
 }
 
 export async function runMultiSeedDiscovery(
   seedIds: string[],
   strategy: string = 'co_citation',
   maxResults: number = 30,
+  similarity: SimilarityMeasure = 'count',
+  sampling: SamplingOptions = {},
 ): Promise<DiscoveryResponse> {
   const resp = await api.post<DiscoveryResponse>('/discovery/multi-seed', {
     seed_ids: seedIds,
     strategy,
     max_results: maxResults,
+    similarity,
+    ...sampling,
+  });
+  return resp.data;
+}
+
+export interface DiscoveryJobProgress {
+  stage: string;
+  seeds_total: number;
+  seeds_scanned: number;
+  references_total: number;
+  references_scanned: number;
+  candidates_found: number;
+  requests_made: number;
+  coverage: SeedCoverage[];
+}
+
+export type DiscoveryJobStatus = 'pending' | 'running' | 'completed' | 'failed' | 'cancelled' | 'interrupted';
+
+export interface DiscoveryJob {
+  id: number;
+  strategy: string;
+  seed_count: number;
+  params: Record<string, unknown>;
+  status: DiscoveryJobStatus;
+  progress: DiscoveryJobProgress | null;
+  error: string | null;
+  created_at: string | null;
+  finished_at: string | null;
+  results: DiscoveryResult[] | null;
+}
+
+export async function createDiscoveryJob(
+  seedIds: string[],
+  strategy: string = 'co_citation',
+  maxResults: number = 30,
+  similarity: SimilarityMeasure = 'count',
+  sampling: SamplingOptions = {},
+): Promise<DiscoveryJob> {
+  const resp = await api.post<DiscoveryJob>('/discovery/jobs', {
+    seed_ids: seedIds,
+    strategy,
+    max_results: maxResults,
+    similarity,
+    ...sampling,
   });
   return resp.data;
 }
+
+export async function listDiscoveryJobs(limit: number = 20): Promise<DiscoveryJob[]> {
+  const resp = await api.get<DiscoveryJob[]>('/discovery/jobs', { params: { limit } });
+  return resp.data;
+}
+
+export async function getDiscoveryJob(jobId: number): Promise<DiscoveryJob> {
+  const resp = await api.get<DiscoveryJob>(`/discovery/jobs/${jobId}`);
+  return resp.data;
+}
+
+export async function cancelDiscoveryJob(jobId: number): Promise<DiscoveryJob> {
+  const resp = await api.post<DiscoveryJob>(`/discovery/jobs/${jobId}/cancel`);
+  return resp.data;
+}
+
+/** Subscribe to job progress; `onDone` receives the job once it stops running. Returns an unsubscribe function. */
+export function watchDiscoveryJob(
+  jobId: number,
+  onProgress: (progress: DiscoveryJobProgress) => void,
+  onDone: (job: DiscoveryJob) => void,
+): () => void {
+  const source = new EventSource(`${api.defaults.baseURL}/discovery/jobs/${jobId}/events`);
+  source.addEventListener('progress', (e) => onProgress(JSON.parse((e as MessageEvent).data)));
+  for (const status of ['completed', 'failed', 'cancelled', 'interrupted']) {
+    source.addEventListener(status, () => {
+      source.close();
+      getDiscoveryJob(jobId).then(onDone);
+    });
+  }
+  return () => source.close();
+}
@@ -1,11 +1,19 @@
 import api from './client';
 
+export interface ImportDuplicate {
+  openalex_id: string;
+  duplicate_of: string;
+  similarity: number;
+  in_library: boolean;
+}
+
 export interface ImportResult {
   total: number;
   resolved: number;
   failed: number;
   resolved_ids: string[];
   failed_entries: string[];
+  duplicates: ImportDuplicate[];
 }
 
 export async function exportCollection(collectionId: number, format: string = 'bibtex'): Promise<string> {
@@ -6,6 +6,7 @@ export interface MonitorSummary {
   query: string;
   check_interval_hours: number;
   last_checked_at: string | null;
+  next_check_at: string | null;
   known_result_count: number;
   unread_count: number;
   created_at: string | null;
@@ -24,6 +25,29 @@ export interface MonitorDetail extends MonitorSummary {
   results: MonitorResultOut[];
 }
 
+export interface MonitorCheckResult {
+  monitor_id: number;
+  name: string;
+  new_results: number;
+  result_count: number;
+  shared_with: number;
+  requests: number;
+  elapsed_ms: number;
+  /** The page cap was hit, so only the newest of `matched` results were checked. */
+  truncated: boolean;
+  matched: number;
+  error: string | null;
+}
+
+export interface MonitorCheckAllResponse {
+  checked: number;
+  searches: number;
+  requests: number;
+  new_results: number;
+  elapsed_ms: number;
+  monitors: MonitorCheckResult[];
+}
+
 export async function listMonitors(): Promise<MonitorSummary[]> {
   const resp = await api.get<MonitorSummary[]>('/monitors');
   return resp.data;
@@ -53,6 +77,14 @@ export async function checkMonitor(id: number): Promise<MonitorDetail> {
   return resp.data;
 }
 
+/** Check all monitors at once; monitors with the same query and filters share one search. */
+export async function checkAllMonitors(dueOnly = false): Promise<MonitorCheckAllResponse> {
+  const resp = await api.post<MonitorCheckAllResponse>('/monitors/check-all', null, {
+    params: { due_only: dueOnly },
+  });
+  return resp.data;
+}
+
 export async function markResultRead(monitorId: number, resultId: number): Promise<void> {
   await api.post(`/monitors/${monitorId}/results/${resultId}/read`);
 }
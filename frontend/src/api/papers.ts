@@ -1,5 +1,5 @@
 import api from './client';
-import type { PaperDetail, SearchResponse } from './search';
+import type { PaperDetail, PaperSummary, SearchResponse } from './search';
 
 export async function getPaper(openalexId: string): Promise<PaperDetail> {
   const resp = await api.get<PaperDetail>(`/papers/${encodeURIComponent(openalexId)}`);
@@ -29,3 +29,21 @@ export async function getPaperCitations(
   );
   return resp.data;
 }
+
+export interface SimilarPaper {
+  paper: PaperSummary;
+  similarity: number;
+}
+
+/** Cached papers with similar title/abstract wording (local MinHash index). */
+export async function getSimilarPapers(
+  openalexId: string,
+  limit = 20,
+  minSimilarity = 0.1
+): Promise<SimilarPaper[]> {
+  const resp = await api.get<SimilarPaper[]>(
+    `/papers/${encodeURIComponent(openalexId)}/similar`,
+    { params: { limit, min_similarity: minSimilarity } }
+  );
+  return resp.data;
+}
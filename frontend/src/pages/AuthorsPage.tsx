@@ -6,6 +6,7 @@ import {
   trackAuthor,
   untrackAuthor,
   getAuthorWorks,
+  markTrackedAuthorRead,
 } from '../api/authors';
 import type { AuthorSearchResult, TrackedAuthorOut, AuthorWorksResponse } from '../api/authors';
 import SearchResultCard from '../components/search/SearchResultCard';
@@ -82,6 +83,12 @@ export default function AuthorsPage() {
     try {
       const resp = await getAuthorWorks(openalexId);
       setAuthorWorks(resp);
+      // The new works are on screen now: clear the unread state
+      const author = tracked.find((a) => a.openalex_id === openalexId);
+      if (author && (resp.has_new || author.new_works_count > 0)) {
+        await markTrackedAuthorRead(author.id);
+        await fetchTracked();
+      }
     } catch {
       setAuthorWorks(null);
     } finally {
@@ -11,6 +11,7 @@ export default function CollectionsPage() {
     fetchCollections,
     createCollection,
     loadCollection,
+    loadMoreMembers,
     deleteCollection,
     removePaper,
   } = useCollectionStore();
@@ -133,6 +134,16 @@ export default function CollectionsPage() {
                 ) : null
               )}
             </div>
+
+            {activeCollection.next_cursor && (
+              <button
+                onClick={() => loadMoreMembers()}
+                disabled={isLoading}
+                className="w-full text-sm py-2 rounded border border-[var(--color-border)] hover:bg-[var(--color-bg-tertiary)] disabled:opacity-50"
+              >
+                {isLoading ? 'Loading…' : `Load more (${activeCollection.papers.length} of ${activeCollection.total})`}
+              </button>
+            )}
           </div>
         ) : (
           <div className="flex items-center justify-center h-full text-[var(--color-text-secondary)]">
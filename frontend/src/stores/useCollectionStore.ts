@@ -17,6 +17,8 @@ interface CollectionState {
   fetchCollections: () => Promise<void>;
   createCollection: (name: string, description?: string) => Promise<void>;
   loadCollection: (id: number) => Promise<void>;
+  /** Append the next page of members of the active collection, if there is one. */
+  loadMoreMembers: () => Promise<void>;
   deleteCollection: (id: number) => Promise<void>;
   addPaper: (collectionId: number, openalexId: string) => Promise<void>;
   removePaper: (collectionId: number, openalexId: string) => Promise<void>;
@@ -52,6 +54,21 @@ export const useCollectionStore = create<CollectionState>((set, get) => ({
     }
   },
 
+  loadMoreMembers: async () => {
+    const active = get().activeCollection;
+    if (!active || !active.next_cursor || get().isLoading) return;
+    set({ isLoading: true });
+    try {
+      const page = await getCollection(active.id, { cursor: active.next_cursor });
+      // Ignore the page if another collection was opened meanwhile
+      if (get().activeCollection?.id === active.id) {
+        set({ activeCollection: { ...page, papers: [...active.papers, ...page.papers] } });
+      }
+    } finally {
+      set({ isLoading: false });
+    }
+  },
+
   deleteCollection: async (id) => {
     await deleteCollection(id);
     set({ activeCollection: null });